@@ -0,0 +1,276 @@
+import json
+import re
+from collections import deque
+from decimal import Decimal
+
+from html_parser import script_texts
+from structured_data import format_price
+
+# Scripts that carry a JSON store: Next.js (__NEXT_DATA__) and React on Rails props
+STATE_SCRIPT_SELECTOR = 'script#__NEXT_DATA__, script[type="application/json"]'
+
+# Inline assignments some frameworks use to hand their store to the client
+STATE_ASSIGNMENT_RE = re.compile(
+    r'window\.(?:__INITIAL_STATE__|__PRELOADED_STATE__|__APOLLO_STATE__|__NUXT__)\s*=\s*(\{.*?\})\s*;?\s*</script>',
+    re.DOTALL
+)
+
+# Keys checked first when looking for the page's own product in the store
+PRODUCT_KEYS = ['product', 'productData', 'product_data', 'genericProduct', 'generic_product', 'gp']
+
+NAME_KEYS = ['name', 'title', 'productName', 'product_name', 'displayName']
+BRAND_KEYS = ['brand', 'brandName', 'brand_name', 'manufacturer']
+DESCRIPTION_KEYS = ['description', 'productDescription', 'longDescription', 'shortDescription']
+SKU_KEYS = ['sku', 'skuId', 'sku_id', 'productSku', 'product_sku', 'itemNumber']
+PRICE_KEYS = ['price', 'salePrice', 'sale_price', 'currentPrice', 'current_price', 'listPrice', 'list_price']
+CENTS_KEYS = ['priceInCents', 'price_in_cents', 'priceCents', 'price_cents']
+PRICE_AMOUNT_KEYS = ['current', 'sale', 'amount', 'value', 'formatted']
+# An integer price this large is cents; nothing in our categories costs $5,000
+MAX_DOLLAR_PRICE = 5000
+RATING_KEYS = ['averageRating', 'average_rating', 'rating', 'ratingValue', 'starRating', 'reviewsAverage']
+IMAGE_KEYS = ['imageUrl', 'image_url', 'image', 'primaryImage', 'primary_image', 'images', 'thumbnailUrl']
+COLOR_KEYS = ['color', 'colorName', 'color_name', 'colour', 'colorway', 'variantName', 'variant_name', 'option1']
+VARIANT_LIST_KEYS = ['variants', 'productVariants', 'product_variants', 'skus', 'colorVariants',
+                     'color_variants', 'variantOptions', 'variant_options', 'options']
+# Listing items that say when the product last changed
+UPDATED_KEYS = ['updatedAt', 'updated_at', 'lastModified', 'last_modified', 'modifiedAt', 'modified_at']
+# Option lists on a variant: [{"name": "Color", "value": "Jake Black"}, ...]
+OPTION_LIST_KEYS = ['selectedOptions', 'selected_options', 'options', 'attributes', 'optionValues']
+
+
+def extract_embedded_state(html, soup=None):
+    """Return every JSON payload embedded in the page (Next.js, React on Rails, window.* stores)
+
+    soup, if given, is the page already parsed (a soup or html_parser.script_tree()).
+    """
+    payloads = []
+
+    for text in script_texts(soup if soup is not None else html, STATE_SCRIPT_SELECTOR):
+        if not text:
+            continue
+        try:
+            payloads.append(json.loads(text))
+        except ValueError:
+            continue
+
+    for match in STATE_ASSIGNMENT_RE.finditer(html if isinstance(html, str) else html.decode('utf-8', 'replace')):
+        try:
+            payloads.append(json.loads(match.group(1)))
+        except ValueError:
+            continue
+
+    return payloads
+
+
+def _string(node, keys):
+    """First non-empty string (or number, or {"name": ...}) under any of keys"""
+    for key in keys:
+        value = node.get(key)
+        if isinstance(value, dict):
+            value = value.get('name') or value.get('value')
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = str(value)
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return None
+
+
+def _uses_cents(node):
+    """Whether a node keeps its money in cents (it has a priceInCents-style field)"""
+    return any('cents' in key.lower() for key in node if isinstance(key, str))
+
+
+def _amount(node, keys):
+    """First number or non-empty string under any of keys"""
+    for key in keys:
+        value = node.get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return None
+
+
+def _price(node, cents=False):
+    """Formatted price; a bare integer is cents when the node uses cents or is too big for dollars"""
+    cents = cents or _uses_cents(node)
+    for key in CENTS_KEYS:
+        value = node.get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+            return format_price(f"{Decimal(str(value)) / 100:.2f}")
+    for key in PRICE_KEYS:
+        value = node.get(key)
+        if isinstance(value, dict):
+            # {"amount": 499.99, "currency": "USD"} / {"current": {"priceInCents": 49999}}
+            nested = [value] + [value[k] for k in PRICE_AMOUNT_KEYS if isinstance(value.get(k), dict)]
+            price = next(filter(None, (_price(item, cents) for item in nested)), None)
+            value = price or _amount(value, PRICE_AMOUNT_KEYS)
+        if isinstance(value, int) and not isinstance(value, bool) and (cents or value >= MAX_DOLLAR_PRICE):
+            value = f"{Decimal(value) / 100:.2f}"
+        if isinstance(value, (int, float, str)) and not isinstance(value, bool):
+            price = format_price(value)
+            if price:
+                return price
+    return None
+
+
+def _rating(node):
+    for key in RATING_KEYS:
+        value = node.get(key)
+        if isinstance(value, dict):
+            value = value.get('average') or value.get('value') or value.get('ratingValue')
+        try:
+            rating = float(value)
+        except (TypeError, ValueError):
+            continue
+        if 0 < rating <= 5:
+            return str(value).strip()
+    return None
+
+
+def _image(node):
+    for key in IMAGE_KEYS:
+        value = node.get(key)
+        if isinstance(value, list):
+            value = value[0] if value else None
+        if isinstance(value, dict):
+            value = value.get('url') or value.get('src') or value.get('large')
+        if isinstance(value, str) and value.startswith(('http', '//')):
+            return 'https:' + value if value.startswith('//') else value
+    return None
+
+
+def _variant_color(variant):
+    color = _string(variant, COLOR_KEYS)
+    if color:
+        return color
+    for key in OPTION_LIST_KEYS:
+        options = variant.get(key)
+        if isinstance(options, dict):
+            color = _string(options, COLOR_KEYS)
+            if color:
+                return color
+        elif isinstance(options, list):
+            for option in options:
+                if isinstance(option, dict) and 'color' in str(option.get('name', '')).lower():
+                    value = option.get('value')
+                    if isinstance(value, str) and value.strip():
+                        return value.strip()
+    return None
+
+
+def _variant_list(node):
+    """The product's variant dicts (each with a color, SKU or price), or []"""
+    for key in VARIANT_LIST_KEYS:
+        value = node.get(key)
+        if isinstance(value, dict):
+            value = list(value.values())
+        if not isinstance(value, list):
+            continue
+        variants = [
+            item for item in value
+            if isinstance(item, dict) and (_variant_color(item) or _string(item, SKU_KEYS) or _price(item))
+        ]
+        if variants:
+            return variants
+    return []
+
+
+def _looks_like_product(node):
+    return bool(_string(node, NAME_KEYS)) and bool(
+        _variant_list(node) or _string(node, SKU_KEYS) or _price(node)
+    )
+
+
+def find_product_state(payloads, max_nodes=20000):
+    """Shallowest product-like object in the payloads, preferring PRODUCT_KEYS branches
+
+    Breadth-first so the page's own product wins over related products and
+    carousels nested deeper in the store.
+    """
+    queue = deque(payloads)
+    seen = 0
+    while queue and seen < max_nodes:
+        node = queue.popleft()
+        seen += 1
+        if isinstance(node, list):
+            queue.extend(item for item in node if isinstance(item, (dict, list)))
+            continue
+        if not isinstance(node, dict):
+            continue
+        if _looks_like_product(node):
+            return node
+        preferred = [node[key] for key in PRODUCT_KEYS if isinstance(node.get(key), (dict, list))]
+        queue.extendleft(reversed(preferred))
+        queue.extend(value for key, value in node.items()
+                     if key not in PRODUCT_KEYS and isinstance(value, (dict, list)))
+    return None
+
+
+def tile_record(node):
+    """What a listing item shows about its product: name, image_url, price and when it last changed"""
+    tile = {
+        'name': _string(node, NAME_KEYS),
+        'image_url': _image(node),
+        'price': _price(node),
+        'updated': _string(node, UPDATED_KEYS),
+    }
+    return {field: value for field, value in tile.items() if value}
+
+
+def app_state_record(payloads):
+    """Row fields from the page's hydration payload, including every color variant
+
+    Returns the same keys as structured_data.product_record plus "variants":
+    a list of {"color", "price", "sku"} dicts, one per variant, in store order.
+    """
+    product = find_product_state(payloads)
+    if product is None:
+        return {}
+
+    record = {}
+    for field, keys in [('name', NAME_KEYS), ('brand', BRAND_KEYS),
+                        ('description', DESCRIPTION_KEYS), ('sku', SKU_KEYS)]:
+        value = _string(product, keys)
+        if value:
+            record[field] = value
+
+    price = _price(product)
+    if price:
+        record['price'] = price
+    rating = _rating(product)
+    if rating:
+        record['rating'] = rating
+    image = _image(product)
+    if image:
+        record['image_url'] = image
+
+    variants = []
+    seen = set()
+    for item in _variant_list(product):
+        variant = {'color': _variant_color(item), 'price': _price(item), 'sku': _string(item, SKU_KEYS)}
+        key = ((variant['color'] or '').lower(), variant['sku'])
+        if key in seen:
+            continue
+        seen.add(key)
+        variants.append(variant)
+
+    if variants:
+        record['variants'] = variants
+        colors = []
+        for variant in variants:
+            color = variant['color']
+            if color and color.lower() not in [c.lower() for c in colors]:
+                colors.append(color)
+        if colors:
+            record['color_options'] = colors
+        if 'price' not in record:
+            prices = [v['price'] for v in variants if v['price']]
+            if prices:
+                record['price'] = prices[0]
+        if 'sku' not in record:
+            skus = [v['sku'] for v in variants if v['sku']]
+            if skus:
+                record['sku'] = skus[0]
+
+    return record
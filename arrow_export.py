@@ -0,0 +1,212 @@
+import argparse
+import csv
+import datetime
+import json
+import os
+import re
+from urllib.parse import quote
+
+# Optional; only this export (and Parquet sinks) need pyarrow
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
+# Columns that are lists in the scraped rows and comma-joined in CSV output
+LIST_COLUMNS = ['color_options', 'simplified_colors', 'tags', 'categories']
+
+PRICE_RE = re.compile(r'\$?\s*(\d[\d,]*(?:\.\d+)?)')
+WEIGHT_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(lbs?|pounds?|oz|ounces?|kg|g)?\b', re.IGNORECASE)
+WEIGHT_TO_LBS = {'oz': 1 / 16, 'ounce': 1 / 16, 'kg': 2.20462, 'g': 0.00220462}
+
+
+def parse_price(value):
+    """Dollars as a float from "$1,299.99" (the low end of "$99 - $129"), or None for "N/A" """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    match = PRICE_RE.search(value) if isinstance(value, str) else None
+    return float(match.group(1).replace(',', '')) if match else None
+
+
+def parse_weight(value):
+    """Pounds as a float from "7.5 lbs" (ounces and metric converted), or None"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    match = WEIGHT_RE.search(value) if isinstance(value, str) else None
+    if not match:
+        return None
+    unit = (match.group(2) or 'lbs').lower().rstrip('s')
+    return round(float(match.group(1)) * WEIGHT_TO_LBS.get(unit, 1.0), 3)
+
+
+def parse_rating(value):
+    try:
+        rating = float(value)
+    except (TypeError, ValueError):
+        return None
+    return rating if 0 <= rating <= 5 else None
+
+
+def _text(value):
+    if value is None or value == 'N/A':
+        return None
+    return str(value)
+
+
+def _list(value):
+    if isinstance(value, list):
+        return [str(item) for item in value]
+    return []
+
+
+def product_schema():
+    """Typed columns; retailer, category, brand and simplified_colors are dictionary-encoded"""
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        pa.field('name', pa.string()),
+        pa.field('brand', dictionary),
+        pa.field('description', pa.string()),
+        pa.field('category', dictionary),
+        pa.field('price', pa.float64()),
+        pa.field('retailer', dictionary),
+        pa.field('retailer_url', pa.string()),
+        pa.field('image_url', pa.string()),
+        pa.field('sku', pa.string()),
+        pa.field('color_options', pa.list_(pa.string())),
+        pa.field('simplified_colors', pa.list_(dictionary)),
+        pa.field('tags', pa.list_(pa.string())),
+        pa.field('categories', pa.list_(pa.string())),
+        pa.field('variants', pa.list_(pa.struct([
+            pa.field('color', pa.string()),
+            pa.field('price', pa.float64()),
+            pa.field('sku', pa.string()),
+        ]))),
+        pa.field('weight_lbs', pa.float64()),
+        pa.field('dimensions', pa.string()),
+        pa.field('rating', pa.float64()),
+        pa.field('run_date', pa.date32()),
+    ])
+
+
+def arrow_row(product_data, run_date):
+    """One scraped row with typed values; "N/A" becomes null"""
+    return {
+        'name': _text(product_data.get('name')),
+        'brand': _text(product_data.get('brand')),
+        'description': _text(product_data.get('description')),
+        'category': _text(product_data.get('category')),
+        'price': parse_price(product_data.get('price')),
+        'retailer': _text(product_data.get('retailer')),
+        'retailer_url': _text(product_data.get('retailer_url')),
+        'image_url': _text(product_data.get('image_url')),
+        'sku': _text(product_data.get('sku')),
+        'color_options': _list(product_data.get('color_options')),
+        'simplified_colors': _list(product_data.get('simplified_colors')),
+        'tags': _list(product_data.get('tags')),
+        'categories': _list(product_data.get('categories')),
+        'variants': [
+            {'color': _text(variant.get('color')), 'price': parse_price(variant.get('price')),
+             'sku': _text(variant.get('sku'))}
+            for variant in product_data.get('variants') or [] if isinstance(variant, dict)
+        ],
+        'weight_lbs': parse_weight(product_data.get('weight')),
+        'dimensions': _text(product_data.get('dimensions')),
+        'rating': parse_rating(product_data.get('rating')),
+        'run_date': run_date,
+    }
+
+
+def to_table(products, run_date=None):
+    """Arrow table of scraped rows with list, dictionary and numeric columns"""
+    if not HAVE_PYARROW:
+        raise ValueError("Arrow export needs pyarrow installed")
+    run_date = run_date or datetime.date.today()
+    return pa.Table.from_pylist([arrow_row(product, run_date) for product in products],
+                                schema=product_schema())
+
+
+def export_dataset(products, root, run_date=None):
+    """Write rows as root/category=<label>/run_date=<date>/part-0.parquet
+
+    Re-exporting a category for the same date replaces its file; other
+    categories and dates are left alone. Returns the paths written.
+    """
+    table = to_table(products, run_date)
+    if not table.num_rows:
+        print("No products to export!")
+        return []
+
+    paths = []
+    categories = table.column('category').combine_chunks().cast(pa.string())
+    for category in sorted(set(categories.to_pylist()), key=lambda label: label or ''):
+        mask = pc.equal(categories, category) if category is not None else pc.is_null(categories)
+        part = table.filter(mask)
+        run_date = part.column('run_date')[0].as_py()
+        directory = os.path.join(root, f"category={quote(category or 'Unknown', safe='')}",
+                                 f"run_date={run_date.isoformat()}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, 'part-0.parquet')
+        # Partition values live in the directory names, not in the file
+        pq.write_table(part.drop_columns(['category', 'run_date']), path, compression='zstd')
+        paths.append(path)
+
+    print(f"\nExported {table.num_rows} products to {len(paths)} partitions under {root}")
+    return paths
+
+
+def load_dataset(root, categories=None, run_dates=None, columns=None):
+    """Exported rows as a DataFrame, reading only the partitions and columns asked for"""
+    if not HAVE_PYARROW:
+        raise ValueError("Arrow export needs pyarrow installed")
+    partitioning = ds.partitioning(pa.schema([('category', pa.string()), ('run_date', pa.date32())]), flavor='hive')
+    dataset = ds.dataset(root, format='parquet', partitioning=partitioning)
+    condition = None
+    if categories:
+        condition = ds.field('category').isin(list(categories))
+    if run_dates:
+        dates = ds.field('run_date').isin(pa.array(list(run_dates), pa.date32()))
+        condition = dates if condition is None else condition & dates
+    table = dataset.to_table(columns=columns, filter=condition)
+    if 'category' in table.column_names:
+        index = table.column_names.index('category')
+        table = table.set_column(index, 'category', pc.dictionary_encode(table.column('category')))
+    return table.to_pandas()
+
+
+def read_rows(path):
+    """Rows from a JSONL or CSV export, with CSV list columns split back into lists
+
+    JSONL keeps lists intact; splitting CSV on ", " is only right for
+    values that had no comma of their own.
+    """
+    with open(path, encoding='utf-8', newline='') as f:
+        if path.endswith(('.jsonl', '.ndjson', '.json')):
+            return [json.loads(line) for line in f if line.strip()]
+        rows = []
+        for row in csv.DictReader(f):
+            for column in LIST_COLUMNS:
+                if column in row:
+                    row[column] = [item for item in row[column].split(', ') if item]
+            if row.get('variants'):
+                row['variants'] = json.loads(row['variants'])
+            rows.append(row)
+        return rows
+
+
+# Usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert scraper output to a partitioned Parquet dataset")
+    parser.add_argument("inputs", nargs="+", help="CSV or JSONL files written by the scrapers")
+    parser.add_argument("--root", default="babylist_dataset", help="Dataset directory")
+    parser.add_argument("--run-date", type=datetime.date.fromisoformat, default=None,
+                        help="YYYY-MM-DD partition for these rows (default: today)")
+    args = parser.parse_args()
+
+    products = []
+    for path in args.inputs:
+        products.extend(read_rows(path))
+    export_dataset(products, args.root, args.run_date)
@@ -0,0 +1,70 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+
+class AsyncFetcher:
+    """Fetch many URLs concurrently with a global cap and per-host politeness"""
+
+    def __init__(self, fetch, concurrency=8, per_host=4, min_interval=0.5, bypass=None):
+        # fetch is a blocking callable (e.g. BabylistRequestsScraper.get_page)
+        # that takes a URL and returns a response or None
+        self.fetch = fetch
+        # bypass(url) -> True skips politeness for URLs that won't hit the network
+        self.bypass = bypass
+        self.concurrency = max(1, concurrency)
+        self.per_host = max(1, min(per_host, self.concurrency))
+        self.min_interval = min_interval
+        self.stats = {"fetched": 0, "failed": 0, "elapsed": 0.0}
+
+    async def _wait_turn(self, host):
+        """Space out request starts to the same host by min_interval seconds"""
+        async with self._host_locks[host]:
+            now = time.monotonic()
+            wait = self._next_start.get(host, now) - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next_start[host] = max(now, self._next_start.get(host, now)) + self.min_interval
+
+    async def _run_one(self, url, handle, loop, executor):
+        host = urlparse(url).netloc
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.per_host)
+            self._host_locks[host] = asyncio.Lock()
+
+        if self.bypass and self.bypass(url):
+            response = await loop.run_in_executor(executor, self.fetch, url)
+        else:
+            async with self._global_slots:
+                async with self._host_slots[host]:
+                    await self._wait_turn(host)
+                    response = await loop.run_in_executor(executor, self.fetch, url)
+
+        if response is None:
+            self.stats["failed"] += 1
+        else:
+            self.stats["fetched"] += 1
+
+        # Parsing happens outside the host slot so it never holds up fetching
+        return await loop.run_in_executor(executor, handle, url, response)
+
+    async def fetch_all(self, urls, handle):
+        """Fetch every URL and return handle(url, response) results in input order"""
+        loop = asyncio.get_running_loop()
+        self._global_slots = asyncio.Semaphore(self.concurrency)
+        self._host_slots = {}
+        self._host_locks = {}
+        self._next_start = {}
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            results = await asyncio.gather(
+                *(self._run_one(url, handle, loop, executor) for url in urls)
+            )
+        self.stats["elapsed"] = time.monotonic() - start
+        return results
+
+    def run(self, urls, handle):
+        """Blocking entry point for callers that are not already async"""
+        return asyncio.run(self.fetch_all(urls, handle))
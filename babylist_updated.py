@@ -1,21 +1,121 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
 import pandas as pd
 import time
 import re
 import json
-from urllib.parse import urljoin
+import shutil
+import tempfile
+import argparse
+from driver_pool import crawl_products
+from listing_api import discover_product_urls
+from http_client import make_session, absolute_url, BASE_URL
+from page_ready import load_product_page, PageTimings
+from rate_limiter import AdaptiveRateLimiter
+from http_cache import ResponseCache
+from fixtures import FixtureStore
+from output_sink import open_sink, MultiSink
+from catalog_store import CatalogStore
+from crawl_journal import CrawlJournal, journal_path
+from incremental import IncrementalState, state_path
+from sitemap import SitemapIndex
+from arrow_export import export_dataset
+from html_parser import make_soup, set_region_parsing
+from page_context import PageContext
+from patterns import register
+from keyword_matcher import KeywordMatcher
+from structured_data import FieldSources
+from browser_profile import apply_lean_options, enable_request_blocking
+
+# Spec patterns, matched against lowercased page text in priority order
+WEIGHT_PATTERNS = register('single_stroller.weight', [
+    r'weight[:\s]*(\d+(?:\.\d+)?)\s*(?:lbs?|pounds?)',
+    r'(\d+(?:\.\d+)?)\s*(?:lbs?|pounds?)\s*weight',
+    r'weighs?\s*(\d+(?:\.\d+)?)\s*(?:lbs?|pounds?)'
+])
+
+DIMENSION_PATTERNS = register('single_stroller.dimensions', [
+    r'dimensions?[:\s]*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?',
+    r'(\d+(?:\.\d+)?)\s*["\']?\s*[lL]\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?\s*[wW]\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?\s*[hH]',
+    r'folded[:\s]*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?'
+])
+
+# Keyword vocabularies, each built into one matcher at import time
+NON_COLOR_PHRASES = KeywordMatcher([
+    'select', 'choose', 'available', 'add to cart', 'buy now', 'quantity', 'shipping', 'return',
+    'description', 'reviews', 'specifications', 'compare', 'wishlist', 'registry', 'gift', 'share'
+])
+# Babylist color names: frame/seat combinations and color words
+COLOR_INDICATORS = KeywordMatcher([
+    # Frame/seat combinations
+    'frame', 'seat', 'canopy', 'fabric', 'chassis',
+    # Color words
+    'beige', 'taupe', 'almond', 'seashell', 'charcoal', 'slate',
+    'navy', 'sage', 'olive', 'burgundy', 'plum', 'coral',
+    'cream', 'ivory', 'pearl', 'silver', 'bronze', 'copper',
+    'midnight', 'forest', 'ocean', 'sky', 'rose', 'blush',
+    # Basic colors
+    'black', 'white', 'gray', 'grey', 'blue', 'red', 'green',
+    'brown', 'pink', 'purple', 'yellow', 'gold'
+], word_boundary=True)
+
+# Simplified color for complex names; earlier categories win
+COLOR_CATEGORIES = {
+    'Black': ['black', 'midnight', 'onyx', 'charcoal', 'slate'],
+    'White': ['white', 'ivory', 'cream', 'pearl', 'snow'],
+    'Gray': ['gray', 'grey', 'silver', 'stone', 'ash', 'smoke'],
+    'Blue': ['blue', 'navy', 'teal', 'aqua', 'ocean', 'sky', 'denim'],
+    'Red': ['red', 'burgundy', 'wine', 'crimson', 'cherry', 'rust'],
+    'Green': ['green', 'olive', 'forest', 'sage', 'mint', 'emerald'],
+    'Brown': ['brown', 'tan', 'beige', 'khaki', 'taupe', 'almond', 'bronze', 'copper'],
+    'Pink': ['pink', 'rose', 'blush', 'coral', 'salmon', 'peach'],
+    'Purple': ['purple', 'lavender', 'plum', 'violet', 'lilac'],
+    'Yellow': ['yellow', 'gold', 'butter', 'lemon', 'honey']
+}
+SIMPLE_COLORS = KeywordMatcher({
+    variation: category for category, variations in COLOR_CATEGORIES.items() for variation in variations
+}, word_boundary=True)
+
+# Common stroller brands, matched in the product name
+BRANDS = KeywordMatcher([
+    'UPPAbaby', 'Bugaboo', 'Baby Jogger', 'BOB', 'Chicco', 'Graco', 'Britax', 'Nuna', 'Maxi-Cosi',
+    'Cybex', 'Stokke', 'Doona'
+], word_boundary=True)
 
 class BabylistStrollerScraper:
-    def __init__(self, chrome_path):
+    def __init__(self, chrome_path, lean_browser=True, driver=None, base_url=BASE_URL, recorder=None,
+                 journal=None, incremental=None, sitemap=None, cache=None):
         self.chrome_path = chrome_path
-        self.driver = None
-        self.setup_driver()
+        # Site root; point at a fixtures.FixtureServer for offline runs
+        self.base_url = base_url
+        # Optional fixtures.FixtureStore that captures every page we load
+        self.recorder = recorder
+        # Optional crawl_journal.CrawlJournal for checkpointing and --resume
+        self.journal = journal
+        # Optional incremental.IncrementalState; only changed products are refetched
+        self.incremental = incremental
+        # Optional sitemap.SitemapIndex; discovers product URLs from the category's sitemaps
+        self.sitemap = sitemap
+        # No single-stroller URL terms to exclude; sitemap URLs are taken as listed
+        self.excluded_url_terms = None
+        # Headless, no images/fonts/trackers, eager page loads
+        self.lean_browser = lean_browser
+        self.page_timeout = 15
+        self.page_timings = PageTimings()
+        # Which tier (JSON-LD, DOM, nothing) filled each field
+        self.field_sources = FieldSources()
+        # Shared by every browser in a pool; slow page loads count as pushback
+        self.rate_limiter = AdaptiveRateLimiter(rate=0.5, slow_after=self.page_timeout / 2)
+        self.session = make_session()
+        # Optional http_cache.ResponseCache for the static fetches of --hybrid runs
+        self.cache = cache
+        # Reuse a caller's browser instead of launching one; otherwise browser()
+        # starts one only when listing scrolls or serial product pages need it,
+        # so a --pool-size run never has an idle extra Chrome
+        self.driver = driver
+        # Throwaway profile of the browser setup_driver() started, removed by close()
+        self.profile_dir = None
         
         # Color mapping to 10 simplified categories
         self.color_mapping = {
@@ -32,36 +132,55 @@ class BabylistStrollerScraper:
         }
     
     def setup_driver(self):
-        """Initialize Chrome driver with options"""
+        """Start the scraper's own Chrome session on a throwaway profile"""
+        self.profile_dir = tempfile.mkdtemp(prefix='babylist_chrome_')
+        self.driver = self.create_driver(self.profile_dir)
+    
+    def browser(self):
+        """The scraper's Chrome session, started on first use"""
+        if self.driver is None:
+            self.setup_driver()
+        return self.driver
+    
+    def create_driver(self, profile_dir=None):
+        """Create a Chrome session, optionally bound to its own profile directory"""
         options = Options()
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
         options.add_argument("--disable-blink-features=AutomationControlled")
         options.add_argument("--disable-extensions")
         options.add_argument("--disable-gpu")
-        options.add_argument("--remote-debugging-port=9222")
         options.add_argument("--disable-web-security")
         options.add_argument("--allow-running-insecure-content")
-        options.add_argument("--user-data-dir=/tmp/chrome_dev_test")
+        # Each session needs a profile dir of its own (setup_driver and DriverPool make one);
+        # a shared profile dir or debugging port stops a second session from starting
+        if profile_dir:
+            options.add_argument(f"--user-data-dir={profile_dir}")
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
+        if self.lean_browser:
+            apply_lean_options(options)
         
         service = Service(self.chrome_path)
-        self.driver = webdriver.Chrome(service=service, options=options)
-        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        driver = webdriver.Chrome(service=service, options=options)
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        if self.lean_browser:
+            enable_request_blocking(driver)
+        return driver
     
     def scroll_and_load_all(self, max_scrolls=20):
         """Scroll to load all products with better detection"""
         print("Loading all products...")
-        last_height = self.driver.execute_script("return document.body.scrollHeight")
+        driver = self.browser()
+        last_height = driver.execute_script("return document.body.scrollHeight")
         
         for i in range(max_scrolls):
             # Scroll down
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             time.sleep(3)
             
             # Check if new content loaded
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
+            new_height = driver.execute_script("return document.body.scrollHeight")
             if new_height == last_height:
                 print(f"No more content to load after {i+1} scrolls")
                 break
@@ -70,7 +189,7 @@ class BabylistStrollerScraper:
     
     def extract_product_list(self):
         """Extract basic product info from listing page"""
-        soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+        soup = make_soup(self.browser().page_source)
         
         # Try multiple selectors for product cards
         selectors = [
@@ -91,14 +210,14 @@ class BabylistStrollerScraper:
                 for i, link in enumerate(links[:5]):
                     href = link.get('href')
                     if href:
-                        full_url = urljoin("https://www.babylist.com", href)
+                        full_url = absolute_url(href, self.base_url)
                         print(f"  {i+1}: {full_url}")
                 
                 for link in links:
                     href = link.get('href')
                     if href and ('/store/' in href or '/gp/' in href):
                         # Accept both /store/ and /gp/ URLs since we're on the stroller page already
-                        full_url = urljoin("https://www.babylist.com", href)
+                        full_url = absolute_url(href, self.base_url)
                         if full_url not in product_links:
                             product_links.append(full_url)
                 break
@@ -118,28 +237,7 @@ class BabylistStrollerScraper:
         if not color_name or color_name == "N/A":
             return "Other"
         
-        color_lower = color_name.lower()
-        
-        # Enhanced color mapping for complex names
-        color_mappings = {
-            'black': ['black', 'midnight', 'onyx', 'charcoal', 'slate'],
-            'white': ['white', 'ivory', 'cream', 'pearl', 'snow'],
-            'gray': ['gray', 'grey', 'silver', 'stone', 'ash', 'smoke'],
-            'blue': ['blue', 'navy', 'teal', 'aqua', 'ocean', 'sky', 'denim'],
-            'red': ['red', 'burgundy', 'wine', 'crimson', 'cherry', 'rust'],
-            'green': ['green', 'olive', 'forest', 'sage', 'mint', 'emerald'],
-            'brown': ['brown', 'tan', 'beige', 'khaki', 'taupe', 'almond', 'bronze', 'copper'],
-            'pink': ['pink', 'rose', 'blush', 'coral', 'salmon', 'peach'],
-            'purple': ['purple', 'lavender', 'plum', 'violet', 'lilac'],
-            'yellow': ['yellow', 'gold', 'butter', 'lemon', 'honey']
-        }
-        
-        # Check each category
-        for category, variations in color_mappings.items():
-            if any(variation in color_lower for variation in variations):
-                return category.title()
-        
-        return "Other"
+        return SIMPLE_COLORS.first(color_name) or "Other"
 
     def _is_babylist_color(self, text):
         """Enhanced color detection for Babylist's complex color names"""
@@ -149,31 +247,11 @@ class BabylistStrollerScraper:
         text_lower = text.lower().strip()
         
         # Skip obvious non-colors
-        skip_phrases = [
-            'select', 'choose', 'available', 'add to cart', 'buy now', 'quantity',
-            'shipping', 'return', 'description', 'reviews', 'specifications',
-            'compare', 'wishlist', 'registry', 'gift', 'share'
-        ]
-        
-        if any(skip in text_lower for skip in skip_phrases):
+        if NON_COLOR_PHRASES.contains_any(text_lower):
             return False
         
-        # Babylist-specific color indicators
-        color_indicators = [
-            # Frame/seat combinations
-            'frame', 'seat', 'canopy', 'fabric', 'chassis',
-            # Color words
-            'beige', 'taupe', 'almond', 'seashell', 'charcoal', 'slate',
-            'navy', 'sage', 'olive', 'burgundy', 'plum', 'coral',
-            'cream', 'ivory', 'pearl', 'silver', 'bronze', 'copper',
-            'midnight', 'forest', 'ocean', 'sky', 'rose', 'blush',
-            # Basic colors
-            'black', 'white', 'gray', 'grey', 'blue', 'red', 'green',
-            'brown', 'pink', 'purple', 'yellow', 'gold'
-        ]
-        
         # Check if text contains color indicators
-        if any(indicator in text_lower for indicator in color_indicators):
+        if COLOR_INDICATORS.contains_any(text_lower):
             return True
         
         # Check for "color/color" pattern (like "Beige/Taupe")
@@ -221,49 +299,71 @@ class BabylistStrollerScraper:
         
         return colors
     
-    def extract_product_details(self, url):
+    def extract_product_details(self, url, driver=None):
         """Extract detailed info from individual product page"""
         try:
+            driver = driver or self.browser()
             print(f"Scraping: {url}")
-            self.driver.get(url)
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            time.sleep(2)
+            # Paced by the rate limiter, then wait for the product's own elements
+            ready = load_product_page(driver, url, self.page_timeout, self.page_timings, self.rate_limiter)
+            if not ready:
+                print(f"  Page not ready after {self.page_timeout}s, parsing what loaded")
             
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            html = driver.page_source
+            if self.recorder:
+                self.recorder.record(url, html)
+            return self.parse_product_page(url, html)
             
-            # Extract basic info
-            product_data = {
-                "name": "N/A",
-                "brand": "N/A", 
-                "description": "N/A",
-                "category": "Single Stroller",
-                "price": "N/A",
-                "retailer": "Babylist",
-                "retailer_url": url,
-                "tags": [],
-                "image_url": "N/A",
-                "sku": "N/A",
-                "color_options": [],
-                "simplified_colors": [],
-                "weight": "N/A",
-                "dimensions": "N/A",
-                "rating": "N/A"
-            }
-            
-            # Product name from title or h1
+        except Exception as e:
+            print(f"Error scraping {url}: {e}")
+            return None
+    
+    def parse_product_page(self, url, html, scoped=None, field_sources=None):
+        """Extract product fields from a rendered or static product page
+
+        Field sources are tallied into field_sources (default: the scraper's).
+        """
+        page = PageContext(html, scoped=scoped)
+        soup = page.soup
+        
+        # Extract basic info
+        product_data = {
+            "name": "N/A",
+            "brand": "N/A", 
+            "description": "N/A",
+            "category": "Single Stroller",
+            "price": "N/A",
+            "retailer": "Babylist",
+            "retailer_url": url,
+            "tags": [],
+            "image_url": "N/A",
+            "sku": "N/A",
+            "color_options": [],
+            "variants": [],
+            "simplified_colors": [],
+            "weight": "N/A",
+            "dimensions": "N/A",
+            "rating": "N/A"
+        }
+        
+        # Structured data first; the DOM heuristics below only fill what it leaves empty
+        structured, sources = page.structured
+        product_data.update({key: value for key, value in structured.items() if key in product_data})
+        
+        # Product name from title or h1
+        if "name" not in structured:
             title_tag = soup.select_one('title')
             if title_tag:
                 title_text = title_tag.get_text().strip()
                 # Remove "| Babylist" from title
                 product_data["name"] = re.sub(r'\s*\|\s*Babylist.*$', '', title_text)
-            
+        
             h1_tag = soup.select_one('h1')
             if h1_tag and product_data["name"] == "N/A":
                 product_data["name"] = h1_tag.get_text().strip()
-            
-            # Brand extraction
+        
+        # Brand extraction
+        if "brand" not in structured:
             brand_selectors = [
                 '[data-testid*="brand"]',
                 '.brand',
@@ -274,20 +374,18 @@ class BabylistStrollerScraper:
                 if brand_elem:
                     product_data["brand"] = brand_elem.get_text().strip()
                     break
-            
+        
             # If brand not found, try to extract from product name
             if product_data["brand"] == "N/A" and product_data["name"] != "N/A":
-                # Common stroller brands
-                brands = ['UPPAbaby', 'Bugaboo', 'Baby Jogger', 'BOB', 'Chicco', 'Graco', 
-                        'Britax', 'Nuna', 'Maxi-Cosi', 'Cybex', 'Stokke', 'Doona']
-                for brand in brands:
-                    if brand.lower() in product_data["name"].lower():
-                        product_data["brand"] = brand
-                        break
-            
-            # Color extraction - Extract colors first
+                brand = BRANDS.first(product_data["name"])
+                if brand:
+                    product_data["brand"] = brand
+        
+        # Color extraction - Extract colors first
+        cleaned_colors = structured.get("color_options", [])
+        if "color_options" not in structured:
             colors_found = set()
-            
+        
             # Priority 1: Color variant selectors (most reliable)
             color_selectors = [
                 '[data-testid*="color-option"]',
@@ -300,7 +398,7 @@ class BabylistStrollerScraper:
                 '[class*="VariantOption"]',
                 '[class*="color-picker"]'
             ]
-            
+        
             for selector in color_selectors:
                 elements = soup.select(selector)
                 for elem in elements:
@@ -309,12 +407,12 @@ class BabylistStrollerScraper:
                         color_val = elem.get(attr, '').strip()
                         if color_val and self._is_babylist_color(color_val):
                             colors_found.add(color_val)
-                    
+                
                     # Check text content
                     text = elem.get_text().strip()
                     if text and self._is_babylist_color(text):
                         colors_found.add(text)
-            
+        
             # Priority 2: Dropdown/select options
             selects = soup.select('select, [role="listbox"]')
             for select in selects:
@@ -325,12 +423,12 @@ class BabylistStrollerScraper:
                     for option in options:
                         option_text = option.get_text().strip()
                         option_value = option.get('value', '').strip()
-                        
+                    
                         if option_text and self._is_babylist_color(option_text):
                             colors_found.add(option_text)
                         if option_value and self._is_babylist_color(option_value):
                             colors_found.add(option_value)
-            
+        
             # Priority 3: Radio buttons and checkboxes with labels
             inputs = soup.select('input[type="radio"], input[type="checkbox"]')
             for inp in inputs:
@@ -339,16 +437,16 @@ class BabylistStrollerScraper:
                     val = inp.get(attr, '').strip()
                     if val and self._is_babylist_color(val):
                         colors_found.add(val)
-                
-                # Check associated labels
+            
+                # Check associated labels (one index per page instead of a query per input)
                 label_for = inp.get('id')
                 if label_for:
-                    label = soup.select_one(f'label[for="{label_for}"]')
+                    label = page.labels_by_id.get(label_for)
                     if label:
                         label_text = label.get_text().strip()
                         if self._is_babylist_color(label_text):
                             colors_found.add(label_text)
-            
+        
             # Priority 4: Extract from product title/name (handles "- Color Name" format)
             product_name = product_data["name"]
             if product_name and product_name != "N/A":
@@ -358,14 +456,14 @@ class BabylistStrollerScraper:
                     potential_color = dash_match.group(1).strip()
                     if self._is_babylist_color(potential_color):
                         colors_found.add(potential_color)
-                
+            
                 # Look for "in [color]" patterns
                 in_matches = re.findall(r'\bin\s+([^,\(\)]+?)(?:\s*[\(\),]|$)', product_name, re.IGNORECASE)
                 for match in in_matches:
                     color = match.strip()
                     if self._is_babylist_color(color):
                         colors_found.add(color)
-            
+        
             # Priority 5: Image alt text (often contains color info)
             images = soup.select('img[alt*="/"], img[alt*="Frame"], img[alt*="Seat"]')
             for img in images:
@@ -377,45 +475,42 @@ class BabylistStrollerScraper:
                         r'in\s+([A-Za-z\s/]+)',
                         r'-\s*([A-Za-z\s/]+?)(?:\s|$)'
                     ]
-                    
+                
                     for pattern in color_patterns:
                         matches = re.findall(pattern, alt_text, re.IGNORECASE)
                         for match in matches:
                             if self._is_babylist_color(match.strip()):
                                 colors_found.add(match.strip())
-            
+        
             # Priority 6: JSON-LD structured data
-            try:
-                scripts = soup.select('script[type="application/ld+json"]')
-                for script in scripts:
-                    if script.string:
-                        data = json.loads(script.string)
-                        json_colors = self._extract_colors_from_json(data)
-                        colors_found.update(json_colors)
-            except:
-                pass
-            
+            for data in page.json_ld:
+                json_colors = self._extract_colors_from_json(data)
+                colors_found.update(json_colors)
+        
             # Clean and validate colors
             cleaned_colors = []
+            seen_colors = set()
             for color in colors_found:
                 if color and len(color.strip()) >= 3:
                     cleaned_color = color.strip()
                     # Remove duplicates (case-insensitive)
-                    if not any(cleaned_color.lower() == existing.lower() for existing in cleaned_colors):
+                    if cleaned_color.casefold() not in seen_colors:
+                        seen_colors.add(cleaned_color.casefold())
                         cleaned_colors.append(cleaned_color)
-            
-            # Set color data in product_data
-            product_data["color_options"] = cleaned_colors if cleaned_colors else ["N/A"]
-            
-            # Create simplified colors using the existing method
-            if cleaned_colors and cleaned_colors != ["N/A"]:
-                simplified = [self.simplify_color(color) for color in cleaned_colors]
-                product_data["simplified_colors"] = list(set(simplified))  # Remove duplicates
-            else:
-                product_data["simplified_colors"] = ["N/A"]
-            
-            # Continue with other extractions...
-            # Description - try multiple sources
+        
+        # Set color data in product_data
+        product_data["color_options"] = cleaned_colors if cleaned_colors else ["N/A"]
+        
+        # Create simplified colors using the existing method
+        if cleaned_colors and cleaned_colors != ["N/A"]:
+            simplified = [self.simplify_color(color) for color in cleaned_colors]
+            product_data["simplified_colors"] = list(set(simplified))  # Remove duplicates
+        else:
+            product_data["simplified_colors"] = ["N/A"]
+        
+        # Continue with other extractions...
+        # Description - try multiple sources
+        if "description" not in structured:
             desc_sources = [
                 'meta[name="description"]',
                 'meta[property="og:description"]', 
@@ -423,7 +518,7 @@ class BabylistStrollerScraper:
                 '.product-description',
                 '[class*="description"]'
             ]
-            
+        
             for selector in desc_sources:
                 desc_elem = soup.select_one(selector)
                 if desc_elem:
@@ -431,62 +526,60 @@ class BabylistStrollerScraper:
                         desc_text = desc_elem.get('content', '').strip()
                     else:
                         desc_text = desc_elem.get_text().strip()
-                    
+                
                     if desc_text and len(desc_text) > 20:
                         product_data["description"] = desc_text
                         break
-            
-            # SKU extraction
+        
+        # SKU extraction
+        if "sku" not in structured:
             sku_selectors = [
                 '[data-testid*="sku"]',
                 '[class*="sku"]', 
                 'script[type="application/ld+json"]'
             ]
-            
+        
             for selector in sku_selectors:
                 if 'script' in selector:
-                    scripts = soup.select(selector)
-                    for script in scripts:
-                        try:
-                            data = json.loads(script.string)
-                            if isinstance(data, dict) and 'sku' in data:
-                                product_data["sku"] = data['sku']
-                                break
-                            elif isinstance(data, list):
-                                for item in data:
-                                    if isinstance(item, dict) and 'sku' in item:
-                                        product_data["sku"] = item['sku']
-                                        break
-                        except:
-                            continue
+                    for data in page.json_ld:
+                        if isinstance(data, dict) and 'sku' in data:
+                            product_data["sku"] = data['sku']
+                            break
+                        elif isinstance(data, list):
+                            for item in data:
+                                if isinstance(item, dict) and 'sku' in item:
+                                    product_data["sku"] = item['sku']
+                                    break
                 else:
                     sku_elem = soup.select_one(selector)
                     if sku_elem:
                         product_data["sku"] = sku_elem.get_text().strip()
                         break
-            
-            # Image URL
+        
+        # Image URL
+        if "image_url" not in structured:
             img_selectors = [
                 'img[data-testid*="product"]',
                 '.product-image img',
                 '[class*="product"] img',
                 'img[alt*="stroller"]'
             ]
-            
+        
             for selector in img_selectors:
                 img = soup.select_one(selector)
                 if img and img.get('src'):
                     product_data["image_url"] = img['src']
                     break
-            
-            # Extract price
+        
+        # Extract price
+        if "price" not in structured:
             price_selectors = [
                 '[data-testid*="price"]',
                 '.price',
                 '[class*="price"]',
                 '.product-price'
             ]
-            
+        
             for selector in price_selectors:
                 price_elem = soup.select_one(selector)
                 if price_elem:
@@ -495,44 +588,29 @@ class BabylistStrollerScraper:
                     if price_match:
                         product_data["price"] = f"${price_match.group(1)}"
                         break
-            
-            # Extract specifications (weight, dimensions, rating)
-            spec_text = soup.get_text().lower()
-            
-            # Weight extraction
-            weight_patterns = [
-                r'weight[:\s]*(\d+(?:\.\d+)?)\s*(?:lbs?|pounds?)',
-                r'(\d+(?:\.\d+)?)\s*(?:lbs?|pounds?)\s*weight',
-                r'weighs?\s*(\d+(?:\.\d+)?)\s*(?:lbs?|pounds?)'
-            ]
-            
-            for pattern in weight_patterns:
-                match = re.search(pattern, spec_text)
-                if match:
-                    product_data["weight"] = f"{match.group(1)} lbs"
-                    break
-            
-            # Dimensions extraction  
-            dim_patterns = [
-                r'dimensions?[:\s]*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?',
-                r'(\d+(?:\.\d+)?)\s*["\']?\s*[lL]\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?\s*[wW]\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?\s*[hH]',
-                r'folded[:\s]*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?'
-            ]
-            
-            for pattern in dim_patterns:
-                match = re.search(pattern, spec_text)
-                if match:
-                    dims = f'{match.group(1)}" x {match.group(2)}" x {match.group(3)}"'
-                    product_data["dimensions"] = dims
-                    break
-            
-            # Rating extraction
+        
+        # Extract specifications (weight, dimensions, rating)
+        spec_text = page.text_lower
+        
+        # Weight extraction
+        match = WEIGHT_PATTERNS.search(spec_text)
+        if match:
+            product_data["weight"] = f"{match.group(1)} lbs"
+        
+        # Dimensions extraction  
+        match = DIMENSION_PATTERNS.search(spec_text)
+        if match:
+            dims = f'{match.group(1)}" x {match.group(2)}" x {match.group(3)}"'
+            product_data["dimensions"] = dims
+        
+        # Rating extraction
+        if "rating" not in structured:
             rating_selectors = [
                 '[data-testid*="rating"]',
                 '[class*="rating"]',
                 '[class*="stars"]'
             ]
-            
+        
             for selector in rating_selectors:
                 rating_elem = soup.select_one(selector)
                 if rating_elem:
@@ -541,7 +619,7 @@ class BabylistStrollerScraper:
                     if rating_match:
                         product_data["rating"] = rating_match.group(1)
                         break
-                    
+                
                     # Look for star elements
                     stars = rating_elem.select('[class*="star"]')
                     if stars:
@@ -549,62 +627,46 @@ class BabylistStrollerScraper:
                         if filled_stars > 0:
                             product_data["rating"] = str(filled_stars)
                             break
-            
-            # Tags extraction
-            tag_selectors = [
-                '[data-testid*="tag"]',
-                '[class*="tag"]',
-                '[class*="feature"]',
-                '[data-testid*="feature"]'
-            ]
-            
-            tags = set()
-            for selector in tag_selectors:
-                tag_elems = soup.select(selector)
-                for elem in tag_elems:
-                    tag_text = elem.get_text().strip()
-                    if tag_text and len(tag_text) < 50:
-                        tags.add(tag_text)
-            
-            product_data["tags"] = list(tags)
-            
-            return product_data
-            
-        except Exception as e:
-            print(f"Error scraping {url}: {e}")
-            return None
         
-    def scrape_all_strollers(self):
+        # Tags extraction
+        tag_selectors = [
+            '[data-testid*="tag"]',
+            '[class*="tag"]',
+            '[class*="feature"]',
+            '[data-testid*="feature"]'
+        ]
+        
+        tags = set()
+        for selector in tag_selectors:
+            tag_elems = soup.select(selector)
+            for elem in tag_elems:
+                tag_text = elem.get_text().strip()
+                if tag_text and len(tag_text) < 50:
+                    tags.add(tag_text)
+        
+        product_data["tags"] = list(tags)
+        
+        # The region-only parse missed a key field; redo the page from the full tree
+        if page.needs_full_parse(product_data):
+            return self.parse_product_page(url, html, scoped=False, field_sources=field_sources)
+        
+        (field_sources or self.field_sources).record_row(product_data, sources)
+        return product_data
+        
+    def scrape_all_strollers(self, pool_size=1, hybrid=False, on_product=None):
         """Main scraping method"""
         try:
-            # Load the main page
-            url = "https://www.babylist.com/store/single-strollers"
-            print(f"Loading main page: {url}")
-            self.driver.get(url)
-            time.sleep(3)
-            
-            # Load all products
-            self.scroll_and_load_all()
-            
-            # Get product URLs
-            product_urls = self.extract_product_list()
+            url = f"{self.base_url}/store/single-strollers"
+            # Listing data when the site exposes it, otherwise scroll the page
+            product_urls = discover_product_urls(self, url)
             
             if not product_urls:
                 print("No product URLs found!")
                 return []
             
-            # Scrape each product
-            products = []
-            for i, url in enumerate(product_urls, 1):
-                print(f"\nScraping product {i}/{len(product_urls)}")
-                product_data = self.extract_product_details(url)
-                if product_data:
-                    products.append(product_data)
-                
-                # Add delay to be respectful
-                time.sleep(2)
-            
-            return products
+            # Scrape each product, across a pool of browsers when pool_size > 1
+            return crawl_products(self, product_urls, pool_size=pool_size,
+                                  on_product=on_product, hybrid=hybrid)
             
         except Exception as e:
             print(f"Error in main scraping: {e}")
@@ -623,23 +685,94 @@ class BabylistStrollerScraper:
             if col in df.columns:
                 df[col] = df[col].apply(lambda x: ', '.join(x) if isinstance(x, list) else x)
         
+        # Variants keep their per-color price and SKU as a JSON array
+        if 'variants' in df.columns:
+            df['variants'] = df['variants'].apply(lambda x: json.dumps(x) if isinstance(x, list) else x)
+        
         df.to_csv(filename, index=False)
         print(f"\nSaved {len(products)} products to {filename}")
         print(f"Columns: {list(df.columns)}")
     
     def close(self):
-        """Close the web driver"""
+        """Quit the browser and remove the profile setup_driver() made for it"""
         if self.driver:
             self.driver.quit()
+            self.driver = None
+        if self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = None
 
 # Usage
 if __name__ == "__main__":
     chrome_path = "/Users/makaylacheng/Downloads/chromedriver-mac-arm64/chromedriver"
     
-    scraper = BabylistStrollerScraper(chrome_path)
+    parser = argparse.ArgumentParser(description="Scrape Babylist single strollers")
+    parser.add_argument("--pool-size", type=int, default=1,
+                        help="Number of parallel browser sessions for product pages")
+    parser.add_argument("--full-browser", action="store_true",
+                        help="Headed Chrome loading every resource (for comparing against the lean profile)")
+    parser.add_argument("--hybrid", action="store_true",
+                        help="Parse static HTML first and use the browser only when price or colors are missing")
+    parser.add_argument("--region-parse", action="store_true",
+                        help="Parse product pages from <head> plus the product region only "
+                             "(falls back to the full page when name or price is missing)")
+    parser.add_argument("--cache-dir", default=".http_cache",
+                        help="Directory for the on-disk response cache used by --hybrid static fetches")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always download --hybrid static pages from the network")
+    parser.add_argument("--base-url", default=BASE_URL,
+                        help="Site root, e.g. a local fixtures.py server for offline runs")
+    parser.add_argument("--record", metavar="DIR",
+                        help="Save every listing and product page to this fixture directory")
+    parser.add_argument("--output", default="babylist_single_strollers_complete.csv",
+                        help="Written row by row as products are scraped (.csv, .jsonl or .parquet)")
+    parser.add_argument("--export", metavar="DIR",
+                        help="Also write a Parquet dataset partitioned by category and run date")
+    parser.add_argument("--catalog", metavar="DB",
+                        help="Also upsert every product into this SQLite catalog")
+    parser.add_argument("--journal", metavar="PATH",
+                        help="Checkpoint journal (default: next to --output, e.g. products.journal.jsonl)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue from the journal: skip discovery and products already scraped")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Refetch only products that are new or whose listing tile or lastmod changed")
+    parser.add_argument("--state", metavar="PATH",
+                        help="Incremental state file (default: next to --output, e.g. products.state.json)")
+    parser.add_argument("--max-age", type=float, default=7, metavar="DAYS",
+                        help="With --incremental, refetch any product last fetched longer ago than this")
+    parser.add_argument("--sitemap", action="store_true",
+                        help="Discover product URLs from category sitemaps (else the listing page) and lastmods from all sitemaps")
+    args = parser.parse_args()
+    if args.region_parse:
+        set_region_parsing(True)
+    
+    cache = None if args.no_cache else ResponseCache(args.cache_dir)
+    recorder = FixtureStore(args.record) if args.record else None
+    sitemap = SitemapIndex(args.base_url, recorder=recorder) if args.sitemap else None
+    journal = CrawlJournal(args.journal or journal_path(args.output), resume=args.resume)
+    incremental = None
+    if args.incremental:
+        incremental = IncrementalState(args.state or state_path(args.output), max_age_days=args.max_age)
+    
+    scraper = BabylistStrollerScraper(chrome_path, lean_browser=not args.full_browser,
+                                      base_url=args.base_url, recorder=recorder, journal=journal,
+                                      incremental=incremental, sitemap=sitemap, cache=cache)
     try:
-        products = scraper.scrape_all_strollers()
-        scraper.save_to_csv(products)
+        sinks = [open_sink(args.output)]
+        if args.catalog:
+            sinks.append(CatalogStore(args.catalog, field_sources=scraper.field_sources))
+        with MultiSink(sinks) as sink:
+            products = scraper.scrape_all_strollers(pool_size=args.pool_size, hybrid=args.hybrid,
+                                                    on_product=sink.write)
+        sink.report()
+        if cache:
+            cache.save()
+            cache.report()
+        if args.export:
+            export_dataset(products, args.export)
         print(f"\nScraping complete! Found {len(products)} products.")
     finally:
-        scraper.close()
\ No newline at end of file
+        scraper.close()
+        journal.close()
+        if recorder:
+            recorder.save()
\ No newline at end of file
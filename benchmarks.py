@@ -0,0 +1,604 @@
+import argparse
+import contextlib
+import io
+import os
+import random
+import re
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+import html_parser
+import keyword_matcher
+from arrow_export import export_dataset, load_dataset
+from catalog_store import CatalogStore
+from fixtures import FixtureStore
+from keyword_matcher import KeywordMatcher
+from babylist_updated import BabylistStrollerScraper
+from multi_category import CATEGORIES
+from new_babylist import BabylistRequestsScraper
+from output_sink import CsvSink
+from page_context import PageContext
+from pipeline import ExtractionPipeline
+from patterns import REGISTRY
+
+
+def make_parse_only_scraper(name):
+    """Scraper whose extractors run on saved HTML without launching a browser"""
+    if name == 'requests':
+        return BabylistRequestsScraper(cache=None)
+    return CATEGORIES[name][0](None)
+
+
+def parse_only_spec(name):
+    """(scraper class, kwargs) that build make_parse_only_scraper(name) in a worker process"""
+    if name == 'requests':
+        return BabylistRequestsScraper, {"cache": None}
+    return CATEGORIES[name][0], {"chrome_path": None}
+
+
+def product_pages(directory):
+    """(url, html) for every recorded product page in a fixture directory"""
+    store = FixtureStore(directory)
+    pages = []
+    for key, entry in sorted(store.index.items()):
+        if not key.startswith('/gp/'):
+            continue
+        body, _ = store.load(key)
+        pages.append((entry["url"], body.decode('utf-8', 'replace')))
+    return pages
+
+
+def bench_parsers(pages, scraper_name, backends, repeat):
+    """Time parse + extract per page for each backend and diff rows against html.parser"""
+    scraper = make_parse_only_scraper(scraper_name)
+    original_backend = html_parser.get_backend()
+    baseline = None
+    results = []
+
+    try:
+        for backend in backends:
+            try:
+                html_parser.set_backend(backend)
+            except ValueError as e:
+                print(f"Skipping {backend}: {e}")
+                continue
+
+            timings = []
+            rows = []
+            # Extractors print every field; keep that out of the timings and the report
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(repeat):
+                    rows = []
+                    for url, html in pages:
+                        start = time.perf_counter()
+                        rows.append(scraper.parse_product_page(url, html))
+                        timings.append(time.perf_counter() - start)
+
+            if baseline is None:
+                baseline = rows
+            mismatches = [
+                row.get("retailer_url") for row, expected in zip(rows, baseline) if row != expected
+            ]
+            results.append({
+                "backend": backend,
+                "median_ms": statistics.median(timings) * 1000,
+                "total_s": sum(timings),
+                "mismatches": mismatches,
+            })
+    finally:
+        html_parser.set_backend(original_backend)
+
+    return results
+
+
+def report_parsers(results, page_count, repeat):
+    print(f"\nParser backends over {page_count} pages x {repeat} runs")
+    print(f"{'backend':<12} {'median ms/page':>15} {'total s':>9} {'speedup':>8}  rows")
+    base_total = results[0]["total_s"] if results else None
+    for result in results:
+        speedup = base_total / result["total_s"] if result["total_s"] else 0.0
+        rows = "identical" if not result["mismatches"] else f"{len(result['mismatches'])} differ"
+        print(f"{result['backend']:<12} {result['median_ms']:>15.2f} {result['total_s']:>9.2f} "
+              f"{speedup:>7.2f}x  {rows}")
+        for url in result["mismatches"][:5]:
+            print(f"    differs: {url}")
+
+
+def parse_with_scope(html, scoped):
+    """The soup PageContext would build: region-only if scoped and the page has one"""
+    soup = html_parser.make_region_soup(html) if scoped else None
+    return soup if soup is not None else html_parser.make_soup(html)
+
+
+def bench_regions(pages, scraper_name, repeat):
+    """Parse time, peak parse memory and extract time per page, full document vs region-only"""
+    scraper = make_parse_only_scraper(scraper_name)
+    cut_pages = sum(1 for _, html in pages if html_parser.region_markup(html) is not None)
+    baseline = None
+    results = []
+
+    for mode, scoped in [("full", False), ("region", True)]:
+        parse_timings = []
+        extract_timings = []
+        peaks = []
+        rows = []
+
+        for _, html in pages:
+            tracemalloc.start()
+            parse_with_scope(html, scoped)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(repeat):
+                rows = []
+                for url, html in pages:
+                    start = time.perf_counter()
+                    parse_with_scope(html, scoped)
+                    parse_timings.append(time.perf_counter() - start)
+
+                    start = time.perf_counter()
+                    rows.append(scraper.parse_product_page(url, html, scoped=scoped))
+                    extract_timings.append(time.perf_counter() - start)
+
+        if baseline is None:
+            baseline = rows
+        results.append({
+            "mode": mode,
+            "parse_ms": statistics.median(parse_timings) * 1000,
+            "peak_kb": statistics.median(peaks) / 1024,
+            "page_ms": statistics.median(extract_timings) * 1000,
+            "changed": [
+                (row.get("retailer_url"), field)
+                for row, expected in zip(rows, baseline)
+                for field in row if row.get(field) != expected.get(field)
+            ],
+        })
+
+    return results, cut_pages
+
+
+def report_regions(results, cut_pages, page_count, repeat):
+    print(f"\nRegion parsing over {page_count} pages x {repeat} runs "
+          f"({cut_pages} with a <main> region; the rest parse in full)")
+    print(f"{'mode':<8} {'parse ms':>9} {'peak KB':>9} {'parse+extract ms':>17}")
+    for result in results:
+        print(f"{result['mode']:<8} {result['parse_ms']:>9.2f} {result['peak_kb']:>9.0f} {result['page_ms']:>17.2f}")
+    if len(results) == 2:
+        full, region = results
+        print(f"region/full: parse {region['parse_ms'] / full['parse_ms']:.0%}, "
+              f"memory {region['peak_kb'] / full['peak_kb']:.0%}, page {region['page_ms'] / full['page_ms']:.0%}")
+        print(f"{len(region['changed'])} field values differ from the full parse")
+        for url, field in region["changed"][:10]:
+            print(f"    {field}: {url}")
+
+
+def keyword_candidates(pages):
+    """What the matchers see on a page: short element texts and attributes, plus the page text"""
+    candidates = []
+    for _, html in pages:
+        page = PageContext(html)
+        candidates.append(page.text)
+        for elem in page.soup.select('a, button, option, span, li, img[alt]'):
+            for text in [elem.get_text(), elem.get('alt', ''), elem.get('href', '')]:
+                if text and len(text) <= 200:
+                    candidates.append(text)
+    return candidates
+
+
+def synthetic_vocabulary(size, seed=0):
+    """size made-up brand/color names on top of a few real ones, so some keywords hit"""
+    rng = random.Random(seed)
+    vocabulary = ['black', 'navy', 'charcoal', 'uppababy', 'bugaboo', 'stroller', 'canopy'][:size]
+    while len(vocabulary) < size:
+        length = rng.randint(4, 10)
+        vocabulary.append(''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(length)))
+    return vocabulary
+
+
+def bench_keywords(candidates, sizes, repeat):
+    """Time the any(word in text) loops against each KeywordMatcher backend per vocabulary size"""
+    backends = [b for b in keyword_matcher.BACKENDS
+                if b != 'pyahocorasick' or keyword_matcher.HAVE_PYAHOCORASICK]
+    lowered = [text.lower() for text in candidates]
+    results = []
+
+    for size in sizes:
+        vocabulary = synthetic_vocabulary(size)
+        timings = {}
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            expected = [[word for word in vocabulary if word in text] for text in lowered]
+        timings["any() loop"] = (time.perf_counter() - start) / repeat
+
+        mismatches = {}
+        for backend in backends:
+            matcher = KeywordMatcher(vocabulary, backend=backend)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                found = [matcher.find_all(text) for text in candidates]
+            timings[backend] = (time.perf_counter() - start) / repeat
+            mismatches[backend] = sum(1 for a, b in zip(found, expected) if a != b)
+
+        results.append({"size": size, "timings": timings, "mismatches": mismatches})
+
+    return results
+
+
+def report_keywords(results, candidate_count, repeat):
+    print(f"\nKeyword matching over {candidate_count} texts x {repeat} runs (ms per pass, all keywords found)")
+    columns = list(results[0]["timings"]) if results else []
+    print(f"{'keywords':>8} " + " ".join(f"{column:>14}" for column in columns) + "  matches")
+    for result in results:
+        bad = {backend: count for backend, count in result["mismatches"].items() if count}
+        matches = "identical" if not bad else ", ".join(f"{b} {n} differ" for b, n in bad.items())
+        print(f"{result['size']:>8} " + " ".join(f"{result['timings'][column] * 1000:>14.2f}" for column in columns)
+              + f"  {matches}")
+
+
+def variant_page(variants):
+    """Product page with one radio swatch and label per color variant"""
+    swatches = ''.join(
+        f'<input type="radio" name="color" id="color-{i}" value="{i}">'
+        f'<label for="color-{i}">Shade {i} Frame / Canopy {i}</label>'
+        for i in range(variants)
+    )
+    return (f'<html><head><title>Variant Stroller | Babylist</title></head><body><main>'
+            f'<h1>Variant Stroller</h1><div class="price">$499.99</div>'
+            f'<fieldset>{swatches}</fieldset></main></body></html>')
+
+
+def bench_colors(variant_counts, repeat):
+    """Label lookup (a select_one per input vs the per-page index) and whole-page time by variant count"""
+    scraper = BabylistStrollerScraper(None)
+    results = []
+
+    for variants in variant_counts:
+        html = variant_page(variants)
+        timings = {"select_one": [], "index": [], "page": []}
+        for _ in range(repeat):
+            page = PageContext(html)
+            inputs = page.soup.select('input[type="radio"], input[type="checkbox"]')
+
+            start = time.perf_counter()
+            for inp in inputs:
+                page.soup.select_one(f'label[for="{inp["id"]}"]')
+            timings["select_one"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for inp in inputs:
+                page.labels_by_id.get(inp["id"])
+            timings["index"].append(time.perf_counter() - start)
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                row = scraper.parse_product_page("variant-page", html)
+                timings["page"].append(time.perf_counter() - start)
+
+        results.append({
+            "variants": variants,
+            "colors": len(row["color_options"]),
+            **{key: statistics.median(values) * 1000 for key, values in timings.items()},
+        })
+
+    return results
+
+
+def report_colors(results, repeat):
+    print(f"\nRadio/checkbox color pass on synthetic pages, {repeat} runs (median ms)")
+    print(f"{'variants':>8} {'colors':>7} {'select_one':>11} {'index':>8} {'whole page':>11}")
+    for result in results:
+        print(f"{result['variants']:>8} {result['colors']:>7} {result['select_one']:>11.2f} "
+              f"{result['index']:>8.3f} {result['page']:>11.2f}")
+
+
+def bench_pipeline(pages, scraper_name, worker_counts, copies):
+    """Extraction throughput through ExtractionPipeline per worker count, against a serial loop"""
+    scraper = make_parse_only_scraper(scraper_name)
+    scraper_class, scraper_kwargs = parse_only_spec(scraper_name)
+    html_by_url = {}
+    urls = []
+    for copy in range(copies):
+        for url, html in pages:
+            # Distinct URLs so every copy is its own task
+            html_by_url[f"{url}#{copy}"] = html
+            urls.append(f"{url}#{copy}")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        baseline = [scraper.parse_product_page(url, html_by_url[url]) for url in urls]
+        elapsed = time.perf_counter() - start
+    results = [{"workers": "serial", "pages_per_s": len(urls) / elapsed, "mismatches": 0}]
+
+    for workers in worker_counts:
+        pipeline = ExtractionPipeline(html_by_url.get, scraper_class, scraper_kwargs,
+                                      fetchers=2, workers=workers)
+        with contextlib.redirect_stdout(io.StringIO()):
+            rows = pipeline.run(urls)
+        elapsed = pipeline.stats["elapsed"]
+        results.append({
+            "workers": workers,
+            "pages_per_s": len(urls) / elapsed if elapsed else 0.0,
+            "mismatches": sum(1 for row, expected in zip(rows, baseline) if row != expected)
+                          + abs(len(rows) - len(baseline)),
+        })
+
+    return results, len(urls)
+
+
+def report_pipeline(results, page_count):
+    print(f"\nExtraction pipeline over {page_count} pages ({os.cpu_count()} CPUs)")
+    print(f"{'workers':>8} {'pages/s':>9} {'speedup':>8}  rows")
+    base = results[0]["pages_per_s"] if results else 0
+    for result in results:
+        rows = "identical" if not result["mismatches"] else f"{result['mismatches']} differ"
+        speedup = result["pages_per_s"] / base if base else 0.0
+        print(f"{result['workers']:>8} {result['pages_per_s']:>9.1f} {speedup:>7.2f}x  {rows}")
+
+
+def category_rows(pages, copies):
+    """Rows from every category scraper over the pages, copies times with distinct URLs"""
+    rows = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name in CATEGORIES:
+            scraper = make_parse_only_scraper(name)
+            parsed = [scraper.parse_product_page(url, html) for url, html in pages]
+            for copy in range(copies):
+                for product_data in parsed:
+                    if product_data:
+                        rows.append(dict(product_data, retailer_url=f"{product_data['retailer_url']}#{copy}"))
+    return rows
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def load_csvs(paths):
+    """What the notebooks do: read each category CSV and split list columns again"""
+    frames = [pd.read_csv(path) for path in paths]
+    df = pd.concat(frames, ignore_index=True)
+    for col in ['color_options', 'simplified_colors', 'tags']:
+        df[col] = df[col].fillna('').str.split(', ')
+    return df
+
+
+def bench_export(rows, repeat):
+    """Bytes on disk and load time: one CSV per category vs the partitioned Parquet dataset"""
+    workdir = tempfile.mkdtemp(prefix="babylist-export-")
+    try:
+        csv_paths = []
+        for category in sorted({row['category'] for row in rows}):
+            path = os.path.join(workdir, f"{category}.csv")
+            with CsvSink(path) as sink:
+                for row in rows:
+                    if row['category'] == category:
+                        sink.write(row)
+            csv_paths.append(path)
+        root = os.path.join(workdir, "dataset")
+        with contextlib.redirect_stdout(io.StringIO()):
+            export_dataset(rows, root)
+
+        results = []
+        for label, size, load in [
+            ("csv", sum(os.path.getsize(path) for path in csv_paths), lambda: load_csvs(csv_paths)),
+            ("parquet", directory_size(root), lambda: load_dataset(root)),
+            ("parquet, 2 cols", directory_size(root), lambda: load_dataset(root, columns=['name', 'price'])),
+        ]:
+            times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                df = load()
+                times.append(time.perf_counter() - start)
+            results.append({"format": label, "bytes": size, "load_ms": statistics.median(times) * 1000,
+                            "rows": len(df)})
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def report_export(results, repeat):
+    print(f"\nCategory CSVs vs partitioned Parquet, {repeat} loads (median ms)")
+    print(f"{'format':>16} {'rows':>7} {'KB':>9} {'load ms':>9}")
+    for result in results:
+        print(f"{result['format']:>16} {result['rows']:>7} {result['bytes'] / 1024:>9.1f} {result['load_ms']:>9.1f}")
+
+
+def bench_catalog(rows, batch_sizes):
+    """Upsert throughput into a fresh CatalogStore, one transaction per batch_size rows"""
+    # Copies are new products: canonical URLs drop the #fragment, and they must not share a SKU either
+    rows = [dict(row, retailer_url=f"{row['retailer_url'].split('#')[0]}?copy={index}",
+                 sku=f"{row['sku']}-{index}" if row.get('sku', 'N/A') != 'N/A' else 'N/A')
+            for index, row in enumerate(rows)]
+    results = []
+    for batch_size in batch_sizes:
+        workdir = tempfile.mkdtemp(prefix="babylist-catalog-")
+        try:
+            store = CatalogStore(os.path.join(workdir, "catalog.db"), flush_every=batch_size, flush_seconds=float('inf'))
+            start = time.perf_counter()
+            for row in rows:
+                store.write(row)
+            store.close()
+            elapsed = time.perf_counter() - start
+            results.append({"batch": batch_size, "rows_per_s": len(rows) / elapsed, "products": store.total})
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def report_catalog(results, row_count):
+    print(f"\nCatalog upserts of {row_count} rows")
+    print(f"{'batch':>7} {'rows/s':>9} {'speedup':>8} {'products':>9}")
+    base = results[0]["rows_per_s"] if results else 0
+    for result in results:
+        speedup = result["rows_per_s"] / base if base else 0.0
+        print(f"{result['batch']:>7} {result['rows_per_s']:>9.0f} {speedup:>7.2f}x {result['products']:>9}")
+
+
+def search_loop(pattern_set, text):
+    """How extractors matched a field before PatternSet: one re.search per pattern string"""
+    for source in pattern_set.sources:
+        match = re.search(source, text, pattern_set.flags)
+        if match:
+            return match
+    return None
+
+
+def bench_patterns(pages, repeat):
+    """Time the original re.search loops against PatternSet.search for every registered field"""
+    texts = [PageContext(html).text_lower for _, html in pages]
+    results = []
+
+    for name, pattern_set in sorted(REGISTRY.items()):
+        timings = {"loop": [], "prefilter": []}
+        mismatches = 0
+        for text in texts:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                expected = search_loop(pattern_set, text)
+                timings["loop"].append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                found = pattern_set.search(text)
+                timings["prefilter"].append(time.perf_counter() - start)
+
+            if (expected and expected.groups()) != (found and found.groups()):
+                mismatches += 1
+
+        results.append({
+            "field": name,
+            "patterns": len(pattern_set.patterns),
+            "loop_ms": statistics.median(timings["loop"]) * 1000,
+            "prefilter_ms": statistics.median(timings["prefilter"]) * 1000,
+            "mismatches": mismatches,
+        })
+
+    return results
+
+
+def report_patterns(results, page_count, repeat):
+    print(f"\nField pattern matching over {page_count} pages x {repeat} runs (median ms/page)")
+    print(f"{'field':<28} {'patterns':>8} {'re.search loop':>15} {'prefilter':>9} {'speedup':>8}  matches")
+    for result in results:
+        speedup = result["loop_ms"] / result["prefilter_ms"] if result["prefilter_ms"] else 0.0
+        matches = "identical" if not result["mismatches"] else f"{result['mismatches']} differ"
+        print(f"{result['field']:<28} {result['patterns']:>8} {result['loop_ms']:>15.3f} "
+              f"{result['prefilter_ms']:>9.3f} {speedup:>7.2f}x  {matches}")
+
+
+# Usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline benchmarks over recorded fixture pages")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parsers_cmd = commands.add_parser("parsers", help="Compare HTML parser backends on product pages")
+    parsers_cmd.add_argument("directory", help="Fixture directory written with --record")
+    parsers_cmd.add_argument("--scraper", default="single-strollers", choices=list(CATEGORIES) + ['requests'],
+                             help="Whose extractors to run over the pages")
+    parsers_cmd.add_argument("--backends", nargs="+", default=html_parser.BACKENDS,
+                             help="Backends to compare; the first is the baseline for row diffs")
+    parsers_cmd.add_argument("--repeat", type=int, default=3)
+
+    regions_cmd = commands.add_parser("regions", help="Compare full-document parsing with <head> + product-region parsing")
+    regions_cmd.add_argument("directory", help="Fixture directory written with --record")
+    regions_cmd.add_argument("--scraper", default="single-strollers", choices=list(CATEGORIES) + ['requests'],
+                             help="Whose extractors to run over the pages")
+    regions_cmd.add_argument("--repeat", type=int, default=3)
+
+    patterns_cmd = commands.add_parser("patterns", help="Compare per-pattern regex loops with literal-prefiltered PatternSets")
+    patterns_cmd.add_argument("directory", help="Fixture directory written with --record")
+    patterns_cmd.add_argument("--repeat", type=int, default=20)
+
+    keywords_cmd = commands.add_parser("keywords", help="Compare any(word in text) loops with KeywordMatcher backends")
+    keywords_cmd.add_argument("directory", help="Fixture directory written with --record")
+    keywords_cmd.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000],
+                              help="Vocabulary sizes to try")
+    keywords_cmd.add_argument("--repeat", type=int, default=3)
+
+    colors_cmd = commands.add_parser("colors", help="Time color extraction on synthetic pages with many variants")
+    colors_cmd.add_argument("--variants", type=int, nargs="+", default=[25, 100, 200, 400])
+    colors_cmd.add_argument("--repeat", type=int, default=3)
+
+    pipeline_cmd = commands.add_parser("pipeline", help="Measure extraction throughput across worker processes")
+    pipeline_cmd.add_argument("directory", help="Fixture directory written with --record")
+    pipeline_cmd.add_argument("--scraper", default="single-strollers", choices=list(CATEGORIES) + ['requests'],
+                              help="Whose extractors to run over the pages")
+    pipeline_cmd.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    pipeline_cmd.add_argument("--copies", type=int, default=10,
+                              help="Times each recorded page is fed through, for a longer run")
+
+    export_cmd = commands.add_parser("export", help="Compare category CSVs with the partitioned Parquet dataset")
+    export_cmd.add_argument("directory", help="Fixture directory written with --record")
+    export_cmd.add_argument("--copies", type=int, default=500,
+                            help="Times each parsed row is repeated, for a catalog-sized file")
+    export_cmd.add_argument("--repeat", type=int, default=5)
+
+    catalog_cmd = commands.add_parser("catalog", help="Compare per-row commits with batched catalog transactions")
+    catalog_cmd.add_argument("directory", help="Fixture directory written with --record")
+    catalog_cmd.add_argument("--copies", type=int, default=50,
+                             help="Times each parsed row is repeated under a new URL")
+    catalog_cmd.add_argument("--batches", type=int, nargs="+", default=[1, 10, 100, 1000],
+                             help="Rows per transaction; 1 commits every row")
+
+    args = parser.parse_args()
+
+    if args.command == "parsers":
+        pages = product_pages(args.directory)
+        if not pages:
+            raise SystemExit(f"No product pages recorded in {args.directory}")
+        results = bench_parsers(pages, args.scraper, args.backends, args.repeat)
+        report_parsers(results, len(pages), args.repeat)
+
+    elif args.command == "regions":
+        pages = product_pages(args.directory)
+        if not pages:
+            raise SystemExit(f"No product pages recorded in {args.directory}")
+        results, cut_pages = bench_regions(pages, args.scraper, args.repeat)
+        report_regions(results, cut_pages, len(pages), args.repeat)
+
+    elif args.command == "patterns":
+        pages = product_pages(args.directory)
+        if not pages:
+            raise SystemExit(f"No product pages recorded in {args.directory}")
+        results = bench_patterns(pages, args.repeat)
+        report_patterns(results, len(pages), args.repeat)
+
+    elif args.command == "keywords":
+        pages = product_pages(args.directory)
+        if not pages:
+            raise SystemExit(f"No product pages recorded in {args.directory}")
+        candidates = keyword_candidates(pages)
+        results = bench_keywords(candidates, args.sizes, args.repeat)
+        report_keywords(results, len(candidates), args.repeat)
+
+    elif args.command == "colors":
+        results = bench_colors(args.variants, args.repeat)
+        report_colors(results, args.repeat)
+
+    elif args.command == "pipeline":
+        pages = product_pages(args.directory)
+        if not pages:
+            raise SystemExit(f"No product pages recorded in {args.directory}")
+        results, page_count = bench_pipeline(pages, args.scraper, args.workers, args.copies)
+        report_pipeline(results, page_count)
+
+    elif args.command == "export":
+        pages = product_pages(args.directory)
+        if not pages:
+            raise SystemExit(f"No product pages recorded in {args.directory}")
+        results = bench_export(category_rows(pages, args.copies), args.repeat)
+        report_export(results, args.repeat)
+
+    elif args.command == "catalog":
+        pages = product_pages(args.directory)
+        if not pages:
+            raise SystemExit(f"No product pages recorded in {args.directory}")
+        rows = category_rows(pages, args.copies)
+        results = bench_catalog(rows, args.batches)
+        report_catalog(results, len(rows))
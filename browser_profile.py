@@ -0,0 +1,46 @@
+# Lean Chrome profile for scraping: we only read page_source, so images,
+# media, fonts and third-party trackers are pure overhead on every page.
+
+# Resource URLs blocked through CDP Network.setBlockedURLs (wildcards allowed).
+# Only file types we never read and third-party hosts are listed, so the
+# site's own scripts and data still load and the product markup renders.
+BLOCKED_URL_PATTERNS = [
+    # Images and media
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+    '*.mp4', '*.webm', '*.mov', '*.m3u8',
+    # Fonts
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    # Analytics, ads and session replay
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*googlesyndication.com*', '*googleadservices.com*', '*facebook.net*',
+    '*facebook.com/tr*', '*connect.facebook.net*', '*hotjar.com*', '*segment.io*',
+    '*segment.com*', '*optimizely.com*', '*fullstory.com*', '*amplitude.com*',
+    '*mixpanel.com*', '*pinterest.com*', '*tiktok.com*', '*snapchat.com*',
+    '*bing.com*', '*criteo.com*', '*taboola.com*', '*outbrain.com*',
+    '*newrelic.com*', '*nr-data.net*', '*sentry.io*', '*branch.io*',
+    '*intercom.io*', '*zendesk.com*', '*yotpo.com*', '*impact.com*',
+]
+
+def apply_lean_options(options):
+    """Headless, no images, and return from driver.get at DOMContentLoaded"""
+    options.add_argument("--headless=new")
+    options.add_argument("--window-size=1366,900")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--mute-audio")
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.media_stream": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+    # wait_for_product_page decides readiness, so don't wait for every subresource
+    options.page_load_strategy = 'eager'
+    return options
+
+
+def enable_request_blocking(driver):
+    """Block fonts, media and third-party domains at the network layer via CDP"""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        print(f"Request blocking unavailable, loading full pages: {e}")
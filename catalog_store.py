@@ -0,0 +1,252 @@
+import json
+import sqlite3
+from datetime import datetime, timezone
+
+from arrow_export import parse_price, parse_rating, parse_weight
+from http_client import canonical_url
+from output_sink import ProductSink
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    sku TEXT,
+    sku_source TEXT,
+    name TEXT,
+    brand TEXT,
+    description TEXT,
+    category TEXT,
+    price REAL,
+    price_text TEXT,
+    rating REAL,
+    weight_lbs REAL,
+    dimensions TEXT,
+    image_url TEXT,
+    retailer TEXT,
+    retailer_url TEXT,
+    color_options TEXT,
+    tags TEXT,
+    variants TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS product_categories (
+    product_id INTEGER NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    category TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    PRIMARY KEY (product_id, category)
+);
+CREATE TABLE IF NOT EXISTS product_aliases (
+    url TEXT PRIMARY KEY,
+    product_id INTEGER NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS product_colors (
+    product_id INTEGER NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    color TEXT NOT NULL,
+    PRIMARY KEY (product_id, color)
+);
+CREATE INDEX IF NOT EXISTS idx_products_sku ON products(sku);
+CREATE INDEX IF NOT EXISTS idx_products_brand ON products(brand);
+CREATE INDEX IF NOT EXISTS idx_products_price ON products(price);
+CREATE INDEX IF NOT EXISTS idx_product_categories_category ON product_categories(category);
+CREATE INDEX IF NOT EXISTS idx_product_colors_color ON product_colors(color);
+"""
+
+# Row field -> column, for the fields stored as they are scraped
+TEXT_COLUMNS = {
+    'name': 'name', 'brand': 'brand', 'description': 'description', 'category': 'category',
+    'dimensions': 'dimensions', 'image_url': 'image_url', 'retailer': 'retailer', 'retailer_url': 'retailer_url',
+}
+JSON_COLUMNS = ['color_options', 'tags', 'variants']
+# SKUs from these field_sources tiers identify a product; DOM-scraped ones can be junk like "details"
+TRUSTED_SKU_SOURCES = ('app-state', 'json-ld')
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def _value(value):
+    return None if value in (None, '', 'N/A') else value
+
+
+class CatalogStore(ProductSink):
+    """Durable SQLite catalog that every category scraper upserts into
+
+    A product is one row, keyed by the first canonical retailer_url it was
+    seen under and falling back to its SKU when the URL is new and both SKUs
+    came from structured data. Such a URL (e.g. another variant's page)
+    becomes an alias in product_aliases rather than replacing the key, so
+    two URLs sharing a SKU never move the row back and forth. Each product
+    has first_seen/last_seen times and a membership row per category it was
+    listed under. SKU tiers come from
+    the scraper's structured_data.FieldSources, never from the row itself,
+    so nothing catalog-only ends up in the file outputs. Rows are buffered
+    and written one transaction per batch, so a run costs a commit every
+    flush_every rows instead of one per product.
+    """
+
+    def __init__(self, path, flush_every=100, flush_seconds=5.0, field_sources=None):
+        super().__init__(path, flush_every=flush_every, flush_seconds=flush_seconds)
+        # Optional FieldSources the scraper records SKU tiers into; without it no SKU is trusted
+        self.field_sources = field_sources
+        # write() and flushes may run on driver-pool or fetch threads; ProductSink's lock serializes them
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+        columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(products)")}
+        if 'sku_source' not in columns:
+            # Catalogs created before SKU sources were tracked
+            self.conn.execute("ALTER TABLE products ADD COLUMN sku_source TEXT")
+        self.rows = []
+        self.inserted = 0
+        self.updated = 0
+        self.total = 0
+
+    def _write(self, product_data):
+        # Stamped when scraped, not when the batch is flushed; the SKU tier is taken now,
+        # while the scraper still holds it
+        sku_source = None
+        if self.field_sources is not None and product_data.get('retailer_url'):
+            sku_source = self.field_sources.sku_tier(product_data['retailer_url'])
+        self.rows.append((product_data, sku_source, _now()))
+
+    def _write_pending(self):
+        with self.conn:
+            for product_data, sku_source, seen in self.rows:
+                self._upsert(product_data, sku_source, seen)
+        self.rows = []
+        self.total = self.conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+    def _close(self):
+        self.conn.close()
+
+    def _find(self, url, sku, sku_source):
+        """(product id, whether url is not its key URL), or (None, False)"""
+        row = self.conn.execute("SELECT id FROM products WHERE url = ?", (url,)).fetchone()
+        if row is not None:
+            return row['id'], False
+        row = self.conn.execute("SELECT product_id FROM product_aliases WHERE url = ?", (url,)).fetchone()
+        if row is not None:
+            return row['product_id'], True
+        if sku and sku_source in TRUSTED_SKU_SOURCES:
+            placeholders = ', '.join('?' for _ in TRUSTED_SKU_SOURCES)
+            row = self.conn.execute(f"SELECT id FROM products WHERE sku = ? AND sku_source IN ({placeholders}) "
+                                    "ORDER BY id LIMIT 1", (sku,) + TRUSTED_SKU_SOURCES).fetchone()
+            if row is not None:
+                return row['id'], True
+        return None, False
+
+    def _upsert(self, product_data, sku_source, seen):
+        url = canonical_url(product_data['retailer_url'])
+        sku = _value(product_data.get('sku'))
+        values = {column: _value(product_data.get(field)) for field, column in TEXT_COLUMNS.items()}
+        if not sku:
+            sku_source = None
+        values.update({
+            'sku': sku,
+            'sku_source': sku_source,
+            'price': parse_price(product_data.get('price')),
+            'price_text': _value(product_data.get('price')),
+            'rating': parse_rating(product_data.get('rating')),
+            'weight_lbs': parse_weight(product_data.get('weight')),
+        })
+        for column in JSON_COLUMNS:
+            if isinstance(product_data.get(column), list):
+                values[column] = json.dumps(product_data[column])
+
+        product_id, alias = self._find(url, sku, sku_source)
+        if product_id is None:
+            values.update({'url': url, 'first_seen': seen, 'last_seen': seen})
+            columns = ', '.join(values)
+            placeholders = ', '.join('?' for _ in values)
+            product_id = self.conn.execute(f"INSERT INTO products ({columns}) VALUES ({placeholders})",
+                                           list(values.values())).lastrowid
+            self.inserted += 1
+        else:
+            # A field this run could not find keeps the value an earlier run stored
+            values = {column: value for column, value in values.items() if value is not None}
+            if alias:
+                # Same product under another URL; the row keeps its first one
+                values.pop('retailer_url', None)
+                self.conn.execute(
+                    "INSERT INTO product_aliases (url, product_id, first_seen, last_seen) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(url) DO UPDATE SET last_seen = excluded.last_seen",
+                    (url, product_id, seen, seen),
+                )
+            values['last_seen'] = seen
+            assignments = ', '.join(f"{column} = ?" for column in values)
+            self.conn.execute(f"UPDATE products SET {assignments} WHERE id = ?", list(values.values()) + [product_id])
+            self.updated += 1
+
+        categories = product_data.get('categories') or [product_data.get('category')]
+        self.conn.executemany(
+            "INSERT INTO product_categories (product_id, category, first_seen, last_seen) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(product_id, category) DO UPDATE SET last_seen = excluded.last_seen",
+            [(product_id, category, seen, seen) for category in categories if _value(category)],
+        )
+
+        colors = product_data.get('simplified_colors')
+        if isinstance(colors, list) and colors:
+            self.conn.execute("DELETE FROM product_colors WHERE product_id = ?", (product_id,))
+            self.conn.executemany("INSERT OR IGNORE INTO product_colors (product_id, color) VALUES (?, ?)",
+                                  [(product_id, color) for color in colors])
+
+    def report(self):
+        if not self.count:
+            return
+        print(f"\nCatalog {self.path}: {self.inserted} new and {self.updated} updated products "
+              f"({self.total} in total)")
+
+    def get(self, url):
+        """Stored product for a URL or one of its aliases, with its categories and simplified colors, or None"""
+        with self.lock:
+            self._flush()
+            row = self.conn.execute(
+                "SELECT p.* FROM products p WHERE p.url = ? OR p.id = "
+                "(SELECT a.product_id FROM product_aliases a WHERE a.url = ?)",
+                (canonical_url(url), canonical_url(url))).fetchone()
+            return self._product(row) if row else None
+
+    def search(self, brand=None, category=None, color=None, min_price=None, max_price=None):
+        """Stored products matching every filter given, cheapest first"""
+        clauses, params = [], []
+        if brand:
+            clauses.append("p.brand = ?")
+            params.append(brand)
+        if category:
+            clauses.append("EXISTS (SELECT 1 FROM product_categories c WHERE c.product_id = p.id AND c.category = ?)")
+            params.append(category)
+        if color:
+            clauses.append("EXISTS (SELECT 1 FROM product_colors pc WHERE pc.product_id = p.id AND pc.color = ?)")
+            params.append(color)
+        if min_price is not None:
+            clauses.append("p.price >= ?")
+            params.append(min_price)
+        if max_price is not None:
+            clauses.append("p.price <= ?")
+            params.append(max_price)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self.lock:
+            self._flush()
+            rows = self.conn.execute(f"SELECT p.* FROM products p {where} ORDER BY p.price IS NULL, p.price, p.id",
+                                     params).fetchall()
+            return [self._product(row) for row in rows]
+
+    def _product(self, row):
+        product = dict(row)
+        for column in JSON_COLUMNS:
+            product[column] = json.loads(product[column]) if product[column] else []
+        product['categories'] = [r['category'] for r in self.conn.execute(
+            "SELECT category FROM product_categories WHERE product_id = ? ORDER BY first_seen, category", (row['id'],))]
+        product['aliases'] = [r['url'] for r in self.conn.execute(
+            "SELECT url FROM product_aliases WHERE product_id = ? ORDER BY first_seen, url", (row['id'],))]
+        product['simplified_colors'] = [r['color'] for r in self.conn.execute(
+            "SELECT color FROM product_colors WHERE product_id = ? ORDER BY color", (row['id'],))]
+        return product
@@ -0,0 +1,143 @@
+import json
+import os
+import threading
+import time
+
+
+def journal_path(output):
+    """Default journal next to an output file: products.csv -> products.journal.jsonl"""
+    return os.path.splitext(output)[0] + ".journal.jsonl"
+
+
+class CrawlJournal:
+    """Append-only JSONL record of a crawl, so a restarted run only does the remaining work
+
+    Three kinds of line are written as the crawl goes:
+      {"event": "listing", "url": ..., "urls": [...]}   product URLs a listing page gave
+      {"event": "done", "url": ..., "row": {...}}         a scraped product row
+      {"event": "failed", "url": ..., "error": ...}       a product that gave no row
+    With resume=True an existing journal is replayed: listings are not
+    rediscovered, finished products are not refetched and failed ones are
+    retried. Otherwise the journal starts empty. Every line is flushed as it
+    is written, and a line cut short by a crash is skipped on replay.
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.listings = {}
+        self.done = {}
+        self.failed = {}
+        self.lock = threading.Lock()
+        if resume and os.path.exists(path):
+            self._replay()
+        cut_short = resume and self._ends_mid_line()
+        self.file = open(path, 'a' if resume else 'w', encoding='utf-8')
+        if cut_short:
+            # Terminate the line a crash left half written before appending
+            self.file.write('\n')
+            self.file.flush()
+
+    def _ends_mid_line(self):
+        if not os.path.exists(self.path) or not os.path.getsize(self.path):
+            return False
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b'\n'
+
+    def _replay(self):
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                event = entry.get('event')
+                if event == 'listing':
+                    self.listings[entry['url']] = entry['urls']
+                elif event == 'done':
+                    self.done[entry['url']] = entry['row']
+                    self.failed.pop(entry['url'], None)
+                elif event == 'failed' and entry['url'] not in self.done:
+                    self.failed[entry['url']] = entry.get('error')
+        if self.listings or self.done:
+            print(f"Journal {self.path}: {len(self.listings)} listings, {len(self.done)} products done, "
+                  f"{len(self.failed)} failed")
+
+    def _append(self, entry):
+        entry['time'] = round(time.time(), 3)
+        with self.lock:
+            self.file.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+            self.file.flush()
+
+    def listing(self, listing_url):
+        """Product URLs recorded for a listing page, or None if it has not been discovered"""
+        return self.listings.get(listing_url)
+
+    def record_listing(self, listing_url, product_urls):
+        self.listings[listing_url] = list(product_urls)
+        self._append({'event': 'listing', 'url': listing_url, 'urls': list(product_urls)})
+
+    def record_done(self, url, product_data):
+        self.done[url] = product_data
+        self.failed.pop(url, None)
+        self._append({'event': 'done', 'url': url, 'row': product_data})
+
+    def record_failed(self, url, error):
+        self.failed[url] = error
+        self._append({'event': 'failed', 'url': url, 'error': error})
+
+    def crawl(self, product_urls, run, on_product=None):
+        """Rows for product_urls in order, calling run(urls, on_product) only for unfinished ones
+
+        Rows from the journal are handed to on_product first, so an output
+        file rewritten by a resumed run still gets every product.
+        """
+        finished = [url for url in product_urls if url in self.done]
+        pending = [url for url in product_urls if url not in self.done]
+        if finished:
+            print(f"Resuming: {len(finished)}/{len(product_urls)} products already scraped, {len(pending)} to go")
+            if on_product:
+                for url in finished:
+                    on_product(self.done[url])
+
+        def handle(product_data):
+            self.record_done(product_data['retailer_url'], product_data)
+            if on_product:
+                on_product(product_data)
+
+        if pending:
+            run(pending, handle)
+        for url in pending:
+            if url not in self.done:
+                self.record_failed(url, "no product data")
+        return [self.done[url] for url in product_urls if url in self.done]
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def discover_with_journal(journal, listing_url, discover):
+    """discover() the product URLs for a listing page unless the journal already has them"""
+    if journal is not None:
+        product_urls = journal.listing(listing_url)
+        if product_urls is not None:
+            print(f"Resuming with {len(product_urls)} product URLs for {listing_url} from {journal.path}")
+            return product_urls
+    product_urls = discover()
+    if journal is not None and product_urls:
+        journal.record_listing(listing_url, product_urls)
+    return product_urls
+
+
+def journal_run(journal, run):
+    """run(urls, on_product) as it is, or checkpointed through the journal when there is one"""
+    if journal is None:
+        return run
+    return lambda product_urls, on_product: journal.crawl(product_urls, run, on_product)
@@ -1,47 +1,135 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
 import pandas as pd
 import time
 import re
 import json
-from urllib.parse import urljoin
+import argparse
+import shutil
+import tempfile
+from driver_pool import crawl_products
+from listing_api import discover_product_urls
+from http_client import make_session, absolute_url, BASE_URL
+from page_ready import load_product_page, PageTimings
+from rate_limiter import AdaptiveRateLimiter
+from http_cache import ResponseCache
+from fixtures import FixtureStore
+from output_sink import open_sink, MultiSink
+from catalog_store import CatalogStore
+from crawl_journal import CrawlJournal, journal_path
+from incremental import IncrementalState, state_path
+from sitemap import SitemapIndex
+from arrow_export import export_dataset
+from html_parser import make_soup, set_region_parsing
+from page_context import PageContext
+from patterns import register
+from keyword_matcher import KeywordMatcher
+from vocabularies import NON_PRODUCT_TERMS, ACCESSORY_TERMS, NON_COLOR_WORDS, COLOR_WORDS, VARIANT_LINK_COLORS, SIMPLE_COLORS
+from structured_data import FieldSources
+from browser_profile import apply_lean_options, enable_request_blocking
+
+# "Unfolded" followed by 3 numbers, highest priority first
+UNFOLDED_PATTERNS = register('double_stroller.unfolded', [
+    # Original pattern with L x W x H
+    r'unfolded[:\s]*(\d+(?:\.\d+)?)[″"\']*\s*[lL]\s*[xX×]\s*(\d+(?:\.\d+)?)[″"\']*\s*[wW]\s*[xX×]\s*(\d+(?:\.\d+)?)[″"\']*\s*[hH]',
+    # Pattern with just 3 numbers after "unfolded"
+    r'unfolded[:\s]*(\d+(?:\.\d+)?)[″"\']*\s*[xX×]\s*(\d+(?:\.\d+)?)[″"\']*\s*[xX×]\s*(\d+(?:\.\d+)?)[″"\']*',
+    # Pattern with commas or other separators
+    r'unfolded[:\s]*(\d+(?:\.\d+)?)[″"\']*\s*[,]\s*(\d+(?:\.\d+)?)[″"\']*\s*[,]\s*(\d+(?:\.\d+)?)[″"\']*',
+    # Pattern with "inches" or other units
+    r'unfolded[:\s]*(\d+(?:\.\d+)?)\s*(?:inches?|in|″|")\s*[xX×,]\s*(\d+(?:\.\d+)?)\s*(?:inches?|in|″|")\s*[xX×,]\s*(\d+(?:\.\d+)?)\s*(?:inches?|in|″|")?'
+], re.IGNORECASE)
+
+# Keyword vocabularies, each built into one matcher at import time
+LISTING_TERMS = KeywordMatcher(['stroller', 'double', 'twin', 'tandem', 'side-by-side'])
+EXCLUDED_TERMS = NON_PRODUCT_TERMS + ['car-seat', 'safety']
+EXCLUDED_LINK_TERMS = KeywordMatcher(EXCLUDED_TERMS + ACCESSORY_TERMS)
+EXCLUDED_URL_TERMS = KeywordMatcher(EXCLUDED_TERMS)
+
+BRANDS = KeywordMatcher([
+    'UPPAbaby', 'Bugaboo', 'Baby Jogger', 'BOB', 'Chicco', 'Graco', 'Britax', 'Nuna', 'Maxi-Cosi',
+    'Cybex', 'Stokke', 'Doona'
+], word_boundary=True)
 
 class BabylistDoubleStrollerScraper:
-    def __init__(self, chrome_path):
+    def __init__(self, chrome_path, lean_browser=True, driver=None, base_url=BASE_URL, recorder=None,
+                 journal=None, incremental=None, sitemap=None, cache=None):
         self.chrome_path = chrome_path
-        self.driver = None
-        self.setup_driver()
+        # Site root; point at a fixtures.FixtureServer for offline runs
+        self.base_url = base_url
+        # Optional fixtures.FixtureStore that captures every page we load
+        self.recorder = recorder
+        # Optional crawl_journal.CrawlJournal for checkpointing and --resume
+        self.journal = journal
+        # Optional incremental.IncrementalState; only changed products are refetched
+        self.incremental = incremental
+        # Optional sitemap.SitemapIndex; discovers product URLs from the category's sitemaps
+        self.sitemap = sitemap
+        # Sitemap URLs are filtered like listing links
+        self.excluded_url_terms = EXCLUDED_URL_TERMS
+        # Headless, no images/fonts/trackers, eager page loads
+        self.lean_browser = lean_browser
+        self.page_timeout = 15
+        self.page_timings = PageTimings()
+        # Which tier (JSON-LD, DOM, nothing) filled each field
+        self.field_sources = FieldSources()
+        # Shared by every browser in a pool; slow page loads count as pushback
+        self.rate_limiter = AdaptiveRateLimiter(rate=0.5, slow_after=self.page_timeout / 2)
+        self.session = make_session()
+        # Optional http_cache.ResponseCache for the static fetches of --hybrid runs
+        self.cache = cache
+        # Reuse a caller's browser instead of launching one; otherwise browser()
+        # starts one only when listing scrolls or serial product pages need it,
+        # so a --pool-size run never has an idle extra Chrome
+        self.driver = driver
+        # Throwaway profile of the browser setup_driver() started, removed by close()
+        self.profile_dir = None
         
     def setup_driver(self):
-        """Initialize Chrome driver with options"""
+        """Start the scraper's own Chrome session on a throwaway profile"""
+        self.profile_dir = tempfile.mkdtemp(prefix='babylist_chrome_')
+        self.driver = self.create_driver(self.profile_dir)
+    
+    def browser(self):
+        """The scraper's Chrome session, started on first use"""
+        if self.driver is None:
+            self.setup_driver()
+        return self.driver
+    
+    def create_driver(self, profile_dir=None):
+        """Create a Chrome session, optionally bound to its own profile directory"""
         options = Options()
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
         options.add_argument("--disable-blink-features=AutomationControlled")
         options.add_argument("--disable-extensions")
         options.add_argument("--disable-gpu")
+        if profile_dir:
+            options.add_argument(f"--user-data-dir={profile_dir}")
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
+        if self.lean_browser:
+            apply_lean_options(options)
         
         service = Service(self.chrome_path)
-        self.driver = webdriver.Chrome(service=service, options=options)
-        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        driver = webdriver.Chrome(service=service, options=options)
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        if self.lean_browser:
+            enable_request_blocking(driver)
+        return driver
     
     def scroll_and_load_all(self, max_scrolls=25):
         """Scroll to load all products"""
         print("Loading all products...")
-        last_height = self.driver.execute_script("return document.body.scrollHeight")
+        driver = self.browser()
+        last_height = driver.execute_script("return document.body.scrollHeight")
         
         for i in range(max_scrolls):
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             time.sleep(3)
             
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
+            new_height = driver.execute_script("return document.body.scrollHeight")
             if new_height == last_height:
                 print(f"No more content to load after {i+1} scrolls")
                 break
@@ -50,7 +138,7 @@ class BabylistDoubleStrollerScraper:
     
     def extract_product_list(self):
         """Extract product URLs from listing page"""
-        soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+        soup = make_soup(self.browser().page_source)
         
         # More specific selectors for actual product links, avoiding navigation/category links
         selectors = [
@@ -69,7 +157,7 @@ class BabylistDoubleStrollerScraper:
             for link in links:
                 href = link.get('href')
                 if href and '/gp/' in href:  # Only /gp/ links are actual products
-                    full_url = urljoin("https://www.babylist.com", href)
+                    full_url = absolute_url(href, self.base_url)
                     product_links.add(full_url)
         
         # If we don't find many products with specific selectors, try broader approach
@@ -88,14 +176,10 @@ class BabylistDoubleStrollerScraper:
                     combined_text = link_text + " " + parent_text
                     
                     # Only include if it seems to be a stroller product
-                    if any(term in combined_text for term in ['stroller', 'double', 'twin', 'tandem', 'side-by-side']):
-                        full_url = urljoin("https://www.babylist.com", href)
+                    if LISTING_TERMS.contains_any(combined_text):
+                        full_url = absolute_url(href, self.base_url)
                         # Exclude obvious non-stroller categories
-                        if not any(exclude in href.lower() for exclude in [
-                            'bottle', 'cleaning', 'nursing', 'swaddle', 'bassinet', 
-                            'car-seat', 'changing', 'bedding', 'blanket', 'safety',
-                            'insert', 'liner', 'accessory'
-                        ]):
+                        if not EXCLUDED_LINK_TERMS.contains_any(href):
                             product_links.add(full_url)
         
         # Final filter: only keep URLs that actually look like stroller products
@@ -105,18 +189,16 @@ class BabylistDoubleStrollerScraper:
             if '/store/' in url and not '/gp/' in url:
                 continue
             # Skip URLs with obvious non-stroller terms
-            if any(term in url.lower() for term in [
-                'bottle', 'cleaning', 'nursing', 'swaddle', 'bassinet', 
-                'car-seat', 'changing', 'bedding', 'blanket', 'safety'
-            ]):
+            if EXCLUDED_URL_TERMS.contains_any(url):
                 continue
             filtered_links.append(url)
         
         print(f"Found {len(filtered_links)} unique product URLs after filtering")
         return filtered_links
     
-    def extract_description(self, soup):
+    def extract_description(self, page):
         """Extract product description"""
+        soup = page.soup
         selectors = [
             '[data-testid*="description"]',
             '.product-description',
@@ -132,15 +214,10 @@ class BabylistDoubleStrollerScraper:
                     return re.sub(r'\s+', ' ', text)
         
         # Try JSON-LD
-        try:
-            for script in soup.select('script[type="application/ld+json"]'):
-                if script.string:
-                    data = json.loads(script.string)
-                    desc = self._get_json_field(data, ['description', 'productDescription'])
-                    if desc and len(desc) > 50:
-                        return desc
-        except:
-            pass
+        for data in page.json_ld:
+            desc = self._get_json_field(data, ['description', 'productDescription'])
+            if desc and len(desc) > 50:
+                return desc
         
         return "N/A"
     
@@ -161,8 +238,9 @@ class BabylistDoubleStrollerScraper:
                     return result
         return None
     
-    def extract_colors(self, soup, product_name):
+    def extract_colors(self, page, product_name):
         """Enhanced color extraction with better detection"""
+        soup = page.soup
         colors = set()
         
         # 1. Color variant buttons/options
@@ -225,7 +303,7 @@ class BabylistDoubleStrollerScraper:
                 # If it's a similar product name but different color
                 if product_name and len(link_text) > 10:
                     # Extract potential color from link text
-                    if any(color_word in link_text.lower() for color_word in ['black', 'white', 'gray', 'blue', 'red', 'green', 'brown']):
+                    if VARIANT_LINK_COLORS.contains_any(link_text):
                         color_match = re.search(r' - ([A-Za-z\s/&-]+)$', link_text)
                         if color_match and self._is_color(color_match.group(1).strip()):
                             colors.add(color_match.group(1).strip())
@@ -240,20 +318,11 @@ class BabylistDoubleStrollerScraper:
         text_lower = text.lower().strip()
         
         # Skip non-colors
-        skip_words = ['select', 'choose', 'add', 'cart', 'buy', 'quantity', 'shipping', 'size']
-        if any(skip in text_lower for skip in skip_words):
+        if NON_COLOR_WORDS.contains_any(text_lower):
             return False
         
-        # Color indicators
-        color_words = [
-            'black', 'white', 'gray', 'grey', 'blue', 'red', 'green', 'brown', 'pink', 'purple', 'yellow',
-            'navy', 'teal', 'sage', 'olive', 'burgundy', 'plum', 'coral', 'cream', 'ivory', 'charcoal',
-            'slate', 'midnight', 'forest', 'ocean', 'rose', 'gold', 'silver', 'bronze', 'copper',
-            'beige', 'taupe', 'almond', 'frame', 'seat', 'canopy'
-        ]
-        
         # Check if contains color words
-        if any(color in text_lower for color in color_words):
+        if COLOR_WORDS.contains_any(text_lower):
             return True
         
         # Check format like "Color/Color"
@@ -271,171 +340,154 @@ class BabylistDoubleStrollerScraper:
         if not color_name or color_name == "N/A":
             return "Other"
         
-        color_lower = color_name.lower()
-        
-        color_map = {
-            'Black': ['black', 'midnight', 'onyx', 'charcoal'],
-            'White': ['white', 'ivory', 'cream', 'pearl'],
-            'Gray': ['gray', 'grey', 'silver', 'slate', 'stone'],
-            'Blue': ['blue', 'navy', 'teal', 'aqua', 'ocean'],
-            'Red': ['red', 'burgundy', 'wine', 'crimson'],
-            'Green': ['green', 'olive', 'forest', 'sage'],
-            'Brown': ['brown', 'tan', 'beige', 'khaki', 'taupe', 'bronze'],
-            'Pink': ['pink', 'rose', 'blush', 'coral'],
-            'Purple': ['purple', 'lavender', 'plum'],
-            'Yellow': ['yellow', 'gold']
-        }
-        
-        for category, variations in color_map.items():
-            if any(var in color_lower for var in variations):
-                return category
-        
-        return "Other"
+        return SIMPLE_COLORS.first(color_name) or "Other"
     
-    def extract_dimensions(self, soup):
+    def extract_dimensions(self, page):
         """Extract unfolded dimensions from details section"""
+        soup = page.soup
         # Look for "Details" section specifically
         details_sections = soup.select('h3, h4, h2, strong, b')
         
         for section in details_sections:
-            if 'detail' in section.get_text().lower():
+            if 'detail' in page.element_text_lower(section):
                 # Found details section, look for unfolded dimensions in following content
                 parent = section.parent or section
                 
                 # Get all text after the details header
-                full_text = parent.get_text()
+                full_text = page.element_text(parent)
                 
                 # Look for "unfolded" followed by 3 numbers (more flexible pattern)
-                unfolded_patterns = [
-                    # Original pattern with L x W x H
-                    r'unfolded[:\s]*(\d+(?:\.\d+)?)[″"\']*\s*[lL]\s*[xX×]\s*(\d+(?:\.\d+)?)[″"\']*\s*[wW]\s*[xX×]\s*(\d+(?:\.\d+)?)[″"\']*\s*[hH]',
-                    # Pattern with just 3 numbers after "unfolded"
-                    r'unfolded[:\s]*(\d+(?:\.\d+)?)[″"\']*\s*[xX×]\s*(\d+(?:\.\d+)?)[″"\']*\s*[xX×]\s*(\d+(?:\.\d+)?)[″"\']*',
-                    # Pattern with commas or other separators
-                    r'unfolded[:\s]*(\d+(?:\.\d+)?)[″"\']*\s*[,]\s*(\d+(?:\.\d+)?)[″"\']*\s*[,]\s*(\d+(?:\.\d+)?)[″"\']*',
-                    # Pattern with "inches" or other units
-                    r'unfolded[:\s]*(\d+(?:\.\d+)?)\s*(?:inches?|in|″|")\s*[xX×,]\s*(\d+(?:\.\d+)?)\s*(?:inches?|in|″|")\s*[xX×,]\s*(\d+(?:\.\d+)?)\s*(?:inches?|in|″|")?'
-                ]
-                
-                for pattern in unfolded_patterns:
-                    match = re.search(pattern, full_text, re.IGNORECASE)
-                    if match:
-                        return f'{match.group(1)}" x {match.group(2)}" x {match.group(3)}"'
+                match = UNFOLDED_PATTERNS.search(full_text)
+                if match:
+                    return f'{match.group(1)}" x {match.group(2)}" x {match.group(3)}"'
         
         # Fallback: look anywhere in the page for unfolded dimensions
-        page_text = soup.get_text()
+        page_text = page.text
         
         # Try all patterns on the full page text
-        unfolded_patterns = [
-            r'unfolded[:\s]*(\d+(?:\.\d+)?)[″"\']*\s*[lL]\s*[xX×]\s*(\d+(?:\.\d+)?)[″"\']*\s*[wW]\s*[xX×]\s*(\d+(?:\.\d+)?)[″"\']*\s*[hH]',
-            r'unfolded[:\s]*(\d+(?:\.\d+)?)[″"\']*\s*[xX×]\s*(\d+(?:\.\d+)?)[″"\']*\s*[xX×]\s*(\d+(?:\.\d+)?)[″"\']*',
-            r'unfolded[:\s]*(\d+(?:\.\d+)?)[″"\']*\s*[,]\s*(\d+(?:\.\d+)?)[″"\']*\s*[,]\s*(\d+(?:\.\d+)?)[″"\']*',
-            r'unfolded[:\s]*(\d+(?:\.\d+)?)\s*(?:inches?|in|″|")\s*[xX×,]\s*(\d+(?:\.\d+)?)\s*(?:inches?|in|″|")\s*[xX×,]\s*(\d+(?:\.\d+)?)\s*(?:inches?|in|″|")?'
-        ]
-        
-        for pattern in unfolded_patterns:
-            match = re.search(pattern, page_text, re.IGNORECASE)
-            if match:
-                return f'{match.group(1)}" x {match.group(2)}" x {match.group(3)}"'
+        match = UNFOLDED_PATTERNS.search(page_text)
+        if match:
+            return f'{match.group(1)}" x {match.group(2)}" x {match.group(3)}"'
         
         return "N/A"
     
-    def extract_product_details(self, url):
+    def extract_product_details(self, url, driver=None):
         """Extract detailed info from product page"""
         try:
+            driver = driver or self.browser()
             print(f"Scraping: {url}")
-            self.driver.get(url)
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            time.sleep(3)
+            # Paced by the rate limiter, then wait for the product's own elements
+            ready = load_product_page(driver, url, self.page_timeout, self.page_timings, self.rate_limiter)
+            if not ready:
+                print(f"  Page not ready after {self.page_timeout}s, parsing what loaded")
             
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            html = driver.page_source
+            if self.recorder:
+                self.recorder.record(url, html)
+            return self.parse_product_page(url, html)
             
-            # Basic product info
-            product_data = {
-                "name": "N/A",
-                "brand": "N/A",
-                "description": "N/A",
-                "category": "Double Stroller",  # Changed from "Single Stroller"
-                "price": "N/A",
-                "retailer": "Babylist",
-                "retailer_url": url,
-                "color_options": [],
-                "simplified_colors": [],
-                "dimensions": "N/A",
-                "weight": "N/A",
-                "rating": "N/A",
-                "image_url": "N/A"
-            }
-            
-            # Product name
+        except Exception as e:
+            print(f"Error scraping {url}: {e}")
+            return None
+    
+    def parse_product_page(self, url, html, scoped=None, field_sources=None):
+        """Extract product fields from a rendered or static product page
+
+        Field sources are tallied into field_sources (default: the scraper's).
+        """
+        page = PageContext(html, scoped=scoped)
+        soup = page.soup
+        
+        # Basic product info
+        product_data = {
+            "name": "N/A",
+            "brand": "N/A",
+            "description": "N/A",
+            "category": "Double Stroller",  # Changed from "Single Stroller"
+            "price": "N/A",
+            "retailer": "Babylist",
+            "retailer_url": url,
+            "color_options": [],
+            "variants": [],
+            "simplified_colors": [],
+            "dimensions": "N/A",
+            "weight": "N/A",
+            "rating": "N/A",
+            "image_url": "N/A"
+        }
+        
+        # Structured data first; the DOM heuristics below only fill what it leaves empty
+        structured, sources = page.structured
+        product_data.update({key: value for key, value in structured.items() if key in product_data})
+        
+        # Product name
+        if "name" not in structured:
             title_tag = soup.select_one('title')
             if title_tag:
                 title = re.sub(r'\s*\|\s*Babylist.*$', '', title_tag.get_text().strip())
                 product_data["name"] = title
-            
+        
             if product_data["name"] == "N/A":
                 h1_tag = soup.select_one('h1')
                 if h1_tag:
                     product_data["name"] = h1_tag.get_text().strip()
-            
-            # Brand (from name or dedicated element)
-            brands = ['UPPAbaby', 'Bugaboo', 'Baby Jogger', 'BOB', 'Chicco', 'Graco', 
-                     'Britax', 'Nuna', 'Maxi-Cosi', 'Cybex', 'Stokke', 'Doona']
-            
+        
+        # Brand (from name or dedicated element)
+        if "brand" not in structured:
             brand_elem = soup.select_one('[data-testid*="brand"], .brand, [class*="brand"]')
             if brand_elem:
                 product_data["brand"] = brand_elem.get_text().strip()
             elif product_data["name"] != "N/A":
-                for brand in brands:
-                    if brand.lower() in product_data["name"].lower():
-                        product_data["brand"] = brand
-                        break
-            
-            # Description
-            product_data["description"] = self.extract_description(soup)
-            
-            # Colors
-            colors = self.extract_colors(soup, product_data["name"])
-            product_data["color_options"] = colors
-            
-            if colors != ["N/A"]:
-                simplified = list(set([self.simplify_color(color) for color in colors]))
-                product_data["simplified_colors"] = simplified
-            else:
-                product_data["simplified_colors"] = ["N/A"]
-            
-            # Dimensions (targeting unfolded)
-            product_data["dimensions"] = self.extract_dimensions(soup)
-            
-            # Weight
-            page_text = soup.get_text().lower()
-            weight_match = re.search(r'(?:frame\s*\+\s*seat|weight)[:\s]*(\d+(?:\.\d+)?)\s*lbs?', page_text)
-            if weight_match:
-                product_data["weight"] = f"{weight_match.group(1)} lbs"
-            
-            # Price
+                brand = BRANDS.first(product_data["name"])
+                if brand:
+                    product_data["brand"] = brand
+        
+        # Description
+        if "description" not in structured:
+            product_data["description"] = self.extract_description(page)
+        
+        # Colors
+        colors = structured.get("color_options") or self.extract_colors(page, product_data["name"])
+        product_data["color_options"] = colors
+        
+        if colors != ["N/A"]:
+            simplified = list(set([self.simplify_color(color) for color in colors]))
+            product_data["simplified_colors"] = simplified
+        else:
+            product_data["simplified_colors"] = ["N/A"]
+        
+        # Dimensions (targeting unfolded)
+        product_data["dimensions"] = self.extract_dimensions(page)
+        
+        # Weight
+        page_text = page.text_lower
+        weight_match = re.search(r'(?:frame\s*\+\s*seat|weight)[:\s]*(\d+(?:\.\d+)?)\s*lbs?', page_text)
+        if weight_match:
+            product_data["weight"] = f"{weight_match.group(1)} lbs"
+        
+        # Price
+        if "price" not in structured:
             price_elem = soup.select_one('[data-testid*="price"], .price, [class*="price"]')
             if price_elem:
                 price_match = re.search(r'\$(\d+(?:,\d{3})*(?:\.\d{2})?)', price_elem.get_text())
                 if price_match:
                     product_data["price"] = f"${price_match.group(1)}"
-            
-            # Image - Enhanced with more selectors
-            img_selectors = [
-                'img[data-testid*="product"]',
-                '.product-image img',
-                'img[alt*="stroller"]',
-                'img[alt*="Stroller"]',
-                'main img',
-                '[data-testid*="image"] img',
-                '.product-hero img',
-                '.product-gallery img',
-                'img[src*="product"]',
-                'img[class*="product"]'
-            ]
-            
+        
+        # Image - Enhanced with more selectors
+        img_selectors = [
+            'img[data-testid*="product"]',
+            '.product-image img',
+            'img[alt*="stroller"]',
+            'img[alt*="Stroller"]',
+            'main img',
+            '[data-testid*="image"] img',
+            '.product-hero img',
+            '.product-gallery img',
+            'img[src*="product"]',
+            'img[class*="product"]'
+        ]
+        
+        if "image_url" not in structured:
             product_data["image_url"] = "N/A"
             for selector in img_selectors:
                 img = soup.select_one(selector)
@@ -447,7 +499,7 @@ class BabylistDoubleStrollerScraper:
                             src = 'https:' + src
                         product_data["image_url"] = src
                         break
-            
+        
             # If still no image found, try getting the first meaningful image
             if product_data["image_url"] == "N/A":
                 all_imgs = soup.select('img[src]')
@@ -459,35 +511,37 @@ class BabylistDoubleStrollerScraper:
                         not any(skip in src.lower() for skip in ['icon', 'logo', 'sprite', 'button']) and
                         not any(skip in alt for skip in ['icon', 'logo', 'button', 'arrow']) and
                         (src.startswith('http') or src.startswith('//'))):
-                        
+                    
                         if src.startswith('//'):
                             src = 'https:' + src
                         product_data["image_url"] = src
                         break
-            
-            # Rating
+        
+        # Rating
+        if "rating" not in structured:
             rating_elem = soup.select_one('[data-testid*="rating"], [class*="rating"]')
             if rating_elem:
                 rating_match = re.search(r'(\d+(?:\.\d+)?)', rating_elem.get_text())
                 if rating_match:
                     product_data["rating"] = rating_match.group(1)
-            
-            return product_data
-            
-        except Exception as e:
-            print(f"Error scraping {url}: {e}")
-            return None
+        
+        # The region-only parse missed a key field; redo the page from the full tree
+        if page.needs_full_parse(product_data):
+            return self.parse_product_page(url, html, scoped=False, field_sources=field_sources)
+        
+        (field_sources or self.field_sources).record_row(product_data, sources)
+        return product_data
     
-    def scrape_all_double_strollers(self):
+    def _report_product(self, product_data):
+        """Print the fields we most often need to eyeball during a run"""
+        print(f"Colors found: {product_data['color_options']}")
+    
+    def scrape_all_double_strollers(self, pool_size=1, hybrid=False, on_product=None):
         """Main scraping method for double strollers"""
         try:
-            url = "https://www.babylist.com/store/double-strollers"  # Updated URL
-            print(f"Loading: {url}")
-            self.driver.get(url)
-            time.sleep(3)
-            
-            self.scroll_and_load_all()
-            product_urls = self.extract_product_list()
+            url = f"{self.base_url}/store/double-strollers"  # Updated URL
+            # Listing data when the site exposes it, otherwise scroll the page
+            product_urls = discover_product_urls(self, url)
             
             if not product_urls:
                 print("No products found!")
@@ -496,17 +550,13 @@ class BabylistDoubleStrollerScraper:
             # Since you mentioned there are 23 strollers, let's verify the count
             print(f"Expected 23 double strollers, found {len(product_urls)} product URLs")
             
-            products = []
-            for i, url in enumerate(product_urls, 1):
-                print(f"\nProduct {i}/{len(product_urls)}")
-                product_data = self.extract_product_details(url)
-                if product_data:
-                    products.append(product_data)
-                    print(f"Colors found: {product_data['color_options']}")
-                
-                time.sleep(2)  # Be respectful
+            def handle(product_data):
+                self._report_product(product_data)
+                if on_product:
+                    on_product(product_data)
             
-            return products
+            return crawl_products(self, product_urls, pool_size=pool_size,
+                                  on_product=handle, hybrid=hybrid)
             
         except Exception as e:
             print(f"Scraping error: {e}")
@@ -525,22 +575,90 @@ class BabylistDoubleStrollerScraper:
             if col in df.columns:
                 df[col] = df[col].apply(lambda x: ', '.join(x) if isinstance(x, list) else x)
         
+        # Variants keep their per-color price and SKU as a JSON array
+        if 'variants' in df.columns:
+            df['variants'] = df['variants'].apply(lambda x: json.dumps(x) if isinstance(x, list) else x)
+        
         df.to_csv(filename, index=False)
         print(f"\nSaved {len(products)} products to {filename}")
     
     def close(self):
-        """Close driver"""
+        """Quit the browser and remove the profile setup_driver() made for it"""
         if self.driver:
             self.driver.quit()
+            self.driver = None
+        if self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = None
 
 # Usage
 if __name__ == "__main__":
     chrome_path = "/Users/makaylacheng/Downloads/chromedriver-mac-arm64/chromedriver"
     
-    scraper = BabylistDoubleStrollerScraper(chrome_path)
+    parser = argparse.ArgumentParser(description="Scrape Babylist double strollers")
+    parser.add_argument("--pool-size", type=int, default=1,
+                        help="Number of parallel browser sessions for product pages")
+    parser.add_argument("--full-browser", action="store_true",
+                        help="Headed Chrome loading every resource (for comparing against the lean profile)")
+    parser.add_argument("--hybrid", action="store_true",
+                        help="Parse static HTML first and use the browser only when price or colors are missing")
+    parser.add_argument("--region-parse", action="store_true",
+                        help="Parse product pages from <head> plus the product region only "
+                             "(falls back to the full page when name or price is missing)")
+    parser.add_argument("--cache-dir", default=".http_cache",
+                        help="Directory for the on-disk response cache used by --hybrid static fetches")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always download --hybrid static pages from the network")
+    parser.add_argument("--base-url", default=BASE_URL,
+                        help="Site root, e.g. a local fixtures.py server for offline runs")
+    parser.add_argument("--record", metavar="DIR",
+                        help="Save every listing and product page to this fixture directory")
+    parser.add_argument("--output", default="babylist_double_strollers.csv",
+                        help="Written row by row as products are scraped (.csv, .jsonl or .parquet)")
+    parser.add_argument("--export", metavar="DIR",
+                        help="Also write a Parquet dataset partitioned by category and run date")
+    parser.add_argument("--catalog", metavar="DB",
+                        help="Also upsert every product into this SQLite catalog")
+    parser.add_argument("--journal", metavar="PATH",
+                        help="Checkpoint journal (default: next to --output, e.g. products.journal.jsonl)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue from the journal: skip discovery and products already scraped")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Refetch only products that are new or whose listing tile or lastmod changed")
+    parser.add_argument("--state", metavar="PATH",
+                        help="Incremental state file (default: next to --output, e.g. products.state.json)")
+    parser.add_argument("--max-age", type=float, default=7, metavar="DAYS",
+                        help="With --incremental, refetch any product last fetched longer ago than this")
+    parser.add_argument("--sitemap", action="store_true",
+                        help="Discover product URLs from category sitemaps (else the listing page) and lastmods from all sitemaps")
+    args = parser.parse_args()
+    if args.region_parse:
+        set_region_parsing(True)
+    
+    cache = None if args.no_cache else ResponseCache(args.cache_dir)
+    recorder = FixtureStore(args.record) if args.record else None
+    sitemap = SitemapIndex(args.base_url, recorder=recorder) if args.sitemap else None
+    journal = CrawlJournal(args.journal or journal_path(args.output), resume=args.resume)
+    incremental = None
+    if args.incremental:
+        incremental = IncrementalState(args.state or state_path(args.output), max_age_days=args.max_age)
+    
+    scraper = BabylistDoubleStrollerScraper(chrome_path, lean_browser=not args.full_browser,
+                                            base_url=args.base_url, recorder=recorder, journal=journal,
+                                            incremental=incremental, sitemap=sitemap, cache=cache)
     try:
-        products = scraper.scrape_all_double_strollers()
-        scraper.save_to_csv(products)
+        sinks = [open_sink(args.output)]
+        if args.catalog:
+            sinks.append(CatalogStore(args.catalog, field_sources=scraper.field_sources))
+        with MultiSink(sinks) as sink:
+            products = scraper.scrape_all_double_strollers(pool_size=args.pool_size, hybrid=args.hybrid,
+                                                           on_product=sink.write)
+        sink.report()
+        if cache:
+            cache.save()
+            cache.report()
+        if args.export:
+            export_dataset(products, args.export)
         print(f"\nComplete! Found {len(products)} double strollers.")
         if len(products) != 23:
             print(f"Note: Expected 23 products but found {len(products)}. This could be due to:")
@@ -548,4 +666,7 @@ if __name__ == "__main__":
             print("- Different product filtering or page structure")
             print("- Some products not being detected by the scraper")
     finally:
-        scraper.close()
\ No newline at end of file
+        scraper.close()
+        journal.close()
+        if recorder:
+            recorder.save()
\ No newline at end of file
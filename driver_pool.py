@@ -0,0 +1,158 @@
+import queue
+import shutil
+import tempfile
+import threading
+
+from crawl_journal import journal_run
+from incremental import crawl_with_incremental
+from hybrid_fetch import static_pass
+
+
+class DriverPool:
+    """Pool of Chrome sessions that pull product URLs from a shared queue"""
+
+    def __init__(self, create_driver, size=2):
+        # create_driver takes a profile directory and returns a new webdriver
+        self.create_driver = create_driver
+        self.size = max(1, size)
+        self.drivers = []
+        self.profile_dirs = []
+
+    def start(self):
+        """Launch every session with its own throwaway Chrome profile"""
+        for i in range(self.size):
+            profile_dir = tempfile.mkdtemp(prefix=f"babylist_chrome_{i}_")
+            self.profile_dirs.append(profile_dir)
+            try:
+                self.drivers.append(self.create_driver(profile_dir))
+            except Exception as e:
+                print(f"Failed to start browser {i + 1}/{self.size}: {e}")
+
+        if not self.drivers:
+            raise RuntimeError("Could not start any browser sessions")
+        print(f"Started {len(self.drivers)} browser sessions")
+        return self
+
+    def run(self, urls, work, on_product=None):
+        """Run work(driver, url) for every URL and return rows in input order"""
+        tasks = queue.Queue()
+        for index, url in enumerate(urls):
+            tasks.put((index, url))
+
+        results = [None] * len(urls)
+        print_lock = threading.Lock()
+
+        def worker(worker_id, driver):
+            while True:
+                try:
+                    index, url = tasks.get_nowait()
+                except queue.Empty:
+                    return
+
+                with print_lock:
+                    print(f"\n[browser {worker_id}] Product {index + 1}/{len(urls)}")
+                try:
+                    results[index] = work(driver, url)
+                except Exception as e:
+                    print(f"[browser {worker_id}] Error scraping {url}: {e}")
+
+                if results[index] and on_product:
+                    with print_lock:
+                        on_product(results[index])
+
+        threads = [
+            threading.Thread(target=worker, args=(i + 1, driver), daemon=True)
+            for i, driver in enumerate(self.drivers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return [row for row in results if row]
+
+    def close(self):
+        """Quit every session and remove the temporary profiles"""
+        for driver in self.drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        for profile_dir in self.profile_dirs:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+        self.drivers = []
+        self.profile_dirs = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _browser_crawl(scraper, product_urls, pool_size, on_product):
+    """Load product pages in Selenium, serially or across a DriverPool"""
+    if pool_size > 1 and len(product_urls) > 1:
+        with DriverPool(scraper.create_driver, min(pool_size, len(product_urls))) as pool:
+            return pool.run(
+                product_urls,
+                lambda driver, url: scraper.extract_product_details(url, driver=driver),
+                on_product=on_product,
+            )
+
+    products = []
+    for i, url in enumerate(product_urls, 1):
+        print(f"\nScraping product {i}/{len(product_urls)}")
+        product_data = scraper.extract_product_details(url)
+        if product_data:
+            products.append(product_data)
+            if on_product:
+                on_product(product_data)
+    return products
+
+
+def crawl_products(scraper, product_urls, pool_size=1, on_product=None, hybrid=False):
+    """Scrape product pages serially on scraper.browser() or across a DriverPool
+
+    Pacing comes from scraper.rate_limiter, which every browser shares. In
+    hybrid mode every page is first parsed from static HTML and only pages
+    missing required fields are loaded in a browser. With a scraper.journal,
+    products it already has are not fetched again; with scraper.incremental,
+    only products that may have changed since the last run are.
+    """
+    return crawl_with_incremental(
+        scraper.incremental, product_urls,
+        journal_run(scraper.journal, lambda urls, handle: _crawl_products(scraper, urls, pool_size, handle, hybrid)),
+        on_product,
+    )
+
+
+def _crawl_products(scraper, product_urls, pool_size, on_product, hybrid):
+    if not hybrid:
+        products = _browser_crawl(scraper, product_urls, pool_size, on_product)
+        scraper.page_timings.report()
+        scraper.rate_limiter.report()
+        scraper.field_sources.report()
+        return products
+
+    static_rows, browser_urls = static_pass(scraper, product_urls)
+    if on_product:
+        for product_data in static_rows.values():
+            on_product(product_data)
+
+    browser_rows = {
+        row["retailer_url"]: row
+        for row in _browser_crawl(scraper, browser_urls, pool_size, on_product)
+    }
+
+    products = []
+    for url in product_urls:
+        product_data = static_rows.get(url) or browser_rows.get(url)
+        if product_data:
+            products.append(product_data)
+
+    print(f"\nHybrid mode: {len(browser_urls)}/{len(product_urls)} pages needed the browser")
+    scraper.page_timings.report()
+    scraper.rate_limiter.report()
+    scraper.field_sources.report()
+    return products
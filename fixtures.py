@@ -0,0 +1,230 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+
+def fixture_key(url):
+    """Host-independent key (path + sorted query) so replays work on any base URL"""
+    parts = urlparse(url)
+    path = parts.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return path + ('?' + query if query else '')
+
+
+class FixtureStore:
+    """Directory of recorded pages plus an index.json of key -> file and content type
+
+    Like http_cache.ResponseCache, the index is rewritten every save_every
+    recorded pages or save_seconds, and by save() at the end of a recording
+    run, instead of once per page.
+    """
+
+    def __init__(self, directory, save_every=50, save_seconds=5.0):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+        self.lock = threading.Lock()
+        self.save_every = save_every
+        self.save_seconds = save_seconds
+        self.unsaved = 0
+        self.last_save = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+
+    def record(self, url, body, content_type="text/html; charset=utf-8"):
+        """Save one page (str or bytes) under its fixture key"""
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        key = fixture_key(url)
+        filename = hashlib.sha1(key.encode('utf-8')).hexdigest() + ".fixture"
+        self._write(os.path.join(self.directory, filename), body)
+
+        # Under the lock so concurrent recorders can't interleave or save a stale index
+        with self.lock:
+            self.index[key] = {"file": filename, "content_type": content_type, "url": url}
+            self.unsaved += 1
+            if self.unsaved >= self.save_every or time.monotonic() - self.last_save >= self.save_seconds:
+                self._save()
+
+    def _save(self):
+        # Lock held
+        self._write(self.index_path, json.dumps(self.index, indent=1).encode('utf-8'))
+        self.unsaved = 0
+        self.last_save = time.monotonic()
+
+    def save(self):
+        """Write the index if any page was recorded since the last save"""
+        with self.lock:
+            if self.unsaved:
+                self._save()
+
+    def _write(self, path, data):
+        """Replace path atomically through a temp file of its own in the same directory"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def load(self, key):
+        """(body, content_type) for a fixture key, or None"""
+        entry = self.index.get(key)
+        if not entry:
+            return None
+        with open(os.path.join(self.directory, entry["file"]), "rb") as f:
+            return f.read(), entry["content_type"]
+
+    def urls(self):
+        return [entry["url"] for entry in self.index.values()]
+
+
+class FixtureServer:
+    """Local stand-in for babylist.com that replays a FixtureStore
+
+    latency/jitter delay every response; error_rate returns random 500/503s;
+    every burst_every requests the next burst_length requests get 429 with
+    a Retry-After header, mimicking the site's throttling.
+    """
+
+    def __init__(self, store, host="127.0.0.1", port=8000, latency=0.0, jitter=0.0,
+                 error_rate=0.0, burst_every=0, burst_length=0, retry_after=1, seed=None):
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.burst_every = burst_every
+        self.burst_length = burst_length
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.stats = {"served": 0, "not_modified": 0, "missing": 0, "errors": 0, "throttled": 0}
+
+        handler = self._make_handler()
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _next_fault(self):
+        """Decide whether this request is throttled, fails, or is served normally"""
+        with self.lock:
+            self.request_count += 1
+            count = self.request_count
+            roll = self.random.random()
+            delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+
+        if self.burst_every and self.burst_length:
+            position = count % self.burst_every
+            if 0 < position <= self.burst_length and count > self.burst_length:
+                return 429, delay
+        if roll < self.error_rate:
+            return self.random.choice([500, 503]), delay
+        return None, delay
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                fault, delay = server._next_fault()
+                time.sleep(delay)
+
+                if fault == 429:
+                    server.stats["throttled"] += 1
+                    self.send_response(429)
+                    self.send_header("Retry-After", str(server.retry_after))
+                    self.end_headers()
+                    return
+                if fault:
+                    server.stats["errors"] += 1
+                    self.send_response(fault)
+                    self.end_headers()
+                    return
+
+                fixture = server.store.load(fixture_key(self.path))
+                if fixture is None:
+                    server.stats["missing"] += 1
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+
+                body, content_type = fixture
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    server.stats["not_modified"] += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                server.stats["served"] += 1
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        """Serve on a background thread (for benchmarks and tests)"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+# Usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded Babylist pages from a fixture directory")
+    parser.add_argument("directory", help="Fixture directory written with --record")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Base seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- seconds of random latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered 500/503")
+    parser.add_argument("--burst-every", type=int, default=0, help="Start a 429 burst every N requests")
+    parser.add_argument("--burst-length", type=int, default=0, help="Requests per 429 burst")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    store = FixtureStore(args.directory)
+    server = FixtureServer(store, port=args.port, latency=args.latency, jitter=args.jitter,
+                           error_rate=args.error_rate, burst_every=args.burst_every,
+                           burst_length=args.burst_length, retry_after=args.retry_after, seed=args.seed)
+    print(f"Replaying {len(store.index)} pages from {args.directory} at {server.base_url}")
+    print(f"Run scrapers with --base-url {server.base_url} (or BABYLIST_BASE_URL={server.base_url})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"\nServer stats: {server.stats}")
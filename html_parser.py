@@ -0,0 +1,142 @@
+import os
+import re
+
+from bs4 import BeautifulSoup
+
+# Optional faster backends; html.parser (pure Python) is always available
+try:
+    import lxml  # noqa: F401
+    HAVE_LXML = True
+except ImportError:
+    HAVE_LXML = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    HAVE_SELECTOLAX = True
+except ImportError:
+    HAVE_SELECTOLAX = False
+
+BACKENDS = ['html.parser', 'lxml', 'selectolax']
+
+# BeautifulSoup tree builder used by each backend. selectolax cannot stand in
+# for the soup our CSS-selector extractors walk, so it builds the soup with
+# lxml and takes over the script-only lookups (JSON-LD, embedded state),
+# where its output is byte-for-byte the same.
+TREE_BUILDERS = {
+    'html.parser': 'html.parser',
+    'lxml': 'lxml',
+    'selectolax': 'lxml',
+}
+
+
+def default_backend():
+    """BABYLIST_PARSER if set, otherwise html.parser
+
+    The faster backends are opt-in: lxml repairs broken markup differently,
+    so they stay off by default until benchmarks.py shows identical rows on
+    the pages being scraped.
+    """
+    return os.environ.get('BABYLIST_PARSER') or 'html.parser'
+
+
+_backend = default_backend()
+
+# Region parsing: build the soup from <head> and the product region only
+_region_parsing = os.environ.get('BABYLIST_REGION_PARSE', '') not in ('', '0')
+
+HEAD_RE = re.compile(r'<head\b.*?</head\s*>', re.IGNORECASE | re.DOTALL)
+MAIN_OPEN_RE = re.compile(r'<main\b', re.IGNORECASE)
+MAIN_CLOSE_RE = re.compile(r'</main\s*>', re.IGNORECASE)
+# JSON-LD and hydration scripts often sit at the end of <body>, outside <main>
+DATA_SCRIPT_RE = re.compile(
+    r'<script\b[^>]*(?:application/(?:ld\+)?json|__NEXT_DATA__)[^>]*>.*?</script\s*>',
+    re.IGNORECASE | re.DOTALL
+)
+
+
+def set_backend(name):
+    """Switch the parser backend for every extractor (used by benchmarks)"""
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown parser backend {name!r}; choose from {', '.join(BACKENDS)}")
+    if TREE_BUILDERS[name] == 'lxml' and not HAVE_LXML:
+        raise ValueError(f"Parser backend {name!r} needs lxml installed")
+    if name == 'selectolax' and not HAVE_SELECTOLAX:
+        raise ValueError("Parser backend 'selectolax' needs selectolax installed")
+    _backend = name
+
+
+def get_backend():
+    return _backend
+
+
+def set_region_parsing(enabled):
+    """Parse product pages from <head> plus the product region instead of the whole document"""
+    global _region_parsing
+    _region_parsing = bool(enabled)
+
+
+def get_region_parsing():
+    return _region_parsing
+
+
+def make_soup(markup):
+    """Parse a page into a BeautifulSoup tree with the configured backend"""
+    return BeautifulSoup(markup, TREE_BUILDERS[_backend])
+
+
+def region_markup(markup):
+    """Pre-cut a page to <head>, the <main> product region and its JSON data scripts
+
+    Nav menus, footers and recommendation carousels outside <main> are never
+    tokenized. Returns None when the page has no <main> to cut to.
+    """
+    if isinstance(markup, bytes):
+        markup = markup.decode('utf-8', 'replace')
+    start = MAIN_OPEN_RE.search(markup)
+    if not start:
+        return None
+    end = None
+    for end in MAIN_CLOSE_RE.finditer(markup, start.end()):
+        pass
+    if end is None:
+        return None
+
+    head = HEAD_RE.search(markup, 0, start.start())
+    body_start = head.end() if head else 0
+    scripts = DATA_SCRIPT_RE.findall(markup, body_start, start.start()) + DATA_SCRIPT_RE.findall(markup, end.end())
+    return ''.join([
+        '<html>', head.group(0) if head else '', '<body>',
+        markup[start.start():end.end()], *scripts, '</body></html>',
+    ])
+
+
+def make_region_soup(markup):
+    """Soup of region_markup(markup), or None if the page has no product region"""
+    cut = region_markup(markup)
+    return make_soup(cut) if cut is not None else None
+
+
+def script_tree(markup):
+    """Lexbor tree of a page for several script_texts() calls under the selectolax backend"""
+    return LexborHTMLParser(markup)
+
+
+def script_texts(markup, selector):
+    """Raw text of every <script> matching selector, without building a full soup
+
+    markup may also be an already built soup or script_tree().
+    """
+    if _backend == 'selectolax' and not isinstance(markup, BeautifulSoup):
+        tree = markup if isinstance(markup, LexborHTMLParser) else LexborHTMLParser(markup)
+        # lexbor returns a node once per matching selector in a group; soupsieve doesn't
+        texts = []
+        seen = set()
+        for node in tree.css(selector):
+            if node.mem_id not in seen:
+                seen.add(node.mem_id)
+                texts.append(node.text(deep=True))
+        return texts
+
+    soup = markup if isinstance(markup, BeautifulSoup) else make_soup(markup)
+    return [script.string for script in soup.select(selector) if script.string]
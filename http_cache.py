@@ -0,0 +1,260 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from http_client import canonical_url
+
+# Response headers worth keeping; everything else is noise for parsing
+STORED_HEADERS = ['Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Date']
+
+
+class ResponseCache:
+    """On-disk response cache keyed by canonical URL with TTL and LRU eviction
+
+    Bodies live in one file per URL; index.json holds the headers, fetch time
+    and last access time used for revalidation and eviction. The index is
+    rewritten every save_every changes or save_seconds, and by save() at the
+    end of a run; a crash in between only loses entries whose bodies are
+    then fetched again. Over max_bytes, least recently used entries are
+    evicted down to evict_to of the budget, so eviction sorts the index once
+    per batch of stores rather than on every one.
+    """
+
+    def __init__(self, directory=".http_cache", ttl=24 * 3600, max_bytes=500 * 1024 * 1024,
+                 save_every=50, save_seconds=5.0, evict_to=0.9):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.evict_to = evict_to
+        self.index_path = os.path.join(directory, "index.json")
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "revalidated": 0, "downloads": 0, "evicted": 0}
+        self.save_every = save_every
+        self.save_seconds = save_seconds
+        self.unsaved = 0
+        self.last_save = time.monotonic()
+
+        os.makedirs(directory, exist_ok=True)
+        self.index = {}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path) as f:
+                    self.index = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable cache index {self.index_path}: {e}")
+        # Kept up to date by store/eviction so no store re-sums the index
+        self.total_bytes = sum(entry["size"] for entry in self.index.values())
+
+    def _key(self, url):
+        return hashlib.sha1(canonical_url(url).encode('utf-8')).hexdigest()
+
+    def _body_path(self, key):
+        return os.path.join(self.directory, key + ".body")
+
+    def lookup(self, url):
+        """Cache entry for url (without the body) or None"""
+        with self.lock:
+            entry = self.index.get(self._key(url))
+            if entry and not os.path.exists(self._body_path(entry["key"])):
+                # Body was removed behind our back
+                self._forget(entry)
+                return None
+            return entry
+
+    def _forget(self, entry):
+        """Drop an entry whose body is gone (lock held)"""
+        if self.index.get(entry["key"]) is entry:
+            del self.index[entry["key"]]
+            self.total_bytes -= entry["size"]
+
+    def is_fresh(self, entry):
+        return entry is not None and time.time() - entry["fetched_at"] < self.ttl
+
+    def has_fresh(self, url):
+        """True when url can be served without any network request"""
+        return self.is_fresh(self.lookup(url))
+
+    def conditional_headers(self, entry):
+        """If-None-Match / If-Modified-Since headers for revalidating an entry"""
+        headers = {}
+        if not entry:
+            return headers
+        etag = entry["headers"].get("ETag")
+        last_modified = entry["headers"].get("Last-Modified")
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def to_response(self, entry):
+        """Rebuild a requests.Response from a cache entry, or None if another thread evicted it"""
+        # Under the lock, so eviction can't remove the body between lookup and read
+        with self.lock:
+            try:
+                with open(self._body_path(entry["key"]), "rb") as f:
+                    body = f.read()
+            except FileNotFoundError:
+                self._forget(entry)
+                return None
+            entry["last_access"] = time.time()
+
+        response = requests.Response()
+        response._content = body
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.url = entry["url"]
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or 'utf-8'
+        response.from_cache = True
+        return response
+
+    def hit(self, entry):
+        """Serve a fresh entry without touching the network, or None (a miss) if it was evicted"""
+        response = self.to_response(entry)
+        if response is not None:
+            with self.lock:
+                self.stats["hits"] += 1
+        return response
+
+    def revalidated(self, entry, response):
+        """Server answered 304: keep the body, refresh validators and fetch time
+
+        None if the body was evicted meanwhile; the page must then be fetched in full.
+        """
+        cached = self.to_response(entry)
+        if cached is None:
+            return None
+        with self.lock:
+            for name in ("ETag", "Last-Modified", "Cache-Control", "Date"):
+                if name in response.headers:
+                    entry["headers"][name] = response.headers[name]
+            entry["fetched_at"] = time.time()
+            self.stats["revalidated"] += 1
+            self._changed()
+        return cached
+
+    def store(self, url, response):
+        """Save a full 200 response and evict old entries if over budget"""
+        key = self._key(url)
+        body = response.content
+        # A temp file of its own, so two threads storing the same URL never share one
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=key + ".", suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        os.replace(tmp_path, self._body_path(key))
+
+        now = time.time()
+        with self.lock:
+            previous = self.index.get(key)
+            if previous is not None:
+                self.total_bytes -= previous["size"]
+            self.total_bytes += len(body)
+            self.index[key] = {
+                "key": key,
+                "url": canonical_url(url),
+                "status": response.status_code,
+                "headers": {name: response.headers[name] for name in STORED_HEADERS if name in response.headers},
+                "size": len(body),
+                "fetched_at": now,
+                "last_access": now,
+            }
+            self.stats["downloads"] += 1
+            self._evict()
+            self._changed()
+
+    def _evict(self):
+        """Drop least recently used entries once over max_bytes, down to evict_to of it"""
+        if self.total_bytes <= self.max_bytes:
+            return
+
+        target = self.max_bytes * self.evict_to
+        for entry in sorted(self.index.values(), key=lambda e: e["last_access"]):
+            if self.total_bytes <= target:
+                break
+            try:
+                os.remove(self._body_path(entry["key"]))
+            except OSError:
+                pass
+            self.total_bytes -= entry["size"]
+            del self.index[entry["key"]]
+            self.stats["evicted"] += 1
+
+    def _changed(self):
+        """Count one index change (lock held) and save once enough have piled up"""
+        self.unsaved += 1
+        if self.unsaved >= self.save_every or time.monotonic() - self.last_save >= self.save_seconds:
+            self._save()
+
+    def _save(self):
+        # Lock held, so the snapshot written is the newest and no other save interleaves
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix="index.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.index, f)
+            os.replace(tmp_path, self.index_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.unsaved = 0
+        self.last_save = time.monotonic()
+
+    def save(self):
+        """Write the index atomically so a crash never leaves it half-written"""
+        with self.lock:
+            self._save()
+
+    def report(self):
+        stats = self.stats
+        print(f"HTTP cache: {stats['hits']} fresh hits, {stats['revalidated']} revalidated (304), "
+              f"{stats['downloads']} full downloads, {stats['evicted']} evicted")
+
+
+def cached_get(session, url, cache=None, rate_limiter=None, retries=3, timeout=15):
+    """GET url with retries, serving and revalidating from cache when there is one; None if every attempt failed
+
+    Network requests are paced by rate_limiter (an AdaptiveRateLimiter),
+    which also gets each response's status and latency; fresh cache hits
+    never touch it.
+    """
+    entry = cache.lookup(url) if cache else None
+    if entry and cache.is_fresh(entry):
+        response = cache.hit(entry)
+        if response is not None:
+            return response
+        # Evicted by another fetch thread since the lookup: a miss
+        entry = None
+
+    headers = cache.conditional_headers(entry) if entry else {}
+    for attempt in range(retries):
+        if rate_limiter:
+            rate_limiter.acquire()
+        start = time.monotonic()
+        try:
+            response = session.get(url, timeout=timeout, headers=headers)
+            if rate_limiter:
+                rate_limiter.record(response.status_code, time.monotonic() - start,
+                                    response.headers.get('Retry-After'))
+            if response.status_code == 304 and entry:
+                cached = cache.revalidated(entry, response)
+                if cached is not None:
+                    return cached
+                # Body evicted while revalidating; the next attempt fetches it in full
+                entry, headers = None, {}
+                raise requests.HTTPError(f"304 for {url} but its cached body was evicted")
+            response.raise_for_status()
+            if cache:
+                cache.store(url, response)
+            return response
+        except Exception as e:
+            if rate_limiter and not isinstance(e, requests.HTTPError):
+                # Timeouts and dropped connections count as slow responses
+                rate_limiter.record(None, time.monotonic() - start)
+            print(f"Attempt {attempt + 1} failed for {url}: {e}")
+    return None
@@ -0,0 +1,57 @@
+import os
+import requests
+from urllib.parse import urljoin, urlparse, urlunparse, parse_qsl, urlencode
+
+# Point every scraper at a fixture server with BABYLIST_BASE_URL=http://127.0.0.1:8000
+BASE_URL = os.environ.get("BABYLIST_BASE_URL", "https://www.babylist.com").rstrip('/')
+
+LIVE_HOSTS = ('www.babylist.com', 'babylist.com')
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+
+def make_session():
+    """requests.Session with the browser-like headers every scraper uses"""
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+def absolute_url(href, base_url=BASE_URL):
+    """Resolve a link against base_url, keeping live-site links on base_url's host"""
+    full_url = urljoin(base_url + '/', href)
+    parts = urlparse(full_url)
+    base = urlparse(base_url)
+    if parts.netloc in LIVE_HOSTS and base.netloc not in LIVE_HOSTS:
+        full_url = urlunparse(parts._replace(scheme=base.scheme, netloc=base.netloc))
+    return full_url
+
+
+# Query parameters that never change page content
+TRACKING_PARAMS = {'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content', 'gclid', 'fbclid', 'ref'}
+
+
+def canonical_url(url):
+    """Normalize a URL so the same page always maps to the same key"""
+    parts = urlparse(url.strip())
+    scheme = (parts.scheme or 'https').lower()
+    host = parts.netloc.lower()
+    if (scheme == 'https' and host.endswith(':443')) or (scheme == 'http' and host.endswith(':80')):
+        host = host.rsplit(':', 1)[0]
+
+    path = parts.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS
+    )
+    return urlunparse((scheme, host, path, '', urlencode(query), ''))
@@ -0,0 +1,69 @@
+from async_fetch import AsyncFetcher
+from http_cache import cached_get
+from structured_data import FieldSources, missing_fields
+
+# Fields that static HTML must fill before we trust it over a rendered page
+REQUIRED_FIELDS = ['price', 'color_options']
+
+# Static product pages fetched at once; scraper.rate_limiter still paces the requests
+STATIC_CONCURRENCY = 4
+
+
+def fetch_static(scraper, url):
+    """Plain HTTP fetch of a product page through the scraper's cache, session and rate limiter"""
+    # One attempt: a page that fails here is simply loaded in the browser
+    response = cached_get(scraper.session, url, scraper.cache, scraper.rate_limiter, retries=1)
+    return response.text if response is not None else None
+
+
+def static_pass(scraper, product_urls, required_fields=REQUIRED_FIELDS, concurrency=STATIC_CONCURRENCY):
+    """Run the scraper's extractors on static HTML for every URL
+
+    Returns (rows, browser_urls): rows maps URL to a complete product row,
+    browser_urls lists the pages that still need a rendered browser load.
+    Pages are fetched concurrently by an AsyncFetcher and parsed in its
+    threads; fresh cache hits skip its politeness slots. Field sources are
+    only counted for the rows kept here; a page sent on to the browser is
+    counted when the browser parses it.
+    """
+    product_urls = list(product_urls)
+    cache = scraper.cache
+
+    def handle(url, html):
+        if html is None:
+            return None
+        if scraper.recorder:
+            scraper.recorder.record(url, html)
+
+        page_sources = FieldSources()
+        try:
+            product_data = scraper.parse_product_page(url, html, field_sources=page_sources)
+        except Exception as e:
+            print(f"Error parsing static page {url}: {e}")
+            return None
+
+        missing = missing_fields(product_data, required_fields)
+        if missing:
+            print(f"  Missing {', '.join(missing)} in static HTML of {url}, queueing for browser")
+            return None
+        scraper.field_sources.merge(page_sources.counts, page_sources.sku_tiers)
+        return product_data
+
+    print(f"\nStatic fetch of {len(product_urls)} product pages, {concurrency} at a time")
+    fetcher = AsyncFetcher(lambda url: fetch_static(scraper, url), concurrency=concurrency,
+                           per_host=concurrency, min_interval=0.0,
+                           bypass=cache.has_fresh if cache else None)
+    results = fetcher.run(product_urls, handle)
+
+    rows = {}
+    browser_urls = []
+    for url, product_data in zip(product_urls, results):
+        if product_data:
+            rows[url] = product_data
+        else:
+            browser_urls.append(url)
+
+    stats = fetcher.stats
+    print(f"Static pass: {len(rows)}/{len(product_urls)} complete, {stats['failed']} fetches failed "
+          f"in {stats['elapsed']:.1f}s")
+    return rows, browser_urls
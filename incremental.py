@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from urllib.parse import urlparse, urlunparse
+
+
+def state_path(output):
+    """Default state file next to an output file: products.csv -> products.state.json"""
+    return os.path.splitext(output)[0] + ".state.json"
+
+
+def parse_lastmod(value):
+    """Timezone-aware datetime from a sitemap <lastmod> (W3C date or date-time), or None"""
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def tile_hash(tile):
+    """Fingerprint of a listing tile; image URLs lose their query so CDN resizing doesn't count as a change"""
+    if not tile:
+        return None
+    tile = dict(tile)
+    if tile.get('image_url'):
+        tile['image_url'] = urlunparse(urlparse(tile['image_url'])._replace(query='', fragment=''))
+    return hashlib.sha1(json.dumps(tile, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def row_hash(product_data):
+    """Fingerprint of a scraped row; color lists are built from sets, so their order doesn't count"""
+    normalized = {key: sorted(value) if isinstance(value, list) and all(isinstance(item, str) for item in value)
+                  else value for key, value in product_data.items()}
+    return hashlib.sha1(json.dumps(normalized, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class IncrementalState:
+    """Decides which product pages a re-crawl must fetch; the rest keep last run's row
+
+    The state file maps each product URL to the row last scraped for it,
+    when it was fetched, and the change signals seen then: a hash of its
+    listing tile (name, image and price where the listing shows them) and
+    its sitemap lastmod. A page is refetched when it is new, a signal says
+    it changed, it has no signal to compare, or it was last fetched more
+    than max_age_days ago (tiles don't show every spec). Otherwise its
+    previous row is carried forward without a request.
+    """
+
+    def __init__(self, path, max_age_days=7):
+        self.path = path
+        self.max_age = max_age_days * 86400 if max_age_days else None
+        self.previous = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.previous = json.load(f)
+        self.current = {}
+        self.tiles = {}
+        self.lastmods = {}
+        self.reasons = Counter()
+        self.carried = 0
+        self.kept = 0
+        self.unchanged = 0
+
+    def observe_tiles(self, tiles):
+        """Listing tiles from discovery: {url: {"name", "image_url", "price", ...}}"""
+        for url, tile in tiles.items():
+            self.tiles[url] = tile_hash(tile)
+
+    def observe_lastmods(self, lastmods):
+        """Sitemap lastmod per URL: {url: "2024-05-01T10:00:00+00:00"}"""
+        self.lastmods.update(lastmods)
+
+    def reason(self, url):
+        """Why url must be fetched again ("new", "stale", "lastmod", "listing", "no signal"), or None"""
+        entry = self.previous.get(url)
+        if entry is None:
+            return "new"
+        if self.max_age and time.time() - entry.get('fetched_at', 0) > self.max_age:
+            return "stale"
+
+        signals = 0
+        lastmod, previous_lastmod = parse_lastmod(self.lastmods.get(url)), parse_lastmod(entry.get('lastmod'))
+        if lastmod and previous_lastmod:
+            if lastmod > previous_lastmod:
+                return "lastmod"
+            signals += 1
+        tile, previous_tile = self.tiles.get(url), entry.get('tile')
+        if tile and previous_tile:
+            if tile != previous_tile:
+                return "listing"
+            signals += 1
+        return None if signals else "no signal"
+
+    def _remember(self, url, product_data, fetched_at):
+        self.current[url] = {
+            'row': product_data,
+            'fetched_at': fetched_at,
+            'tile': self.tiles.get(url),
+            'lastmod': self.lastmods.get(url),
+        }
+
+    def crawl(self, product_urls, run, on_product=None):
+        """Rows for product_urls in order, calling run(urls, on_product) only for pages that may have changed
+
+        Only rows run() actually fetched go through its on_product, so a
+        journal wrapped in run records a failed refetch as failed rather than
+        done; carried-forward and kept rows go straight to on_product.
+        """
+        refetch = []
+        for url in product_urls:
+            why = self.reason(url)
+            if why:
+                self.reasons[why] += 1
+                refetch.append(url)
+                continue
+            entry = self.previous[url]
+            self._remember(url, entry['row'], entry['fetched_at'])
+            self.carried += 1
+            if on_product:
+                on_product(entry['row'])
+
+        def handle(product_data):
+            url = product_data['retailer_url']
+            previous = self.previous.get(url)
+            if previous and row_hash(previous['row']) == row_hash(product_data):
+                self.unchanged += 1
+            self._remember(url, product_data, time.time())
+            if on_product:
+                on_product(product_data)
+
+        if refetch:
+            run(refetch, handle)
+
+        # A failed refetch keeps the last good row for the output instead of dropping the
+        # product; a journal inside run has already recorded it as failed, so --resume retries it
+        for url in refetch:
+            if url not in self.current and url in self.previous:
+                entry = self.previous[url]
+                self.current[url] = entry
+                self.kept += 1
+                if on_product:
+                    on_product(entry['row'])
+
+        self.save()
+        self.report(len(product_urls), len(refetch))
+        return [self.current[url]['row'] for url in product_urls if url in self.current]
+
+    def save(self):
+        """Write previous state updated with this run's rows; products not seen this run are kept"""
+        state = dict(self.previous)
+        state.update(self.current)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, default=str)
+        os.replace(temp_path, self.path)
+
+    def report(self, total, refetched):
+        reasons = ', '.join(f"{count} {why}" for why, count in self.reasons.most_common())
+        print(f"\nIncremental: refetched {refetched}/{total} products ({reasons or 'none'}), "
+              f"carried {self.carried} forward")
+        if self.unchanged:
+            print(f"  {self.unchanged} refetched rows were identical to the previous run")
+        if self.kept:
+            print(f"  {self.kept} failed refetches kept their previous row")
+
+
+def crawl_with_incremental(state, product_urls, run, on_product=None):
+    """run(urls, on_product) directly, or only for changed products when there is an IncrementalState"""
+    if state is None:
+        return run(product_urls, on_product)
+    return state.crawl(product_urls, run, on_product)
@@ -0,0 +1,170 @@
+from collections import deque
+
+# Optional C automaton; the pure-Python strategies below are always available
+try:
+    import ahocorasick
+    HAVE_PYAHOCORASICK = True
+except ImportError:
+    HAVE_PYAHOCORASICK = False
+
+BACKENDS = ['scan', 'automaton', 'pyahocorasick']
+
+# Up to this many keywords, one str.find per keyword (C speed) beats walking
+# an automaton character by character in Python
+SCAN_THRESHOLD = 128
+
+
+def default_backend(keyword_count):
+    if HAVE_PYAHOCORASICK:
+        return 'pyahocorasick'
+    return 'scan' if keyword_count <= SCAN_THRESHOLD else 'automaton'
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+
+class KeywordMatcher:
+    """Case-insensitive search for a fixed vocabulary of keywords, built once per process
+
+    keywords is a list (each keyword is its own label) or a dict mapping
+    keyword -> label, e.g. {"navy": "Blue", "onyx": "Black"}. Order is
+    priority: first() returns the label of the earliest keyword that occurs,
+    the answer the `for word in words: if word in text` loops gave.
+
+    Matching keeps their substring semantics ("grey" matches "greyish");
+    word_boundary=True only accepts keywords that are whole words in the
+    text, so "red" no longer matches "tired".
+
+    With pyahocorasick, or more than SCAN_THRESHOLD keywords, one
+    Aho-Corasick pass finds every keyword at once, so the cost per text no
+    longer grows with the vocabulary. Without pyahocorasick, the small
+    vocabularies in this repo take the 'scan' backend, one substring check
+    per keyword, which costs what the loops it replaced did; install
+    pyahocorasick for the speedup.
+    """
+
+    def __init__(self, keywords, word_boundary=False, backend=None):
+        items = keywords.items() if isinstance(keywords, dict) else [(keyword, keyword) for keyword in keywords]
+        self.keywords = []
+        self.labels = []
+        seen = set()
+        for keyword, label in items:
+            keyword = keyword.lower()
+            if keyword and keyword not in seen:
+                seen.add(keyword)
+                self.keywords.append(keyword)
+                self.labels.append(label)
+        self.word_boundary = word_boundary
+
+        self.backend = backend or default_backend(len(self.keywords))
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown keyword matcher backend {self.backend!r}; choose from {', '.join(BACKENDS)}")
+        if self.backend == 'pyahocorasick':
+            if not HAVE_PYAHOCORASICK:
+                raise ValueError("Keyword matcher backend 'pyahocorasick' needs pyahocorasick installed")
+            self._build_pyahocorasick()
+        elif self.backend == 'automaton':
+            self._build_automaton()
+
+    def _build_pyahocorasick(self):
+        self.automaton = ahocorasick.Automaton()
+        for priority, keyword in enumerate(self.keywords):
+            self.automaton.add_word(keyword, (priority, len(keyword)))
+        if self.keywords:
+            self.automaton.make_automaton()
+
+    def _build_automaton(self):
+        """Trie with failure links; outputs[state] lists every keyword ending there"""
+        self.goto = [{}]
+        self.fail = [0]
+        self.outputs = [[]]
+        for priority, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.outputs.append([])
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.outputs[state].append(priority)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+
+    def _occurrences(self, text):
+        """(priority, start, end) of keyword occurrences in lowercased text"""
+        if self.backend == 'pyahocorasick':
+            if not self.keywords:
+                return
+            for end, (priority, length) in self.automaton.iter(text):
+                yield priority, end + 1 - length, end + 1
+        elif self.backend == 'automaton':
+            goto, fail, outputs, keywords = self.goto, self.fail, self.outputs, self.keywords
+            state = 0
+            for index, char in enumerate(text):
+                while state and char not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(char, 0)
+                for priority in outputs[state]:
+                    yield priority, index + 1 - len(keywords[priority]), index + 1
+        else:
+            for priority, keyword in enumerate(self.keywords):
+                start = text.find(keyword)
+                while start != -1:
+                    yield priority, start, start + len(keyword)
+                    start = text.find(keyword, start + 1)
+
+    def _matches(self, text):
+        """Priorities of the keywords found in text, each at most once"""
+        if not text:
+            return
+        text = text.lower()
+        if self.backend == 'scan' and not self.word_boundary:
+            for priority, keyword in enumerate(self.keywords):
+                if keyword in text:
+                    yield priority
+            return
+        seen = set()
+        for priority, start, end in self._occurrences(text):
+            if priority in seen:
+                continue
+            if self.word_boundary and (
+                (start > 0 and _is_word_char(text[start - 1])) or
+                (end < len(text) and _is_word_char(text[end]))
+            ):
+                continue
+            seen.add(priority)
+            yield priority
+
+    def contains_any(self, text):
+        """True if any keyword occurs in text"""
+        for _ in self._matches(text):
+            return True
+        return False
+
+    def first(self, text):
+        """Label of the highest-priority keyword found in text, or None"""
+        if self.backend == 'scan':
+            # scan yields keywords in priority order, so the first hit is the answer
+            found = next(self._matches(text), None)
+        else:
+            found = min(self._matches(text), default=None)
+        return None if found is None else self.labels[found]
+
+    def find_all(self, text):
+        """Labels of every keyword found in text, in priority order, without repeats"""
+        labels = []
+        for priority in sorted(self._matches(text)):
+            if self.labels[priority] not in labels:
+                labels.append(self.labels[priority])
+        return labels
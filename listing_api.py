@@ -0,0 +1,232 @@
+import time
+from urllib.parse import urlparse, urlencode, parse_qsl, urlunparse
+
+from app_state import extract_embedded_state, tile_record
+from crawl_journal import discover_with_journal
+from html_parser import make_soup
+from http_client import BASE_URL, absolute_url
+from sitemap import sitemap_product_urls
+
+# Keys that hold a product's link inside listing payloads
+URL_KEYS = ['url', 'path', 'href', 'link', 'productUrl', 'product_url', 'canonicalUrl', 'canonical_url', 'slug']
+
+# Product tiles in the server-rendered grid (the cards babylist.py reads)
+TILE_SELECTORS = ["div[class^='product-grid__ProductGrid__grid-item']", "[data-testid*='product-card']"]
+
+# Keys that tell us how many listing pages there are
+TOTAL_PAGES_KEYS = ['totalPages', 'total_pages', 'pageCount', 'page_count', 'numPages', 'num_pages', 'lastPage', 'last_page']
+
+
+def find_product_urls(obj, base_url=BASE_URL, found=None):
+    """Walk a JSON payload and collect product (/gp/) URLs in document order"""
+    if found is None:
+        found = []
+
+    if isinstance(obj, dict):
+        for key in URL_KEYS:
+            value = obj.get(key)
+            if isinstance(value, str) and '/gp/' in value:
+                full_url = absolute_url(value, base_url)
+                if full_url not in found:
+                    found.append(full_url)
+        for value in obj.values():
+            if isinstance(value, (dict, list)):
+                find_product_urls(value, base_url, found)
+    elif isinstance(obj, list):
+        for item in obj:
+            find_product_urls(item, base_url, found)
+
+    return found
+
+
+def find_product_tiles(obj, base_url=BASE_URL, tiles=None):
+    """Map each product URL in a JSON payload to what its listing item shows (see tile_record)"""
+    if tiles is None:
+        tiles = {}
+
+    if isinstance(obj, dict):
+        for key in URL_KEYS:
+            value = obj.get(key)
+            if isinstance(value, str) and '/gp/' in value:
+                full_url = absolute_url(value, base_url)
+                tile = tile_record(obj)
+                if tile and full_url not in tiles:
+                    tiles[full_url] = tile
+                break
+        for value in obj.values():
+            if isinstance(value, (dict, list)):
+                find_product_tiles(value, base_url, tiles)
+    elif isinstance(obj, list):
+        for item in obj:
+            find_product_tiles(item, base_url, tiles)
+
+    return tiles
+
+
+def tiles_from_html(html, base_url=BASE_URL):
+    """Product URL -> name, image_url and (when shown) price from the grid's product cards"""
+    soup = make_soup(html)
+    tiles = {}
+    for selector in TILE_SELECTORS:
+        for card in soup.select(selector):
+            link = card.select_one("a[href*='/gp/']")
+            if not link:
+                continue
+            tile = {}
+            image = card.select_one("img")
+            if image:
+                tile['name'] = image.get('alt', '').strip()
+                tile['image_url'] = image.get('src', '').strip()
+            price = card.select_one("[class*='price']")
+            if price:
+                tile['price'] = price.get_text(strip=True)
+            tile = {field: value for field, value in tile.items() if value}
+            if tile:
+                tiles.setdefault(absolute_url(link['href'], base_url), tile)
+        if tiles:
+            break
+    return tiles
+
+
+def find_total_pages(obj):
+    """Largest page count advertised anywhere in the payload, or None"""
+    best = None
+    if isinstance(obj, dict):
+        for key in TOTAL_PAGES_KEYS:
+            value = obj.get(key)
+            if isinstance(value, int) and value > 0:
+                best = max(best or 0, value)
+        for value in obj.values():
+            if isinstance(value, (dict, list)):
+                nested = find_total_pages(value)
+                if nested:
+                    best = max(best or 0, nested)
+    elif isinstance(obj, list):
+        for item in obj:
+            nested = find_total_pages(item)
+            if nested:
+                best = max(best or 0, nested)
+    return best
+
+
+def with_page(url, page):
+    """Set the page query parameter on a listing URL"""
+    parts = urlparse(url)
+    query = dict(parse_qsl(parts.query))
+    query['page'] = str(page)
+    return urlunparse(parts._replace(query=urlencode(query)))
+
+
+def parse_listing_payload(response, base_url=BASE_URL, tiles=None):
+    """Product URLs and page count from a JSON response or embedded page state
+
+    Pass a dict as tiles to also collect what each product's listing item shows.
+    """
+    payloads = []
+    content_type = response.headers.get('Content-Type', '')
+    if 'json' in content_type:
+        try:
+            payloads.append(response.json())
+        except ValueError:
+            pass
+    else:
+        payloads.extend(extract_embedded_state(response.text))
+
+    urls = []
+    total_pages = None
+    for payload in payloads:
+        find_product_urls(payload, base_url, urls)
+        if tiles is not None:
+            find_product_tiles(payload, base_url, tiles)
+        pages = find_total_pages(payload)
+        if pages:
+            total_pages = max(total_pages or 0, pages)
+    return urls, total_pages
+
+
+def fetch_listing_urls(session, listing_url, base_url=BASE_URL, max_pages=50, recorder=None, tiles=None):
+    """Page through a category's listing data directly, without a browser
+
+    Tries the listing URL as a JSON endpoint first and then the state embedded
+    in the server-rendered HTML. Returns None when neither exposes products so
+    callers can fall back to scrolling the page in Selenium. A dict passed as
+    tiles is filled with each product's listing item (see find_product_tiles).
+    """
+    attempts = [
+        {'Accept': 'application/json', 'X-Requested-With': 'XMLHttpRequest'},
+        {},
+    ]
+
+    for headers in attempts:
+        try:
+            response = session.get(listing_url, headers=headers, timeout=15)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"Listing request failed for {listing_url}: {e}")
+            continue
+
+        product_urls, total_pages = parse_listing_payload(response, base_url, tiles)
+        if not product_urls:
+            continue
+        if recorder:
+            recorder.record(listing_url, response.content, response.headers.get('Content-Type', 'text/html'))
+
+        print(f"Listing data found {len(product_urls)} products on page 1"
+              + (f" of {total_pages}" if total_pages else ""))
+
+        page = 2
+        while page <= min(total_pages or max_pages, max_pages):
+            try:
+                response = session.get(with_page(listing_url, page), headers=headers, timeout=15)
+                response.raise_for_status()
+            except Exception as e:
+                print(f"Listing page {page} failed: {e}")
+                break
+
+            page_urls, _ = parse_listing_payload(response, base_url, tiles)
+            new_urls = [url for url in page_urls if url not in product_urls]
+            if not new_urls:
+                break
+            if recorder:
+                recorder.record(response.url, response.content, response.headers.get('Content-Type', 'text/html'))
+            product_urls.extend(new_urls)
+            print(f"Listing page {page}: {len(new_urls)} new products")
+            page += 1
+
+        return product_urls
+
+    print(f"No listing data endpoint available for {listing_url}")
+    return None
+
+
+def discover_product_urls(scraper, listing_url):
+    """Product URLs for a category: the journal's, the sitemaps', listing data, or Selenium scrolling"""
+    return discover_with_journal(scraper.journal, listing_url,
+                                 lambda: _discover_product_urls(scraper, listing_url))
+
+
+def _discover_product_urls(scraper, listing_url):
+    product_urls = sitemap_product_urls(scraper.sitemap, scraper.session, listing_url, scraper.incremental,
+                                        scraper.excluded_url_terms)
+    if product_urls:
+        return product_urls
+
+    # Listing tiles only matter to an incremental re-crawl
+    tiles = {} if scraper.incremental is not None else None
+    product_urls = fetch_listing_urls(scraper.session, listing_url, scraper.base_url,
+                                      recorder=scraper.recorder, tiles=tiles)
+    if product_urls:
+        if tiles:
+            scraper.incremental.observe_tiles(tiles)
+        return product_urls
+
+    print(f"Loading: {listing_url}")
+    driver = scraper.browser()
+    driver.get(listing_url)
+    time.sleep(3)
+    scraper.scroll_and_load_all()
+    if scraper.recorder:
+        scraper.recorder.record(listing_url, driver.page_source)
+    if scraper.incremental is not None:
+        scraper.incremental.observe_tiles(tiles_from_html(driver.page_source, scraper.base_url))
+    return scraper.extract_product_list()
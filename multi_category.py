@@ -0,0 +1,285 @@
+import argparse
+import json
+import threading
+
+import pandas as pd
+
+from babylist_updated import BabylistStrollerScraper
+from double_babylist_strollers import BabylistDoubleStrollerScraper
+from travel_systems_babylist import BabylistTravelSystemScraper
+from babylist_carseats import BabylistCarSeatScraper
+from driver_pool import DriverPool
+from fixtures import FixtureStore
+from http_client import canonical_url, BASE_URL
+from crawl_journal import CrawlJournal, journal_path, journal_run
+from http_cache import ResponseCache
+from hybrid_fetch import static_pass
+from incremental import IncrementalState, crawl_with_incremental, state_path
+from html_parser import set_region_parsing
+from listing_api import discover_product_urls
+from sitemap import SitemapIndex
+from output_sink import open_sink, MultiSink
+from catalog_store import CatalogStore
+from arrow_export import export_dataset
+
+# Category key -> (scraper class, listing path, label written to the row)
+CATEGORIES = {
+    'single-strollers': (BabylistStrollerScraper, "/store/single-strollers", "Single Stroller"),
+    'double-strollers': (BabylistDoubleStrollerScraper, "/store/double-strollers", "Double Stroller"),
+    'travel-systems': (BabylistTravelSystemScraper, "/store/travel-systems", "Travel System"),
+    'infant-car-seats': (BabylistCarSeatScraper, "/store/infant-car-seats", "Infant Car Seat"),
+}
+
+
+class URLRegistry:
+    """Global seen-URL registry: each product once, with every category it appeared in"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.urls = {}        # canonical URL -> URL as first discovered
+        self.categories = {}  # canonical URL -> category labels in discovery order
+        self.owners = {}      # canonical URL -> category key whose extractor handles it
+
+    def add(self, url, category_key, label):
+        """Register a discovered URL; returns True the first time it is seen"""
+        key = canonical_url(url)
+        with self.lock:
+            labels = self.categories.setdefault(key, [])
+            if label not in labels:
+                labels.append(label)
+            if key in self.urls:
+                return False
+            self.urls[key] = url
+            self.owners[key] = category_key
+            return True
+
+    def categories_for(self, url):
+        return list(self.categories.get(canonical_url(url), []))
+
+    def owner_of(self, url):
+        return self.owners[canonical_url(url)]
+
+    def unique_urls(self):
+        return list(self.urls.values())
+
+
+class MultiCategoryRunner:
+    """Scrape several categories with one browser pool and one URL registry"""
+
+    def __init__(self, chrome_path, category_keys, lean_browser=True, base_url=BASE_URL, recorder=None,
+                 journal=None, incremental=None, sitemap=None, cache=None):
+        unknown = [key for key in category_keys if key not in CATEGORIES]
+        if unknown:
+            raise ValueError(f"Unknown categories: {', '.join(unknown)}")
+
+        self.category_keys = category_keys
+        self.base_url = base_url
+        self.registry = URLRegistry()
+        # Optional crawl_journal.CrawlJournal shared by every category's discovery
+        self.journal = journal
+        # Optional incremental.IncrementalState; every category's listing tiles feed it
+        self.incremental = incremental
+
+        # The first scraper owns the browser, started only if a category needs it;
+        # the rest share it along with its session, cache, rate limiter and page timings
+        self.scrapers = {}
+        first = None
+        for key in category_keys:
+            scraper_cls = CATEGORIES[key][0]
+            if first is None:
+                first = scraper_cls(chrome_path, lean_browser=lean_browser,
+                                    base_url=base_url, recorder=recorder, journal=journal,
+                                    incremental=incremental, sitemap=sitemap, cache=cache)
+                self.scrapers[key] = first
+                continue
+            scraper = scraper_cls(chrome_path, lean_browser=lean_browser,
+                                  base_url=base_url, recorder=recorder, journal=journal,
+                                  incremental=incremental, sitemap=sitemap)
+            scraper.browser = first.browser
+            scraper.session = first.session
+            scraper.cache = first.cache
+            scraper.rate_limiter = first.rate_limiter
+            scraper.page_timings = first.page_timings
+            scraper.field_sources = first.field_sources
+            self.scrapers[key] = scraper
+        self.lead = first
+
+    def discover(self):
+        """Run listing discovery for every category into the shared registry"""
+        for key in self.category_keys:
+            _, listing_path, label = CATEGORIES[key]
+            print(f"\n=== Discovering {label} products ===")
+            product_urls = discover_product_urls(self.scrapers[key], self.base_url + listing_path) or []
+            new_count = sum(1 for url in product_urls if self.registry.add(url, key, label))
+            print(f"{label}: {len(product_urls)} listed, {new_count} new")
+
+        print(f"\n{len(self.registry.unique_urls())} unique products across {len(self.category_keys)} categories")
+
+    def _extract(self, url, driver=None):
+        scraper = self.scrapers[self.registry.owner_of(url)]
+        return scraper.extract_product_details(url, driver=driver)
+
+    def _browser_crawl(self, urls, pool_size, on_product=None):
+        if pool_size > 1 and len(urls) > 1:
+            with DriverPool(self.lead.create_driver, min(pool_size, len(urls))) as pool:
+                return pool.run(urls, lambda driver, url: self._extract(url, driver=driver),
+                                on_product=on_product)
+
+        rows = []
+        for i, url in enumerate(urls, 1):
+            print(f"\nScraping product {i}/{len(urls)}")
+            product_data = self._extract(url)
+            if product_data:
+                rows.append(product_data)
+                if on_product:
+                    on_product(product_data)
+        return rows
+
+    def run(self, pool_size=1, hybrid=False, on_product=None):
+        """Fetch each unique product once and tag it with all of its categories
+
+        on_product(row) gets each tagged row as soon as it is extracted. With
+        a journal, products it already has are not fetched again; with an
+        incremental state, only products that may have changed are.
+        """
+        self.discover()
+        urls = self.registry.unique_urls()
+
+        def finish(product_data):
+            product_data["categories"] = self.registry.categories_for(product_data["retailer_url"])
+            if on_product:
+                on_product(product_data)
+
+        products = crawl_with_incremental(
+            self.incremental, urls,
+            journal_run(self.journal, lambda pending, handle: self._crawl(pending, pool_size, hybrid, handle)),
+            finish,
+        )
+
+        self.lead.page_timings.report()
+        self.lead.rate_limiter.report()
+        self.lead.field_sources.report()
+        return products
+
+    def _crawl(self, urls, pool_size, hybrid, on_product):
+        static_rows = {}
+        browser_urls = urls
+        if hybrid:
+            browser_urls = []
+            for key in self.category_keys:
+                owned = [url for url in urls if self.registry.owner_of(url) == key]
+                rows, needs_browser = static_pass(self.scrapers[key], owned)
+                static_rows.update(rows)
+                browser_urls.extend(needs_browser)
+                for product_data in rows.values():
+                    on_product(product_data)
+            print(f"\nHybrid mode: {len(browser_urls)}/{len(urls)} pages need the browser")
+
+        browser_rows = {row["retailer_url"]: row for row in self._browser_crawl(browser_urls, pool_size, on_product)}
+
+        products = []
+        for url in urls:
+            product_data = static_rows.get(url) or browser_rows.get(url)
+            if product_data:
+                products.append(product_data)
+        return products
+
+    def save_to_csv(self, products, filename="babylist_all_categories.csv"):
+        """Save products from every category to one CSV"""
+        if not products:
+            print("No products to save!")
+            return
+
+        df = pd.DataFrame(products)
+
+        # Clean up list columns for CSV
+        for col in ['color_options', 'simplified_colors', 'tags', 'categories']:
+            if col in df.columns:
+                df[col] = df[col].apply(lambda x: ', '.join(x) if isinstance(x, list) else x)
+
+        # Variants keep their per-color price and SKU as a JSON array
+        if 'variants' in df.columns:
+            df['variants'] = df['variants'].apply(lambda x: json.dumps(x) if isinstance(x, list) else x)
+
+        df.to_csv(filename, index=False)
+        print(f"\nSaved {len(products)} products to {filename}")
+
+    def close(self):
+        """Close the shared browser"""
+        self.lead.close()
+
+
+# Usage
+if __name__ == "__main__":
+    chrome_path = "/Users/makaylacheng/Downloads/chromedriver-mac-arm64/chromedriver"
+
+    parser = argparse.ArgumentParser(description="Scrape several Babylist categories in one run")
+    parser.add_argument("categories", nargs="*", default=list(CATEGORIES),
+                        help=f"Categories to scrape (default: all of {', '.join(CATEGORIES)})")
+    parser.add_argument("--pool-size", type=int, default=1,
+                        help="Number of parallel browser sessions for product pages")
+    parser.add_argument("--full-browser", action="store_true",
+                        help="Headed Chrome loading every resource (for comparing against the lean profile)")
+    parser.add_argument("--hybrid", action="store_true",
+                        help="Parse static HTML first and use the browser only when price or colors are missing")
+    parser.add_argument("--region-parse", action="store_true",
+                        help="Parse product pages from <head> plus the product region only "
+                             "(falls back to the full page when name or price is missing)")
+    parser.add_argument("--cache-dir", default=".http_cache",
+                        help="Directory for the on-disk response cache used by --hybrid static fetches")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always download --hybrid static pages from the network")
+    parser.add_argument("--base-url", default=BASE_URL,
+                        help="Site root, e.g. a local fixtures.py server for offline runs")
+    parser.add_argument("--record", metavar="DIR",
+                        help="Save every listing and product page to this fixture directory")
+    parser.add_argument("--output", default="babylist_all_categories.csv",
+                        help="Written row by row as products are scraped (.csv, .jsonl or .parquet)")
+    parser.add_argument("--export", metavar="DIR",
+                        help="Also write a Parquet dataset partitioned by category and run date")
+    parser.add_argument("--catalog", metavar="DB",
+                        help="Also upsert every product into this SQLite catalog")
+    parser.add_argument("--journal", metavar="PATH",
+                        help="Checkpoint journal (default: next to --output, e.g. products.journal.jsonl)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue from the journal: skip discovery and products already scraped")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Refetch only products that are new or whose listing tile or lastmod changed")
+    parser.add_argument("--state", metavar="PATH",
+                        help="Incremental state file (default: next to --output, e.g. products.state.json)")
+    parser.add_argument("--max-age", type=float, default=7, metavar="DAYS",
+                        help="With --incremental, refetch any product last fetched longer ago than this")
+    parser.add_argument("--sitemap", action="store_true",
+                        help="Discover product URLs from category sitemaps (else the listing page) and lastmods from all sitemaps")
+    args = parser.parse_args()
+    if args.region_parse:
+        set_region_parsing(True)
+
+    cache = None if args.no_cache else ResponseCache(args.cache_dir)
+    recorder = FixtureStore(args.record) if args.record else None
+    sitemap = SitemapIndex(args.base_url, recorder=recorder) if args.sitemap else None
+    journal = CrawlJournal(args.journal or journal_path(args.output), resume=args.resume)
+    incremental = None
+    if args.incremental:
+        incremental = IncrementalState(args.state or state_path(args.output), max_age_days=args.max_age)
+    runner = MultiCategoryRunner(chrome_path, args.categories, lean_browser=not args.full_browser,
+                                 base_url=args.base_url, recorder=recorder, journal=journal,
+                                 incremental=incremental, sitemap=sitemap, cache=cache)
+    try:
+        sinks = [open_sink(args.output)]
+        if args.catalog:
+            sinks.append(CatalogStore(args.catalog, field_sources=runner.lead.field_sources))
+        with MultiSink(sinks) as sink:
+            products = runner.run(pool_size=args.pool_size, hybrid=args.hybrid, on_product=sink.write)
+        sink.report()
+        if cache:
+            cache.save()
+            cache.report()
+        if args.export:
+            export_dataset(products, args.export)
+        print(f"\nComplete! Found {len(products)} unique products.")
+    finally:
+        runner.close()
+        journal.close()
+        if recorder:
+            recorder.save()
@@ -1,66 +1,158 @@
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
-import time
 import re
 import json
-from urllib.parse import urljoin, urlparse
-import random
+import argparse
+from async_fetch import AsyncFetcher
+from pipeline import ExtractionPipeline
+from output_sink import open_sink, MultiSink
+from crawl_journal import CrawlJournal, journal_path, discover_with_journal, journal_run
+from incremental import IncrementalState, state_path, crawl_with_incremental
+from sitemap import SitemapIndex, sitemap_product_urls
+from catalog_store import CatalogStore
+from arrow_export import export_dataset
+from http_client import make_session, absolute_url, BASE_URL
+from fixtures import FixtureStore
+from listing_api import fetch_listing_urls, tiles_from_html
+from http_cache import ResponseCache, cached_get
+from rate_limiter import AdaptiveRateLimiter, concurrent_rate_limiter
+from html_parser import make_soup, set_region_parsing
+from page_context import PageContext
+from patterns import register
+from keyword_matcher import KeywordMatcher
+from structured_data import FieldSources
+
+# Field patterns in priority order; page text is lowercased before matching
+PRICE_PATTERNS = register('requests.price', [
+    r'\$(\d+(?:,\d{3})*(?:\.\d{2})?)',
+    r'price[:\s]*\$?(\d+(?:,\d{3})*(?:\.\d{2})?)',
+    r'costs?\s*\$?(\d+(?:,\d{3})*(?:\.\d{2})?)',
+    r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*dollars?'
+], re.IGNORECASE)
+
+SKU_PATTERNS = register('requests.sku', [
+    r'sku[:\s]*([a-zA-Z0-9\-_]+)',
+    r'item\s*#?[:\s]*([a-zA-Z0-9\-_]+)',
+    r'product\s*#?[:\s]*([a-zA-Z0-9\-_]+)',
+    r'model[:\s]*([a-zA-Z0-9\-_]+)'
+], re.IGNORECASE)
+
+DIMENSION_PATTERNS = register('requests.dimensions', [
+    r'dimensions?[:\s]*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?',
+    r'(\d+(?:\.\d+)?)\s*["\']?\s*[lL]\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?\s*[wW]\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?\s*[hH]',
+    r'folded[:\s]*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?',
+    r'open[:\s]*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?',
+    r'size[:\s]*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?'
+])
+
+RATING_PATTERNS = register('requests.rating', [
+    r'(\d+(?:\.\d+)?)\s*(?:out of|/)\s*5\s*stars?',
+    r'rating[:\s]*(\d+(?:\.\d+)?)',
+    r'(\d+(?:\.\d+)?)\s*stars?',
+    r'score[:\s]*(\d+(?:\.\d+)?)',
+    r'rated\s*(\d+(?:\.\d+)?)'
+], re.IGNORECASE)
+
+WEIGHT_PATTERNS = register('requests.weight', [
+    r'weight[:\s]*(\d+(?:\.\d+)?)\s*(?:lbs?|pounds?)',
+    r'(\d+(?:\.\d+)?)\s*(?:lbs?|pounds?)\s*(?:weight|when folded)',
+    r'weighs?\s*(\d+(?:\.\d+)?)\s*(?:lbs?|pounds?)',
+    r'(\d+(?:\.\d+)?)\s*lb\s*weight'
+])
+
+# Keyword vocabularies, each built into one matcher at import time
+# Color mapping to 10 simplified categories; earlier keys win
+COLOR_MAPPING = {
+    'black': 'Black',
+    'white': 'White',
+    'gray': 'Gray', 'grey': 'Gray', 'charcoal': 'Gray', 'slate': 'Gray',
+    'blue': 'Blue', 'navy': 'Blue', 'teal': 'Blue', 'aqua': 'Blue',
+    'red': 'Red', 'burgundy': 'Red', 'wine': 'Red', 'crimson': 'Red',
+    'green': 'Green', 'olive': 'Green', 'forest': 'Green', 'sage': 'Green',
+    'brown': 'Brown', 'tan': 'Brown', 'beige': 'Brown', 'khaki': 'Brown',
+    'coffee': 'Brown', 'espresso': 'Brown', 'chocolate': 'Brown',
+    'pink': 'Pink', 'rose': 'Pink', 'blush': 'Pink', 'coral': 'Pink',
+    'purple': 'Purple', 'lavender': 'Purple', 'plum': 'Purple',
+    'yellow': 'Yellow', 'gold': 'Yellow', 'cream': 'Yellow'
+}
+SIMPLE_COLORS = KeywordMatcher(COLOR_MAPPING, word_boundary=True)
+
+COLOR_KEYWORDS = KeywordMatcher([
+    'black', 'white', 'gray', 'grey', 'blue', 'red', 'green', 'brown', 'pink', 'purple', 'yellow',
+    'navy', 'charcoal', 'beige', 'tan', 'silver', 'gold', 'cream', 'ivory', 'teal', 'burgundy',
+    'olive'
+], word_boundary=True)
+# Title fragments that name the product type rather than a color
+NON_COLOR_TITLE_WORDS = KeywordMatcher(['stroller', 'car', 'seat', 'system', 'baby', 'jogger'])
+PRODUCT_LINK_TERMS = KeywordMatcher(['stroller', 'product', 'item'])
+
+BRANDS = KeywordMatcher([
+    'UPPAbaby', 'Bugaboo', 'Baby Jogger', 'BOB', 'Chicco', 'Graco', 'Britax', 'Nuna', 'Maxi-Cosi',
+    'Cybex', 'Stokke', 'Doona', 'Evenflo', 'Summer Infant', 'Joovy', 'Phil & Teds',
+    'Mountain Buggy', 'Thule'
+], word_boundary=True)
+
+# Feature tags; "one-hand" also matches "one hand" and "onehand"
+FEATURE_KEYWORDS = [
+    'lightweight', 'compact', 'foldable', 'travel', 'jogging', 'all-terrain', 'reversible',
+    'adjustable', 'safety', 'storage', 'canopy', 'wheels', 'one-hand', 'quick-fold', 'car-seat',
+    'compatible', 'umbrella'
+]
+FEATURE_TAGS = KeywordMatcher({
+    variant: keyword.replace('-', ' ').title()
+    for keyword in FEATURE_KEYWORDS
+    for variant in (keyword.replace('-', ' '), keyword.replace('-', ''))
+})
 
 class BabylistRequestsScraper:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
-        
-        # Color mapping to 10 simplified categories
-        self.color_mapping = {
-            'black': 'Black',
-            'white': 'White', 
-            'gray': 'Gray', 'grey': 'Gray', 'charcoal': 'Gray', 'slate': 'Gray',
-            'blue': 'Blue', 'navy': 'Blue', 'teal': 'Blue', 'aqua': 'Blue',
-            'red': 'Red', 'burgundy': 'Red', 'wine': 'Red', 'crimson': 'Red',
-            'green': 'Green', 'olive': 'Green', 'forest': 'Green', 'sage': 'Green',
-            'brown': 'Brown', 'tan': 'Brown', 'beige': 'Brown', 'khaki': 'Brown',
-            'coffee': 'Brown', 'espresso': 'Brown', 'chocolate': 'Brown',
-            'pink': 'Pink', 'rose': 'Pink', 'blush': 'Pink', 'coral': 'Pink',
-            'purple': 'Purple', 'lavender': 'Purple', 'plum': 'Purple',
-            'yellow': 'Yellow', 'gold': 'Yellow', 'cream': 'Yellow'
-        }
+    def __init__(self, cache=None, rate_limiter=None, base_url=BASE_URL, recorder=None, journal=None,
+                 incremental=None, sitemap=None):
+        self.session = make_session()
+        # Site root; point at a fixtures.FixtureServer for offline runs
+        self.base_url = base_url
+        # Optional fixtures.FixtureStore that captures every page we fetch
+        self.recorder = recorder
+        # Optional crawl_journal.CrawlJournal for checkpointing and --resume
+        self.journal = journal
+        # Optional incremental.IncrementalState; only changed products are refetched
+        self.incremental = incremental
+        # Optional sitemap.SitemapIndex; discovers product URLs from the category's sitemaps
+        self.sitemap = sitemap
+        # No single-stroller URL terms to exclude; sitemap URLs are taken as listed
+        self.excluded_url_terms = None
+        # Optional ResponseCache; None fetches everything from the network
+        self.cache = cache
+        # Paces every network request; starts near the old 2-3 s delay and adapts
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter(rate=0.4)
+        # Which tier (JSON-LD, DOM, nothing) filled each field
+        self.field_sources = FieldSources()
     
     def get_page(self, url, retries=3):
-        """Get page content with retries"""
-        for attempt in range(retries):
-            try:
-                response = self.session.get(url, timeout=15)
-                response.raise_for_status()
-                return response
-            except Exception as e:
-                print(f"Attempt {attempt + 1} failed for {url}: {e}")
-                if attempt < retries - 1:
-                    time.sleep(random.uniform(2, 4))
-                else:
-                    return None
+        """Get page content with retries, recording it when a fixture recorder is set"""
+        response = self._get_page(url, retries)
+        if response is not None and self.recorder:
+            self.recorder.record(url, response.content,
+                                 response.headers.get('Content-Type', 'text/html; charset=utf-8'))
+        return response
+    
+    def _get_page(self, url, retries=3):
+        """Get page content with retries, serving and revalidating from the cache when enabled"""
+        return cached_get(self.session, url, self.cache, self.rate_limiter, retries)
+    
+    def is_cached(self, url):
+        """True when get_page can answer from the cache without any network request"""
+        return bool(self.cache) and self.cache.has_fresh(url)
     
     def simplify_color(self, color_name):
         """Map color name to simplified category"""
         if not color_name or color_name == "N/A":
             return "Other"
             
-        color_lower = color_name.lower()
-        for key, simplified in self.color_mapping.items():
-            if key in color_lower:
-                return simplified
-        return "Other"
+        return SIMPLE_COLORS.first(color_name) or "Other"
     
-    def extract_price(self, soup, page_text):
+    def extract_price(self, page):
         """Enhanced price extraction"""
+        soup = page.soup
+        page_text = page.text_lower
         price_selectors = [
             '.price',
             '[data-testid*="price"]',
@@ -81,23 +173,17 @@ class BabylistRequestsScraper:
                     return f"${price_match.group(1)}"
         
         # Try regex patterns on full text
-        price_patterns = [
-            r'\$(\d+(?:,\d{3})*(?:\.\d{2})?)',
-            r'price[:\s]*\$?(\d+(?:,\d{3})*(?:\.\d{2})?)',
-            r'costs?\s*\$?(\d+(?:,\d{3})*(?:\.\d{2})?)',
-            r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*dollars?'
-        ]
-        
-        for pattern in price_patterns:
-            match = re.search(pattern, page_text, re.IGNORECASE)
-            if match:
-                price_val = match.group(1)
-                return f"${price_val}"
+        match = PRICE_PATTERNS.search(page_text)
+        if match:
+            price_val = match.group(1)
+            return f"${price_val}"
         
         return "N/A"
     
-    def extract_sku(self, soup, page_text):
+    def extract_sku(self, page):
         """Enhanced SKU extraction"""
+        soup = page.soup
+        page_text = page.text_lower
         sku_selectors = [
             '[data-testid*="sku"]',
             '.sku',
@@ -115,24 +201,20 @@ class BabylistRequestsScraper:
                     return sku_text
         
         # Try regex patterns
-        sku_patterns = [
-            r'sku[:\s]*([a-zA-Z0-9\-_]+)',
-            r'item\s*#?[:\s]*([a-zA-Z0-9\-_]+)',
-            r'product\s*#?[:\s]*([a-zA-Z0-9\-_]+)',
-            r'model[:\s]*([a-zA-Z0-9\-_]+)'
-        ]
-        
-        for pattern in sku_patterns:
-            match = re.search(pattern, page_text, re.IGNORECASE)
-            if match:
-                sku = match.group(1).strip()
-                if 5 <= len(sku) <= 20:  # Reasonable SKU length
-                    return sku
+        match = SKU_PATTERNS.search(page_text, accept=self._is_plausible_sku)
+        if match:
+            return match.group(1).strip()
         
         return "N/A"
     
-    def extract_dimensions(self, soup, page_text):
+    def _is_plausible_sku(self, match):
+        """Reasonable SKU length"""
+        return 5 <= len(match.group(1).strip()) <= 20
+    
+    def extract_dimensions(self, page):
         """Enhanced dimensions extraction"""
+        soup = page.soup
+        page_text = page.text_lower
         # Look for dimensions in structured data or specific elements
         dim_selectors = [
             '[data-testid*="dimension"]',
@@ -150,24 +232,17 @@ class BabylistRequestsScraper:
                     return f'{dim_match.group(1)}" x {dim_match.group(2)}" x {dim_match.group(3)}"'
         
         # Enhanced regex patterns for dimensions
-        dim_patterns = [
-            r'dimensions?[:\s]*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?',
-            r'(\d+(?:\.\d+)?)\s*["\']?\s*[lL]\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?\s*[wW]\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?\s*[hH]',
-            r'folded[:\s]*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?',
-            r'open[:\s]*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?',
-            r'size[:\s]*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?\s*[xX×]\s*(\d+(?:\.\d+)?)\s*["\']?'
-        ]
-        
-        for pattern in dim_patterns:
-            match = re.search(pattern, page_text)
-            if match:
-                dims = f'{match.group(1)}" x {match.group(2)}" x {match.group(3)}"'
-                return dims
+        match = DIMENSION_PATTERNS.search(page_text)
+        if match:
+            dims = f'{match.group(1)}" x {match.group(2)}" x {match.group(3)}"'
+            return dims
         
         return "N/A"
     
-    def extract_rating(self, soup, page_text):
+    def extract_rating(self, page):
         """Enhanced rating extraction"""
+        soup = page.soup
+        page_text = page.text_lower
         rating_selectors = [
             '[data-testid*="rating"]',
             '.rating',
@@ -189,25 +264,19 @@ class BabylistRequestsScraper:
                         return str(rating_val)
         
         # Enhanced regex patterns for ratings
-        rating_patterns = [
-            r'(\d+(?:\.\d+)?)\s*(?:out of|/)\s*5\s*stars?',
-            r'rating[:\s]*(\d+(?:\.\d+)?)',
-            r'(\d+(?:\.\d+)?)\s*stars?',
-            r'score[:\s]*(\d+(?:\.\d+)?)',
-            r'rated\s*(\d+(?:\.\d+)?)'
-        ]
-        
-        for pattern in rating_patterns:
-            match = re.search(pattern, page_text, re.IGNORECASE)
-            if match:
-                rating_val = float(match.group(1))
-                if 0 <= rating_val <= 5:
-                    return str(rating_val)
+        match = RATING_PATTERNS.search(page_text, accept=self._is_plausible_rating)
+        if match:
+            return str(float(match.group(1)))
         
         return "N/A"
     
-    def extract_colors(self, soup, page_text, product_name):
+    def _is_plausible_rating(self, match):
+        return 0 <= float(match.group(1)) <= 5
+    
+    def extract_colors(self, page, product_name):
         """Enhanced color extraction"""
+        soup = page.soup
+        page_text = page.text_lower
         colors_found = set()
         
         # Look for color selection elements
@@ -238,15 +307,12 @@ class BabylistRequestsScraper:
             for pattern in color_patterns:
                 matches = re.findall(pattern, product_name, re.IGNORECASE)
                 for match in matches:
-                    if not any(word in match.lower() for word in ['stroller', 'car', 'seat', 'system', 'baby', 'jogger']):
+                    if not NON_COLOR_TITLE_WORDS.contains_any(match):
                         colors_found.add(match.strip().title())
         
         # Look for color mentions in page text with context
-        color_keywords = ['black', 'white', 'gray', 'grey', 'blue', 'red', 'green', 'brown', 
-                         'pink', 'purple', 'yellow', 'navy', 'charcoal', 'beige', 'tan',
-                         'silver', 'gold', 'cream', 'ivory', 'teal', 'burgundy', 'olive']
-        
-        for color in color_keywords:
+        # Only colors named somewhere on the page can match the context patterns
+        for color in COLOR_KEYWORDS.find_all(page_text):
             color_patterns = [
                 rf'available in {color}',
                 rf'{color} color',
@@ -262,8 +328,25 @@ class BabylistRequestsScraper:
         return list(colors_found) if colors_found else ["N/A"]
     
     def extract_product_links(self):
-        """Extract product URLs from the main listing page"""
-        url = "https://www.babylist.com/store/single-strollers"
+        """Extract product URLs from the main listing page, or the journal's when resuming"""
+        url = f"{self.base_url}/store/single-strollers"
+        return discover_with_journal(self.journal, url, lambda: self._extract_product_links(url))
+    
+    def _extract_product_links(self, url):
+        product_list = sitemap_product_urls(self.sitemap, self.session, url, self.incremental,
+                                            self.excluded_url_terms)
+        if product_list:
+            return product_list
+        
+        # Listing data pages through every product without scraping the HTML grid
+        # Listing tiles only matter to an incremental re-crawl
+        tiles = {} if self.incremental is not None else None
+        product_list = fetch_listing_urls(self.session, url, self.base_url, recorder=self.recorder, tiles=tiles)
+        if product_list:
+            if tiles:
+                self.incremental.observe_tiles(tiles)
+            return product_list
+        
         print(f"Fetching main page: {url}")
         
         response = self.get_page(url)
@@ -271,7 +354,9 @@ class BabylistRequestsScraper:
             print("Failed to fetch main page")
             return []
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content)
+        if self.incremental is not None:
+            self.incremental.observe_tiles(tiles_from_html(response.content, self.base_url))
         
         # Enhanced selectors for product links
         selectors = [
@@ -295,7 +380,7 @@ class BabylistRequestsScraper:
             for link in links:
                 href = link.get('href')
                 if href and ('/store/' in href or '/gp/' in href):
-                    full_url = urljoin("https://www.babylist.com", href)
+                    full_url = absolute_url(href, self.base_url)
                     product_links.add(full_url)
             
             if product_links:
@@ -307,8 +392,8 @@ class BabylistRequestsScraper:
             all_links = soup.find_all('a', href=True)
             for link in all_links:
                 href = link['href']
-                if ('/store/' in href or '/gp/' in href) and any(word in href.lower() for word in ['stroller', 'product', 'item']):
-                    full_url = urljoin("https://www.babylist.com", href)
+                if ('/store/' in href or '/gp/' in href) and PRODUCT_LINK_TERMS.contains_any(href):
+                    full_url = absolute_url(href, self.base_url)
                     product_links.add(full_url)
         
         product_list = list(product_links)
@@ -331,8 +416,13 @@ class BabylistRequestsScraper:
             print(f"Failed to fetch {url}")
             return None
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        page_text = soup.get_text().lower()
+        return self.parse_product_page(url, response.content)
+    
+    def parse_product_page(self, url, content, scoped=None):
+        """Extract product fields from an already fetched product page"""
+        page = PageContext(content, scoped=scoped)
+        soup = page.soup
+        page_text = page.text_lower
         
         # Initialize product data
         product_data = {
@@ -347,118 +437,111 @@ class BabylistRequestsScraper:
             "image_url": "N/A",
             "sku": "N/A",
             "color_options": [],
+            "variants": [],
             "simplified_colors": [],
             "weight": "N/A",
             "dimensions": "N/A",
             "rating": "N/A"
         }
         
+        # Structured data first; the DOM heuristics below only fill what it leaves empty
+        structured, sources = page.structured
+        product_data.update({key: value for key, value in structured.items() if key in product_data})
+        
         # Product name extraction
-        name_selectors = [
-            'h1[data-testid*="title"]',
-            'h1[class*="title"]',
-            'h1[class*="name"]',
-            '.product-title',
-            '.product-name',
-            'h1'
-        ]
+        if "name" not in structured:
+            name_selectors = [
+                'h1[data-testid*="title"]',
+                'h1[class*="title"]',
+                'h1[class*="name"]',
+                '.product-title',
+                '.product-name',
+                'h1'
+            ]
         
-        for selector in name_selectors:
-            name_elem = soup.select_one(selector)
-            if name_elem:
-                product_data["name"] = name_elem.get_text().strip()
-                break
+            for selector in name_selectors:
+                name_elem = soup.select_one(selector)
+                if name_elem:
+                    product_data["name"] = name_elem.get_text().strip()
+                    break
         
-        # Fallback to title tag
-        if product_data["name"] == "N/A":
-            title_tag = soup.select_one('title')
-            if title_tag:
-                title_text = title_tag.get_text().strip()
-                product_data["name"] = re.sub(r'\s*\|\s*Babylist.*$', '', title_text)
+            # Fallback to title tag
+            if product_data["name"] == "N/A":
+                title_tag = soup.select_one('title')
+                if title_tag:
+                    title_text = title_tag.get_text().strip()
+                    product_data["name"] = re.sub(r'\s*\|\s*Babylist.*$', '', title_text)
         
         # Brand extraction
-        if product_data["name"] != "N/A":
-            brands = ['UPPAbaby', 'Bugaboo', 'Baby Jogger', 'BOB', 'Chicco', 'Graco', 
-                     'Britax', 'Nuna', 'Maxi-Cosi', 'Cybex', 'Stokke', 'Doona', 'Evenflo',
-                     'Summer Infant', 'Joovy', 'Phil & Teds', 'Mountain Buggy', 'Thule']
-            for brand in brands:
-                if brand.lower() in product_data["name"].lower():
-                    product_data["brand"] = brand
-                    break
+        if "brand" not in structured and product_data["name"] != "N/A":
+            brand = BRANDS.first(product_data["name"])
+            if brand:
+                product_data["brand"] = brand
         
         # Description extraction
-        desc_selectors = [
-            '[data-testid*="description"]',
-            '.product-description',
-            '.description',
-            'meta[name="description"]',
-            'meta[property="og:description"]'
-        ]
+        if "description" not in structured:
+            desc_selectors = [
+                '[data-testid*="description"]',
+                '.product-description',
+                '.description',
+                'meta[name="description"]',
+                'meta[property="og:description"]'
+            ]
         
-        for selector in desc_selectors:
-            desc_elem = soup.select_one(selector)
-            if desc_elem:
-                if desc_elem.name == 'meta':
-                    product_data["description"] = desc_elem.get('content', '').strip()
-                else:
-                    product_data["description"] = desc_elem.get_text().strip()
-                if product_data["description"]:
-                    break
+            for selector in desc_selectors:
+                desc_elem = soup.select_one(selector)
+                if desc_elem:
+                    if desc_elem.name == 'meta':
+                        product_data["description"] = desc_elem.get('content', '').strip()
+                    else:
+                        product_data["description"] = desc_elem.get_text().strip()
+                    if product_data["description"]:
+                        break
         
         # Image URL extraction
-        img_selectors = [
-            'meta[property="og:image"]',
-            '[data-testid*="image"] img',
-            '.product-image img',
-            '.main-image img',
-            'img[alt*="stroller"]',
-            'img[src*="product"]'
-        ]
+        if "image_url" not in structured:
+            img_selectors = [
+                'meta[property="og:image"]',
+                '[data-testid*="image"] img',
+                '.product-image img',
+                '.main-image img',
+                'img[alt*="stroller"]',
+                'img[src*="product"]'
+            ]
         
-        for selector in img_selectors:
-            img = soup.select_one(selector)
-            if img:
-                src = img.get('content') if img.name == 'meta' else img.get('src')
-                if src and src.startswith(('http', '//')):
-                    product_data["image_url"] = src
-                    break
+            for selector in img_selectors:
+                img = soup.select_one(selector)
+                if img:
+                    src = img.get('content') if img.name == 'meta' else img.get('src')
+                    if src and src.startswith(('http', '//')):
+                        product_data["image_url"] = src
+                        break
         
         # Extract all the missing fields using enhanced methods
-        product_data["price"] = self.extract_price(soup, page_text)
-        product_data["sku"] = self.extract_sku(soup, page_text)
-        product_data["dimensions"] = self.extract_dimensions(soup, page_text)
-        product_data["rating"] = self.extract_rating(soup, page_text)
+        if "price" not in structured:
+            product_data["price"] = self.extract_price(page)
+        if "sku" not in structured:
+            product_data["sku"] = self.extract_sku(page)
+        product_data["dimensions"] = self.extract_dimensions(page)
+        if "rating" not in structured:
+            product_data["rating"] = self.extract_rating(page)
         
         # Weight extraction (keeping existing logic but enhanced)
-        weight_patterns = [
-            r'weight[:\s]*(\d+(?:\.\d+)?)\s*(?:lbs?|pounds?)',
-            r'(\d+(?:\.\d+)?)\s*(?:lbs?|pounds?)\s*(?:weight|when folded)',
-            r'weighs?\s*(\d+(?:\.\d+)?)\s*(?:lbs?|pounds?)',
-            r'(\d+(?:\.\d+)?)\s*lb\s*weight'
-        ]
-        
-        for pattern in weight_patterns:
-            match = re.search(pattern, page_text)
-            if match:
-                product_data["weight"] = f"{match.group(1)} lbs"
-                break
+        match = WEIGHT_PATTERNS.search(page_text)
+        if match:
+            product_data["weight"] = f"{match.group(1)} lbs"
         
         # Color extraction
-        color_options = self.extract_colors(soup, page_text, product_data["name"])
+        color_options = structured.get("color_options") or self.extract_colors(page, product_data["name"])
         product_data["color_options"] = color_options
         product_data["simplified_colors"] = [self.simplify_color(color) for color in color_options]
         
         # Tags extraction (enhanced)
-        feature_keywords = ['lightweight', 'compact', 'foldable', 'travel', 'jogging', 'all-terrain', 
-                           'reversible', 'adjustable', 'safety', 'storage', 'canopy', 'wheels',
-                           'one-hand', 'quick-fold', 'car-seat', 'compatible', 'umbrella']
-        
-        tags = []
-        for keyword in feature_keywords:
-            if keyword.replace('-', ' ') in page_text or keyword.replace('-', '') in page_text:
-                tags.append(keyword.replace('-', ' ').title())
+        product_data["tags"] = FEATURE_TAGS.find_all(page_text)
         
-        product_data["tags"] = tags
+        # The region-only parse missed a key field; redo the page from the full tree
+        if page.needs_full_parse(product_data):
+            return self.parse_product_page(url, content, scoped=False)
         
         print(f"  ✓ Name: {product_data['name'][:50]}...")
         print(f"  ✓ Price: {product_data['price']}")
@@ -467,10 +550,11 @@ class BabylistRequestsScraper:
         print(f"  ✓ Dimensions: {product_data['dimensions']}")
         print(f"  ✓ Rating: {product_data['rating']}")
         
+        self.field_sources.record_row(product_data, sources)
         return product_data
     
-    def scrape_all_strollers(self):
-        """Main scraping method"""
+    def scrape_all_strollers(self, on_product=None):
+        """Main scraping method; on_product(row) gets each row as soon as it is extracted"""
         # Get product URLs
         product_urls = self.extract_product_links()
         
@@ -479,15 +563,101 @@ class BabylistRequestsScraper:
             return []
         
         # Scrape each product
-        products = []
-        for i, url in enumerate(product_urls, 1):
-            print(f"\nScraping product {i}/{len(product_urls)}")
-            product_data = self.extract_product_details(url)
-            if product_data:
-                products.append(product_data)
+        def crawl(urls, handle):
+            products = []
+            for i, url in enumerate(urls, 1):
+                print(f"\nScraping product {i}/{len(urls)}")
+                # get_page paces itself through the adaptive rate limiter
+                product_data = self.extract_product_details(url)
+                if product_data:
+                    products.append(product_data)
+                    if handle:
+                        handle(product_data)
+            return products
+        
+        products = crawl_with_incremental(self.incremental, product_urls, journal_run(self.journal, crawl), on_product)
+        
+        if self.cache:
+            self.cache.save()
+            self.cache.report()
+        self.rate_limiter.report()
+        self.field_sources.report()
+        return products
+    
+    def _parse_fetched(self, url, response):
+        """Callback for AsyncFetcher: parse a fetched response into a product row"""
+        if response is None:
+            print(f"Failed to fetch {url}")
+            return None
+        print(f"Scraping: {url}")
+        return self.parse_product_page(url, response.content)
+    
+    def scrape_all_strollers_async(self, concurrency=8, per_host=4, min_interval=0.0, on_product=None):
+        """Scrape all products with concurrent fetches instead of one at a time"""
+        product_urls = self.extract_product_links()
+        
+        if not product_urls:
+            print("No product URLs found!")
+            return []
+        
+        fetcher = AsyncFetcher(self.get_page, concurrency=concurrency,
+                               per_host=per_host, min_interval=min_interval,
+                               bypass=self.is_cached)
+        self.rate_limiter.report_start()
+        
+        def crawl(urls, on_row):
+            def handle(url, response):
+                product_data = self._parse_fetched(url, response)
+                if product_data and on_row:
+                    on_row(product_data)
+                return product_data
             
-            # Be respectful - add delay
-            time.sleep(random.uniform(2, 3))
+            return [product for product in fetcher.run(urls, handle) if product]
+        
+        products = crawl_with_incremental(self.incremental, product_urls, journal_run(self.journal, crawl), on_product)
+        
+        stats = fetcher.stats
+        fetched = stats["fetched"] + stats["failed"]
+        rate = fetched / stats["elapsed"] if stats["elapsed"] else 0
+        print(f"\nFetched {stats['fetched']} pages ({stats['failed']} failed) "
+              f"in {stats['elapsed']:.1f}s - {rate:.2f} pages/s")
+        if self.cache:
+            self.cache.save()
+            self.cache.report()
+        self.rate_limiter.report()
+        self.field_sources.report()
+        
+        return products
+    
+    def fetch_content(self, url):
+        """Raw page bytes for the extraction pipeline, or None if the fetch failed"""
+        response = self.get_page(url)
+        return response.content if response is not None else None
+    
+    def scrape_all_strollers_pipeline(self, fetchers=4, workers=None, on_product=None):
+        """Scrape all products with fetch threads feeding a process pool of extractors"""
+        product_urls = self.extract_product_links()
+        
+        if not product_urls:
+            print("No product URLs found!")
+            return []
+        
+        pipeline = ExtractionPipeline(self.fetch_content, BabylistRequestsScraper,
+                                      {"base_url": self.base_url}, fetchers=fetchers, workers=workers,
+                                      field_sources=self.field_sources)
+        self.rate_limiter.report_start()
+        products = crawl_with_incremental(
+            self.incremental, product_urls,
+            journal_run(self.journal, lambda urls, handle: pipeline.run(urls, on_product=handle)),
+            on_product,
+        )
+        
+        pipeline.report()
+        if self.cache:
+            self.cache.save()
+            self.cache.report()
+        self.rate_limiter.report()
+        pipeline.field_sources.report()
         
         return products
     
@@ -504,6 +674,10 @@ class BabylistRequestsScraper:
             if col in df.columns:
                 df[col] = df[col].apply(lambda x: ', '.join(x) if isinstance(x, list) else x)
         
+        # Variants keep their per-color price and SKU as a JSON array
+        if 'variants' in df.columns:
+            df['variants'] = df['variants'].apply(lambda x: json.dumps(x) if isinstance(x, list) else x)
+        
         df.to_csv(filename, index=False)
         print(f"\nSaved {len(products)} products to {filename}")
         print(f"Columns: {list(df.columns)}")
@@ -519,9 +693,89 @@ class BabylistRequestsScraper:
 
 # Usage
 if __name__ == "__main__":
-    scraper = BabylistRequestsScraper()
-    products = scraper.scrape_all_strollers()
-    scraper.save_to_csv(products)
+    parser = argparse.ArgumentParser(description="Scrape Babylist single strollers")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Concurrent product fetches (1 = serial with delays); the shared adaptive rate "
+                             "limiter starts at 0.4 req/s per concurrent fetch and caps throughput at 5 req/s")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Extraction processes fed by --concurrency fetch threads (0 = parse in the fetching thread)")
+    parser.add_argument("--per-host", type=int, default=4,
+                        help="Max in-flight requests to one host in async mode")
+    parser.add_argument("--min-interval", type=float, default=0.0,
+                        help="Extra min seconds between request starts to one host in async mode "
+                             "(the adaptive rate limiter already paces requests)")
+    parser.add_argument("--cache-dir", default=".http_cache",
+                        help="Directory for the on-disk response cache")
+    parser.add_argument("--cache-ttl", type=float, default=24,
+                        help="Hours a cached page is served without revalidation")
+    parser.add_argument("--cache-max-mb", type=int, default=500,
+                        help="Size budget for the cache before LRU eviction")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always download pages from the network")
+    parser.add_argument("--region-parse", action="store_true",
+                        help="Parse product pages from <head> plus the product region only "
+                             "(falls back to the full page when name or price is missing)")
+    parser.add_argument("--base-url", default=BASE_URL,
+                        help="Site root, e.g. a local fixtures.py server for offline runs")
+    parser.add_argument("--record", metavar="DIR",
+                        help="Save every listing and product page to this fixture directory")
+    parser.add_argument("--output", default="babylist_single_strollers_complete.csv",
+                        help="Written row by row as products are scraped (.csv, .jsonl or .parquet)")
+    parser.add_argument("--export", metavar="DIR",
+                        help="Also write a Parquet dataset partitioned by category and run date")
+    parser.add_argument("--catalog", metavar="DB",
+                        help="Also upsert every product into this SQLite catalog")
+    parser.add_argument("--journal", metavar="PATH",
+                        help="Checkpoint journal (default: next to --output, e.g. products.journal.jsonl)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue from the journal: skip discovery and products already scraped")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Refetch only products that are new or whose listing tile or lastmod changed")
+    parser.add_argument("--state", metavar="PATH",
+                        help="Incremental state file (default: next to --output, e.g. products.state.json)")
+    parser.add_argument("--max-age", type=float, default=7, metavar="DAYS",
+                        help="With --incremental, refetch any product last fetched longer ago than this")
+    parser.add_argument("--sitemap", action="store_true",
+                        help="Discover product URLs from category sitemaps (else the listing page) and lastmods from all sitemaps")
+    args = parser.parse_args()
+    if args.region_parse:
+        set_region_parsing(True)
+    
+    cache = None
+    if not args.no_cache:
+        cache = ResponseCache(args.cache_dir, ttl=args.cache_ttl * 3600,
+                              max_bytes=args.cache_max_mb * 1024 * 1024)
+    recorder = FixtureStore(args.record) if args.record else None
+    sitemap = SitemapIndex(args.base_url, recorder=recorder) if args.sitemap else None
+    journal = CrawlJournal(args.journal or journal_path(args.output), resume=args.resume)
+    incremental = None
+    if args.incremental:
+        incremental = IncrementalState(args.state or state_path(args.output), max_age_days=args.max_age)
+    rate_limiter = None
+    if args.concurrency > 1:
+        # One limiter paces every fetch thread; size it for the requests that can be in flight
+        parallel = args.concurrency if args.workers > 0 else min(args.concurrency, args.per_host)
+        rate_limiter = concurrent_rate_limiter(parallel)
+    scraper = BabylistRequestsScraper(cache=cache, rate_limiter=rate_limiter, base_url=args.base_url,
+                                      recorder=recorder, journal=journal, incremental=incremental, sitemap=sitemap)
+    sinks = [open_sink(args.output)]
+    if args.catalog:
+        sinks.append(CatalogStore(args.catalog, field_sources=scraper.field_sources))
+    with MultiSink(sinks) as sink:
+        if args.workers > 0:
+            products = scraper.scrape_all_strollers_pipeline(args.concurrency, args.workers,
+                                                             on_product=sink.write)
+        elif args.concurrency > 1:
+            products = scraper.scrape_all_strollers_async(args.concurrency, args.per_host, args.min_interval,
+                                                          on_product=sink.write)
+        else:
+            products = scraper.scrape_all_strollers(on_product=sink.write)
+    sink.report()
+    if args.export:
+        export_dataset(products, args.export)
+    journal.close()
+    if recorder:
+        recorder.save()
     
     print(f"\nScraping complete! Found {len(products)} products.")
     
@@ -0,0 +1,268 @@
+import abc
+import csv
+import json
+import os
+import threading
+import time
+
+# Optional Parquet support; CSV and JSONL need nothing beyond the standard library
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
+FORMATS = ['csv', 'jsonl', 'parquet']
+
+# Kept as a JSON array in CSV and Parquet output; other lists are joined with ", "
+JSON_COLUMNS = ['variants']
+
+COMPLETENESS_FIELDS = ['price', 'sku', 'color_options', 'dimensions', 'rating']
+
+
+def format_for_path(path):
+    """Output format from the file extension, e.g. products.jsonl -> jsonl"""
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension in ('json', 'ndjson'):
+        return 'jsonl'
+    if extension in ('pq', 'parq'):
+        return 'parquet'
+    return extension if extension in FORMATS else 'csv'
+
+
+def csv_value(column, value):
+    """A row value the way save_to_csv writes it"""
+    if column in JSON_COLUMNS and isinstance(value, list):
+        return json.dumps(value)
+    if isinstance(value, list):
+        return ', '.join(str(item) for item in value)
+    return value
+
+
+class Completeness:
+    """Running version of the "Data completeness summary" printed by save_to_csv
+
+    A field counts as filled when its CSV value is not "N/A", so the numbers
+    match what the DataFrame check gave at the end of a run.
+    """
+
+    def __init__(self, fields=COMPLETENESS_FIELDS):
+        self.fields = list(fields)
+        self.rows = 0
+        self.filled = {field: 0 for field in self.fields}
+        self.seen = set()
+
+    def add(self, row):
+        self.rows += 1
+        for field in self.fields:
+            if field in row:
+                self.seen.add(field)
+                if csv_value(field, row[field]) != 'N/A':
+                    self.filled[field] += 1
+
+    def report(self):
+        print("\nData completeness summary:")
+        for field in self.fields:
+            if field in self.seen:
+                percentage = (self.filled[field] / self.rows * 100) if self.rows > 0 else 0
+                print(f"  {field}: {self.filled[field]}/{self.rows} ({percentage:.1f}%)")
+
+
+class ProductSink(abc.ABC):
+    """Writes product rows as they are extracted instead of all at the end of a run
+
+    write() may be called from several threads (driver pools, fetch
+    threads). Rows reach the file at least every flush_every rows or
+    flush_seconds seconds, so a crash late in a run keeps what was scraped
+    before it. Use as a context manager or call close().
+    """
+
+    def __init__(self, path, flush_every=25, flush_seconds=5.0):
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self.flush_seconds = flush_seconds
+        self.completeness = Completeness()
+        self.count = 0
+        self.pending = 0
+        self.last_flush = time.monotonic()
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def write(self, product_data):
+        if not product_data:
+            return
+        with self.lock:
+            self._write(product_data)
+            self.completeness.add(product_data)
+            self.count += 1
+            self.pending += 1
+            if self.pending >= self.flush_every or time.monotonic() - self.last_flush >= self.flush_seconds:
+                self._flush()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        if self.pending:
+            self._write_pending()
+        self.pending = 0
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        with self.lock:
+            if self.closed:
+                return
+            self._flush()
+            self._close()
+            self.closed = True
+
+    def report(self):
+        if not self.count:
+            print("No products to save!")
+            return
+        print(f"\nSaved {self.count} products to {self.path}")
+        self.completeness.report()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # Format-specific parts, called with the lock held
+    @abc.abstractmethod
+    def _write(self, product_data):
+        """Buffer or write one row"""
+
+    @abc.abstractmethod
+    def _write_pending(self):
+        """Make the rows written since the last flush durable"""
+
+    @abc.abstractmethod
+    def _close(self):
+        """Release the file or connection"""
+
+
+class CsvSink(ProductSink):
+    """CSV with list columns joined like save_to_csv; the header comes from the first row"""
+
+    def __init__(self, path, fieldnames=None, **kwargs):
+        super().__init__(path, **kwargs)
+        self.fieldnames = list(fieldnames) if fieldnames else None
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = None
+        self.dropped = set()
+
+    def _write(self, product_data):
+        if self.writer is None:
+            self.fieldnames = self.fieldnames or list(product_data)
+            self.writer = csv.DictWriter(self.file, fieldnames=self.fieldnames, extrasaction='ignore',
+                                         lineterminator='\n')
+            self.writer.writeheader()
+        extra = set(product_data) - set(self.fieldnames) - self.dropped
+        if extra:
+            print(f"Warning: {self.path} has no column for {', '.join(sorted(extra))}; dropping it")
+            self.dropped.update(extra)
+        self.writer.writerow({column: csv_value(column, value) for column, value in product_data.items()})
+
+    def _write_pending(self):
+        self.file.flush()
+
+    def _close(self):
+        self.file.close()
+
+
+class JsonlSink(ProductSink):
+    """One JSON object per line, list columns kept as lists"""
+
+    def __init__(self, path, **kwargs):
+        super().__init__(path, **kwargs)
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def _write(self, product_data):
+        self.file.write(json.dumps(product_data, ensure_ascii=False, default=str) + '\n')
+
+    def _write_pending(self):
+        self.file.flush()
+
+    def _close(self):
+        self.file.close()
+
+
+class ParquetSink(ProductSink):
+    """One Parquet row group per flush
+
+    The schema is taken from the first row group (columns that are empty
+    there become strings). Unlike CSV and JSONL, the file is only readable
+    once close() has written the footer.
+    """
+
+    def __init__(self, path, **kwargs):
+        if not HAVE_PYARROW:
+            raise ValueError("Parquet output needs pyarrow installed")
+        super().__init__(path, **kwargs)
+        self.rows = []
+        self.schema = None
+        self.writer = None
+
+    def _write(self, product_data):
+        row = dict(product_data)
+        for column in JSON_COLUMNS:
+            if isinstance(row.get(column), list):
+                row[column] = json.dumps(row[column])
+        self.rows.append(row)
+
+    def _write_pending(self):
+        if self.schema is None:
+            inferred = pa.Table.from_pylist(self.rows).schema
+            self.schema = pa.schema([
+                pa.field(field.name, pa.string()) if pa.types.is_null(field.type)
+                else pa.field(field.name, pa.list_(pa.string())) if pa.types.is_list(field.type)
+                else field
+                for field in inferred
+            ])
+            self.writer = pq.ParquetWriter(self.path, self.schema)
+        self.writer.write_table(pa.Table.from_pylist(self.rows, schema=self.schema))
+        self.rows = []
+
+    def _close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class MultiSink:
+    """Hands every row to several sinks, e.g. a CSV file and a CatalogStore"""
+
+    def __init__(self, sinks):
+        self.sinks = list(sinks)
+
+    def write(self, product_data):
+        for sink in self.sinks:
+            sink.write(product_data)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+    def report(self):
+        for sink in self.sinks:
+            sink.report()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+SINKS = {'csv': CsvSink, 'jsonl': JsonlSink, 'parquet': ParquetSink}
+
+
+def open_sink(path, fmt=None, **kwargs):
+    """Sink for path, in fmt or the format its extension implies"""
+    fmt = fmt or format_for_path(path)
+    if fmt not in SINKS:
+        raise ValueError(f"Unknown output format {fmt!r}; choose from {', '.join(FORMATS)}")
+    return SINKS[fmt](path, **kwargs)
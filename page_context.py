@@ -0,0 +1,126 @@
+import json
+from functools import cached_property
+
+from app_state import app_state_record, extract_embedded_state
+from html_parser import get_backend, get_region_parsing, make_region_soup, make_soup, script_texts, script_tree
+from structured_data import missing_fields, product_record
+
+# Containers that hold the product itself rather than site chrome, most specific first
+PRODUCT_REGION_SELECTORS = ['[data-testid*="product-detail"]', 'main', '#__next']
+
+JSON_LD_SELECTOR = 'script[type="application/ld+json"]'
+
+# A region-only parse that leaves any of these empty is redone from the full page
+REGION_REQUIRED_FIELDS = ['name', 'price']
+
+
+class PageContext:
+    """One parsed product page shared by every field extractor
+
+    get_text() walks the whole tree, so the page text, its lowercase form,
+    the product-region text and the JSON-LD blocks are each computed on
+    first use and reused by every extractor that asks for them.
+
+    With scoped=True (default: html_parser.get_region_parsing()) the soup
+    holds only <head> and the product region; see needs_full_parse().
+    """
+
+    def __init__(self, html=None, soup=None, scoped=None):
+        self.html = html
+        if scoped is None:
+            scoped = get_region_parsing()
+        self.scoped = False
+        if soup is None and scoped and html is not None:
+            soup = make_region_soup(html)
+            self.scoped = soup is not None
+        self.soup = soup if soup is not None else make_soup(html)
+        self._element_text = {}
+
+    @cached_property
+    def text(self):
+        return self.soup.get_text()
+
+    @cached_property
+    def text_lower(self):
+        return self.text.lower()
+
+    @cached_property
+    def product_region(self):
+        """Main product container, or the whole page if none is marked up"""
+        for selector in PRODUCT_REGION_SELECTORS:
+            region = self.soup.select_one(selector)
+            if region:
+                return region
+        return self.soup
+
+    @cached_property
+    def product_text(self):
+        return self.element_text(self.product_region)
+
+    @cached_property
+    def scripts(self):
+        """What <script> lookups read: a Lexbor tree of the raw markup under selectolax, else the soup"""
+        if self.html is not None and get_backend() == 'selectolax':
+            return script_tree(self.html)
+        return self.soup
+
+    @cached_property
+    def json_ld(self):
+        """Parsed application/ld+json blocks in page order, skipping invalid ones"""
+        blocks = []
+        for text in script_texts(self.scripts, JSON_LD_SELECTOR):
+            if not text:
+                continue
+            try:
+                blocks.append(json.loads(text))
+            except ValueError:
+                continue
+        return blocks
+
+    @cached_property
+    def app_state(self):
+        """Hydration payloads (__NEXT_DATA__, window.* stores) in page order"""
+        html = self.html if self.html is not None else str(self.soup)
+        return extract_embedded_state(html, soup=self.scripts)
+
+    @cached_property
+    def structured(self):
+        """(record, sources): fields from the app state, then JSON-LD for what it lacks
+
+        sources maps each field in record to the tier that supplied it.
+        """
+        record = {}
+        sources = {}
+        for tier, fields in [('app-state', app_state_record(self.app_state)),
+                             ('json-ld', product_record(self.json_ld))]:
+            for field, value in fields.items():
+                if field not in record:
+                    record[field] = value
+                    sources[field] = tier
+        return record, sources
+
+    @cached_property
+    def labels_by_id(self):
+        """<label for="..."> elements by the id they label, first one winning like select_one"""
+        labels = {}
+        for label in self.soup.select('label[for]'):
+            labels.setdefault(label['for'], label)
+        return labels
+
+    def needs_full_parse(self, product_data):
+        """True if this was a region-only parse and it missed a required field"""
+        return self.scoped and bool(missing_fields(product_data, REGION_REQUIRED_FIELDS))
+
+    def element_text(self, elem):
+        """get_text() of an element, memoized for headers/tables/lists visited repeatedly"""
+        if elem is self.soup:
+            return self.text
+        key = id(elem)
+        if key not in self._element_text:
+            self._element_text[key] = elem.get_text()
+        return self._element_text[key]
+
+    def element_text_lower(self, elem):
+        if elem is self.soup:
+            return self.text_lower
+        return self.element_text(elem).lower()
@@ -0,0 +1,165 @@
+import statistics
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+# The product is usable once the title is rendered and either the price or the
+# JSON-LD block is in the DOM; everything else we read comes in with those.
+PRODUCT_READY_SCRIPT = """
+return !!document.querySelector('h1') && (
+    !!document.querySelector('script[type="application/ld+json"]') ||
+    !!document.querySelector('[data-testid*="price"], .price, [class*="price"]')
+);
+"""
+
+# -1 while the document is still loading, otherwise the number of resources
+# fetched so far; a count that stops changing means the network went idle.
+RESOURCE_COUNT_SCRIPT = """
+if (document.readyState !== 'complete') { return -1; }
+return performance.getEntriesByType('resource').length;
+"""
+
+# Bytes over the wire for the document plus its subresources so far. Cross-origin
+# resources without Timing-Allow-Origin report 0, so this is a lower bound.
+TRANSFER_BYTES_SCRIPT = """
+var total = 0;
+performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'))
+    .forEach(function (entry) { total += entry.transferSize || 0; });
+return total;
+"""
+
+
+def wait_for_product_page(driver, timeout=15, idle_time=0.5, poll_interval=0.1):
+    """Block until the product's key elements exist or the network is idle
+
+    Returns True when the page became ready and False when the deadline hit.
+    """
+    deadline = time.monotonic() + timeout
+    last_count = None
+    stable_since = time.monotonic()
+
+    while time.monotonic() < deadline:
+        try:
+            if driver.execute_script(PRODUCT_READY_SCRIPT):
+                return True
+            count = driver.execute_script(RESOURCE_COUNT_SCRIPT)
+        except Exception:
+            # The document can be swapped out mid-navigation; just poll again
+            count = -1
+
+        now = time.monotonic()
+        if count >= 0 and count == last_count:
+            if now - stable_since >= idle_time:
+                return True
+        else:
+            last_count = count
+            stable_since = now
+
+        time.sleep(poll_interval)
+
+    return False
+
+
+class PageTimings:
+    """Thread-safe record of how long each product page took to become ready"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.records = []
+
+    def record(self, url, seconds, ready, transfer_bytes=None):
+        with self.lock:
+            self.records.append({"url": url, "seconds": seconds, "ready": ready,
+                                 "bytes": transfer_bytes})
+
+    def summary(self):
+        """Median/p90/max load time plus how many pages hit the deadline"""
+        with self.lock:
+            durations = sorted(r["seconds"] for r in self.records)
+            timeouts = sum(1 for r in self.records if not r["ready"])
+            sizes = [r["bytes"] for r in self.records if r["bytes"] is not None]
+
+        if not durations:
+            return None
+        p90_index = min(len(durations) - 1, int(round(0.9 * (len(durations) - 1))))
+        return {
+            "pages": len(durations),
+            "median": statistics.median(durations),
+            "p90": durations[p90_index],
+            "max": durations[-1],
+            "timeouts": timeouts,
+            "median_kb": statistics.median(sizes) / 1024 if sizes else None,
+        }
+
+    def report(self):
+        stats = self.summary()
+        if not stats:
+            return
+        print(f"\nPage load times over {stats['pages']} pages: "
+              f"median {stats['median']:.2f}s, p90 {stats['p90']:.2f}s, max {stats['max']:.2f}s "
+              f"({stats['timeouts']} hit the deadline)")
+        if stats["median_kb"] is not None:
+            print(f"Median transfer per page: {stats['median_kb']:.0f} KB")
+
+
+# Page titles the site serves instead of a product when it is pushing back
+BLOCKED_TITLES = {
+    'too many requests': 429,
+    'service unavailable': 503,
+    'rate limit': 429,
+}
+
+
+def blocked_status(driver):
+    """Best-effort HTTP status for a throttling page, since Selenium hides the real one"""
+    try:
+        title = (driver.title or '').lower()
+    except Exception:
+        return None
+    for phrase, status in BLOCKED_TITLES.items():
+        if phrase in title:
+            return status
+    return None
+
+
+def page_transfer_bytes(driver):
+    """Bytes transferred for the current page, or None if the browser won't say"""
+    try:
+        return int(driver.execute_script(TRANSFER_BYTES_SCRIPT))
+    except Exception:
+        return None
+
+
+def load_product_page(driver, url, timeout, timings, rate_limiter=None):
+    """Navigate to a product page under the rate limiter and wait until it is ready
+
+    timeout bounds the navigation and the wait together. A navigation that
+    hits it returns False so callers parse what loaded; one that fails
+    outright is re-raised. Either way the timing and the limiter's feedback
+    are recorded, so slow or blocked pages still slow the crawl down.
+    """
+    if rate_limiter:
+        rate_limiter.acquire()
+
+    ready = False
+    status = None
+    start = time.monotonic()
+    try:
+        driver.set_page_load_timeout(timeout)
+        try:
+            driver.get(url)
+        except TimeoutException:
+            print(f"  Navigation to {url} hit the {timeout}s deadline")
+            return False
+        except WebDriverException:
+            # Connection refused/reset and the like; treat it as the server pushing back
+            status = 503
+            raise
+        ready = wait_for_product_page(driver, timeout=max(0.0, timeout - (time.monotonic() - start)))
+        return ready
+    finally:
+        elapsed = time.monotonic() - start
+        timings.record(url, elapsed, ready, page_transfer_bytes(driver))
+        if rate_limiter:
+            rate_limiter.record(status or blocked_status(driver), elapsed)
@@ -0,0 +1,82 @@
+import re
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+# Every PatternSet built with register(), by name (benchmarks walk this)
+REGISTRY = {}
+
+
+def _literal_runs(parsed):
+    """Literal strings every match of a parsed pattern must contain"""
+    runs = []
+    current = []
+    for op, av in parsed:
+        if op is sre_parse.LITERAL:
+            current.append(chr(av))
+            continue
+        if current:
+            runs.append(''.join(current))
+            current = []
+        if op is sre_parse.SUBPATTERN:
+            runs.extend(_literal_runs(av[-1]))
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+            runs.extend(_literal_runs(av[2]))
+    if current:
+        runs.append(''.join(current))
+    return runs
+
+
+def required_literal(pattern, flags=0):
+    """Longest literal a pattern cannot match without, or None if it has none"""
+    try:
+        runs = _literal_runs(sre_parse.parse(pattern, flags))
+    except Exception:
+        return None
+    if not runs:
+        return None
+    literal = max(runs, key=len)
+    return literal.lower() if flags & re.IGNORECASE else literal
+
+
+class PatternSet:
+    """Prioritised regex alternatives for one field, compiled once
+
+    The patterns keep their priority order: the first one that matches
+    anywhere wins, as in the per-pattern re.search loops they replace. Before
+    running a pattern, search() checks that its required literal ("dimension",
+    "lbs", "stars", ...) occurs in the text at all, which is a fast substring
+    scan; on most pages most patterns are skipped without entering the regex
+    engine.
+    """
+
+    def __init__(self, name, patterns, flags=0):
+        self.name = name
+        self.flags = flags
+        self.sources = list(patterns)
+        self.patterns = [re.compile(pattern, flags) for pattern in self.sources]
+        self.literals = [required_literal(pattern, flags) for pattern in self.sources]
+
+    def search(self, text, accept=None):
+        """Match of the highest-priority pattern found in text, or None
+
+        accept(match) can reject a match (e.g. an implausible rating); the
+        next pattern is then tried, as the original loops did.
+        """
+        haystack = text.lower() if self.flags & re.IGNORECASE else text
+        for pattern, literal in zip(self.patterns, self.literals):
+            if literal and literal not in haystack:
+                continue
+            match = pattern.search(text)
+            if match and (accept is None or accept(match)):
+                return match
+        return None
+
+
+def register(name, patterns, flags=0):
+    """Compile a field's patterns once at import time and record them in REGISTRY"""
+    pattern_set = PatternSet(name, patterns, flags)
+    REGISTRY[name] = pattern_set
+    return pattern_set
@@ -0,0 +1,139 @@
+import functools
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from html_parser import get_region_parsing, set_region_parsing
+from structured_data import FieldSources
+
+# One parse-only scraper per worker process, built by _init_worker
+_worker_scraper = None
+
+
+def _init_worker(scraper_class, scraper_kwargs, region_parsing):
+    global _worker_scraper
+    # Spawned workers don't inherit the parent's --region-parse setting
+    set_region_parsing(region_parsing)
+    _worker_scraper = scraper_class(**scraper_kwargs)
+
+
+def _extract(url, html):
+    """Runs in a worker: the row, this worker's running field-source counts and the row's SKU tier"""
+    product_data = _worker_scraper.parse_product_page(url, html)
+    sku_tier = _worker_scraper.field_sources.sku_tier(product_data['retailer_url']) if product_data else None
+    return product_data, os.getpid(), _worker_scraper.field_sources.counts, sku_tier
+
+
+class ExtractionPipeline:
+    """Fetch threads hand raw HTML to a process pool of extractors through bounded queues
+
+    Fetching stays in this process (sessions, rate limiter and cache are
+    shared by the fetch threads); parsing and extraction, which are CPU-bound,
+    run in worker processes, so extraction throughput scales with cores
+    instead of being capped by one. Each worker builds its own parse-only
+    scraper from scraper_class(**scraper_kwargs), e.g.
+    (BabylistStrollerScraper, {"chrome_path": None}), so nothing holding a
+    browser, session or lock is ever pickled.
+
+    Backpressure: at most queue_size fetched pages wait for extraction and at
+    most queue_size are in the pool, so fast fetchers block instead of
+    buffering a whole crawl in memory.
+    """
+
+    def __init__(self, fetch, scraper_class, scraper_kwargs=None, fetchers=4, workers=None, queue_size=None,
+                 field_sources=None):
+        # fetch(url) -> page HTML (str or bytes), or None if the fetch failed
+        self.fetch = fetch
+        self.scraper_class = scraper_class
+        self.scraper_kwargs = dict(scraper_kwargs or {})
+        self.fetchers = max(1, fetchers)
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.queue_size = max(1, queue_size or self.workers * 2)
+        # Merged from every worker's own FieldSources at the end of run(); each row's SKU
+        # tier is added before on_product sees the row, so a CatalogStore can read it
+        self.field_sources = field_sources or FieldSources()
+        self.stats = {"fetched": 0, "failed": 0, "extracted": 0, "elapsed": 0.0}
+
+    def run(self, urls, on_product=None):
+        """Fetch and extract every URL; returns rows in input order"""
+        urls = list(urls)
+        tasks = queue.Queue()
+        for index, url in enumerate(urls):
+            tasks.put((index, url))
+        pages = queue.Queue(maxsize=self.queue_size)
+        in_flight = threading.BoundedSemaphore(self.queue_size)
+        results = [None] * len(urls)
+        worker_counts = {}
+        lock = threading.Lock()
+
+        def fetch_worker():
+            while True:
+                try:
+                    index, url = tasks.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    html = self.fetch(url)
+                except Exception as e:
+                    print(f"Error fetching {url}: {e}")
+                    html = None
+                with lock:
+                    self.stats["fetched" if html is not None else "failed"] += 1
+                if html is not None:
+                    # Blocks while the extractors are queue_size pages behind
+                    pages.put((index, url, html))
+
+        def collect(index, url, future):
+            in_flight.release()
+            try:
+                product_data, pid, counts, sku_tier = future.result()
+            except Exception as e:
+                print(f"Error extracting {url}: {e}")
+                return
+            with lock:
+                worker_counts[pid] = counts
+                results[index] = product_data
+                if product_data:
+                    if sku_tier:
+                        self.field_sources.merge({}, {product_data['retailer_url']: sku_tier})
+                    self.stats["extracted"] += 1
+                    if on_product:
+                        on_product(product_data)
+
+        start = time.monotonic()
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.scraper_class, self.scraper_kwargs,
+                                           get_region_parsing())) as executor:
+            threads = [threading.Thread(target=fetch_worker, daemon=True) for _ in range(self.fetchers)]
+            for thread in threads:
+                thread.start()
+
+            def close_pages():
+                for thread in threads:
+                    thread.join()
+                pages.put(None)
+
+            threading.Thread(target=close_pages, daemon=True).start()
+
+            while True:
+                item = pages.get()
+                if item is None:
+                    break
+                index, url, html = item
+                in_flight.acquire()
+                future = executor.submit(_extract, url, html)
+                future.add_done_callback(functools.partial(collect, index, url))
+
+        self.stats["elapsed"] = time.monotonic() - start
+        for counts in worker_counts.values():
+            self.field_sources.merge(counts)
+        return [row for row in results if row]
+
+    def report(self):
+        stats = self.stats
+        rate = stats["extracted"] / stats["elapsed"] if stats["elapsed"] else 0
+        print(f"\nPipeline: fetched {stats['fetched']} pages ({stats['failed']} failed), "
+              f"extracted {stats['extracted']} rows on {self.workers} workers "
+              f"in {stats['elapsed']:.1f}s - {rate:.2f} pages/s")
@@ -0,0 +1,101 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+# Statuses that mean the site wants us to slow down
+BACKOFF_STATUSES = {429, 503}
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    value = str(value).strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    """Token bucket with AIMD rate control
+
+    The refill rate grows additively after every healthy response and is cut
+    multiplicatively on 429/503, Retry-After, server errors or slow responses,
+    so requests settle at the fastest pace the site tolerates.
+    """
+
+    def __init__(self, rate=0.5, min_rate=0.05, max_rate=5.0, increase=0.1,
+                 decrease=0.5, slow_after=5.0, burst=1):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_after = slow_after
+        self.burst = burst
+
+        self.lock = threading.Lock()
+        self.tokens = burst
+        self.last_refill = time.monotonic()
+        self.blocked_until = 0.0
+        self.stats = {"requests": 0, "backoffs": 0, "peak_rate": rate, "lowest_rate": rate}
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def acquire(self):
+        """Block until the next request may start"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    self.stats["requests"] += 1
+                    return
+                wait = max(self.blocked_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def record(self, status=None, latency=None, retry_after=None):
+        """Adjust the rate from one response's status code, latency and Retry-After"""
+        retry_seconds = parse_retry_after(retry_after)
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            pushback = (
+                status in BACKOFF_STATUSES
+                or retry_seconds is not None
+                or (status is not None and status >= 500)
+                or (latency is not None and latency > self.slow_after)
+            )
+            if pushback:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self.stats["backoffs"] += 1
+                if retry_seconds:
+                    self.blocked_until = max(self.blocked_until, now + retry_seconds)
+            else:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+            self.stats["peak_rate"] = max(self.stats["peak_rate"], self.rate)
+            self.stats["lowest_rate"] = min(self.stats["lowest_rate"], self.rate)
+
+    def report_start(self):
+        print(f"Request rate: starting at {self.rate:.2f}/s (burst {self.burst}), adapting between "
+              f"{self.min_rate:.2f}/s and {self.max_rate:.2f}/s; this caps throughput at any concurrency")
+
+    def report(self):
+        stats = self.stats
+        print(f"Request rate: now {self.rate:.2f}/s (peak {stats['peak_rate']:.2f}/s, "
+              f"low {stats['lowest_rate']:.2f}/s) over {stats['requests']} requests, "
+              f"{stats['backoffs']} backoffs")
+
+
+def concurrent_rate_limiter(parallel, rate_per_request=0.4, max_rate=5.0):
+    """Limiter for `parallel` requests in flight: seeded at rate_per_request for each, with a burst to match"""
+    parallel = max(1, parallel)
+    return AdaptiveRateLimiter(rate=min(max_rate, rate_per_request * parallel), max_rate=max_rate, burst=parallel)
@@ -0,0 +1,231 @@
+import argparse
+import gzip
+import re
+import xml.etree.ElementTree as ET
+from collections import deque
+from urllib.parse import urlparse
+
+from http_client import BASE_URL, absolute_url, make_session
+
+GZIP_MAGIC = b'\x1f\x8b'
+CHUNK_SIZE = 64 * 1024
+
+
+def category_slug(listing_url):
+    """Last path segment of a listing URL, e.g. "single-strollers" for /store/single-strollers"""
+    return urlparse(listing_url).path.rstrip('/').rsplit('/', 1)[-1].lower()
+
+
+def sitemap_names(sitemap_url):
+    """Category names a sitemap URL can carry: its directory segments and its filename stem
+
+    The stem drops .xml/.gz and a "sitemap" prefix or suffix and page
+    number, so sitemap-single-strollers-2.xml.gz and
+    /single-strollers/sitemap.xml both name "single-strollers".
+    """
+    segments = [segment.lower() for segment in urlparse(sitemap_url).path.split('/') if segment]
+    if not segments:
+        return set()
+    stem = re.sub(r'(\.xml)?(\.gz)?$', '', segments[-1]).replace('_', '-')
+    stem = re.fullmatch(r'(?:sitemaps?-)?(.*?)(?:-sitemaps?)?(?:-\d+)?', stem).group(1)
+    return {segment.replace('_', '-') for segment in segments[:-1]} | {stem}
+
+
+def _tag(element):
+    return element.tag.rsplit('}', 1)[-1]
+
+
+class _ChunkStream:
+    """File-like read()/peek() over an iterable of byte chunks, buffering only what is asked for"""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.buffer = b''
+
+    def _fill(self, size):
+        while size < 0 or len(self.buffer) < size:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                break
+            self.buffer += chunk
+
+    def peek(self, size):
+        self._fill(size)
+        return self.buffer[:size]
+
+    def read(self, size=-1):
+        self._fill(size)
+        if size < 0:
+            size = len(self.buffer)
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+
+def _keeping(chunks, kept):
+    for chunk in chunks:
+        kept.append(chunk)
+        yield chunk
+
+
+def iter_sitemap(chunks):
+    """(kind, loc, lastmod) per <sitemap> or <url> entry of a sitemap, gzipped or not
+
+    Takes the file as byte chunks (e.g. response.iter_content()) and parses
+    incrementally, dropping each entry once read, so a sitemap of any size
+    is held one chunk and one entry at a time.
+    """
+    stream = _ChunkStream(chunks)
+    if stream.peek(2) == GZIP_MAGIC:
+        stream = gzip.GzipFile(fileobj=stream)
+
+    root = None
+    for event, element in ET.iterparse(stream, events=('start', 'end')):
+        if root is None:
+            root = element
+            continue
+        if event != 'end' or _tag(element) not in ('url', 'sitemap'):
+            continue
+        fields = {_tag(child): (child.text or '').strip() for child in element}
+        if fields.get('loc'):
+            yield _tag(element), fields['loc'], fields.get('lastmod') or None
+        root.clear()
+
+
+class SitemapIndex:
+    """Product URLs and lastmods for every category from one streamed pass over the sitemaps
+
+    The sitemaps come from robots.txt (or /sitemap.xml); nested indexes and
+    gzipped children are followed. A category's products are the /gp/ URLs
+    of the sitemaps named after its listing (e.g. sitemap-single-strollers.xml);
+    a product in several such sitemaps belongs to each category. Slugs are
+    never used to guess a category. The pass runs the first time any
+    category asks, and every later category reuses it.
+    """
+
+    def __init__(self, base_url=BASE_URL, recorder=None, sitemap_urls=None):
+        self.base_url = base_url
+        self.recorder = recorder
+        self.sitemap_urls = sitemap_urls
+        # /gp/ URL -> lastmod for every sitemap, and the /gp/ URLs each sitemap lists
+        self.lastmods = None
+        self.sitemap_products = {}
+        self.requests = 0
+
+    def _get(self, session, url, stream=False):
+        self.requests += 1
+        response = session.get(url, timeout=30, stream=stream)
+        response.raise_for_status()
+        return response
+
+    def _roots(self, session):
+        if self.sitemap_urls:
+            return list(self.sitemap_urls)
+        try:
+            response = self._get(session, f"{self.base_url}/robots.txt")
+            robots = response.text
+            if self.recorder:
+                self.recorder.record(response.url, response.content, response.headers.get('Content-Type', 'text/plain'))
+        except Exception as e:
+            print(f"robots.txt unavailable ({e}); trying /sitemap.xml")
+            robots = ''
+        roots = [line.split(':', 1)[1].strip() for line in robots.splitlines()
+                 if line.lower().startswith('sitemap:')]
+        return [absolute_url(url, self.base_url) for url in roots] or [f"{self.base_url}/sitemap.xml"]
+
+    def load(self, session):
+        """Read every sitemap once into {product URL: lastmod}, remembering which sitemap listed each"""
+        if self.lastmods is not None:
+            return self.lastmods
+
+        self.lastmods = {}
+        pending = deque(self._roots(session))
+        seen = set()
+        while pending:
+            sitemap_url = pending.popleft()
+            if sitemap_url in seen:
+                continue
+            seen.add(sitemap_url)
+            kept = []
+            products = []
+            try:
+                response = self._get(session, sitemap_url, stream=True)
+                # Content-Encoding is undone here; a .gz file itself stays gzipped for iter_sitemap
+                chunks = response.iter_content(CHUNK_SIZE)
+                if self.recorder:
+                    chunks = _keeping(chunks, kept)
+                for kind, loc, lastmod in iter_sitemap(chunks):
+                    url = absolute_url(loc, self.base_url)
+                    if kind == 'sitemap':
+                        pending.append(url)
+                    elif '/gp/' in urlparse(url).path:
+                        self.lastmods[url] = lastmod
+                        products.append(url)
+            except Exception as e:
+                print(f"Sitemap {sitemap_url} failed: {e}")
+                continue
+            if products:
+                self.sitemap_products[sitemap_url] = products
+            if self.recorder:
+                self.recorder.record(sitemap_url, b''.join(kept),
+                                     response.headers.get('Content-Type', 'application/xml'))
+
+        print(f"Sitemaps: {len(self.lastmods)} product URLs from {len(self.sitemap_products)} sitemaps "
+              f"in {self.requests} requests")
+        return self.lastmods
+
+    def category_sitemaps(self, session, listing_url):
+        """Sitemaps named after a listing's category, by a whole path segment or the filename stem
+
+        A substring test would let "strollers" claim sitemap-double-strollers.xml.
+        """
+        self.load(session)
+        slug = category_slug(listing_url)
+        return [sitemap_url for sitemap_url in self.sitemap_products
+                if slug and slug in sitemap_names(sitemap_url)]
+
+    def product_urls(self, session, listing_url):
+        """{product URL: lastmod or None} from a listing's category sitemaps, or None when it has none"""
+        sitemap_urls = self.category_sitemaps(session, listing_url)
+        if not sitemap_urls:
+            return None
+        lastmods = self.load(session)
+        return {url: lastmods[url] for sitemap_url in sitemap_urls for url in self.sitemap_products[sitemap_url]}
+
+
+def sitemap_product_urls(sitemap, session, listing_url, incremental=None, excluded=None):
+    """Product URLs for a listing from its category sitemaps, or None to fall back to the listing page
+
+    URLs matching the scraper's excluded terms (a KeywordMatcher) are
+    skipped. Every sitemap's lastmods are handed to an incremental state as
+    change signals, so products found through the listing page get them too.
+    """
+    if sitemap is None:
+        return None
+    lastmods = sitemap.product_urls(session, listing_url)
+    if lastmods is None and sitemap.sitemap_products:
+        print(f"Warning: no product sitemap is named after {category_slug(listing_url)!r}; "
+              f"found {', '.join(sitemap.sitemap_products)}")
+    if incremental is not None:
+        incremental.observe_lastmods({url: lastmod for url, lastmod in sitemap.load(session).items() if lastmod})
+    if lastmods and excluded is not None:
+        lastmods = {url: lastmod for url, lastmod in lastmods.items() if not excluded.contains_any(url)}
+    if not lastmods:
+        print(f"No category sitemap lists products for {listing_url}; using the listing page")
+        return None
+    print(f"Sitemaps: {len(lastmods)} products for {listing_url}")
+    return list(lastmods)
+
+
+# Usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="List product URLs per category from the site's sitemaps")
+    parser.add_argument("sitemaps", nargs="*", help="Sitemap or sitemap index URLs (default: from robots.txt)")
+    parser.add_argument("--base-url", default=BASE_URL,
+                        help="Site root, e.g. a local fixtures.py server for offline runs")
+    args = parser.parse_args()
+
+    index = SitemapIndex(args.base_url, sitemap_urls=args.sitemaps or None)
+    lastmods = index.load(make_session())
+    for sitemap_url, urls in index.sitemap_products.items():
+        dated = sum(1 for url in urls if lastmods[url])
+        print(f"{sitemap_url}: {len(urls)} products ({dated} with lastmod)")
@@ -0,0 +1,196 @@
+import threading
+from decimal import Decimal, InvalidOperation
+
+# Row fields the structured tiers can fill; everything else always comes from the DOM
+STRUCTURED_FIELDS = ['name', 'brand', 'description', 'price', 'sku', 'rating', 'color_options', 'image_url', 'variants']
+
+PRODUCT_TYPES = {'Product', 'ProductGroup', 'IndividualProduct', 'ProductModel'}
+
+
+def missing_fields(product_data, required_fields):
+    """Required fields that came back empty or "N/A" """
+    missing = []
+    for field in required_fields:
+        value = product_data.get(field)
+        if value in (None, "N/A", "", [], ["N/A"]):
+            missing.append(field)
+    return missing
+
+
+def _nodes(data):
+    """Every dict in a JSON-LD block, expanding top-level lists and @graph"""
+    if isinstance(data, list):
+        for item in data:
+            yield from _nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        if isinstance(data.get('@graph'), list):
+            yield from _nodes(data['@graph'])
+
+
+def _is_product(node):
+    types = node.get('@type')
+    if isinstance(types, str):
+        types = [types]
+    return bool(types) and any(t in PRODUCT_TYPES for t in types if isinstance(t, str))
+
+
+def _text(value):
+    """Plain string from a JSON-LD value that may be a string, number or {"name": ...}"""
+    if isinstance(value, dict):
+        value = value.get('name') or value.get('@value')
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = str(value)
+    if isinstance(value, str):
+        return value.strip() or None
+    return None
+
+
+def format_price(value):
+    """"$1,299.99" like the price text on the page, keeping whole-dollar prices whole"""
+    try:
+        amount = Decimal(str(value).replace(',', '').lstrip('$').strip())
+    except InvalidOperation:
+        return None
+    if amount <= 0:
+        return None
+    if amount == amount.to_integral_value() and '.' not in str(value):
+        return f"${int(amount):,}"
+    return f"${amount:,.2f}"
+
+
+def _offer_price(offers):
+    for offer in offers if isinstance(offers, list) else [offers]:
+        if not isinstance(offer, dict):
+            continue
+        for key in ['price', 'lowPrice']:
+            if offer.get(key) not in (None, ''):
+                price = format_price(offer[key])
+                if price:
+                    return price
+        spec = offer.get('priceSpecification')
+        if isinstance(spec, dict) and spec.get('price') not in (None, ''):
+            price = format_price(spec['price'])
+            if price:
+                return price
+    return None
+
+
+def _image(value):
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = value.get('url') or value.get('contentUrl')
+    if isinstance(value, str) and value.startswith(('http', '//')):
+        return 'https:' + value if value.startswith('//') else value
+    return None
+
+
+def product_record(json_ld):
+    """Normalized Product fields from a page's parsed JSON-LD blocks
+
+    Only fields with a value are included, so callers can run their DOM
+    fallbacks for exactly the keys that are missing. color_options is only
+    filled when the page declares its variants (ProductGroup.hasVariant);
+    a lone Product.color names one variant of many and is left to the
+    swatch heuristics.
+    """
+    products = [node for block in json_ld for node in _nodes(block) if _is_product(node)]
+    if not products:
+        return {}
+
+    product = products[0]
+    variants = [v for v in product.get('hasVariant') or [] if isinstance(v, dict)]
+    record = {}
+
+    for field, key in [('name', 'name'), ('brand', 'brand'), ('description', 'description'), ('sku', 'sku')]:
+        value = _text(product.get(key))
+        if value is None and variants:
+            value = _text(variants[0].get(key)) if field in ('brand', 'sku') else None
+        if value:
+            record[field] = value
+
+    price = _offer_price(product.get('offers'))
+    if price is None:
+        for variant in variants:
+            price = _offer_price(variant.get('offers'))
+            if price:
+                break
+    if price:
+        record['price'] = price
+
+    rating = product.get('aggregateRating')
+    if isinstance(rating, dict) and rating.get('ratingValue') not in (None, ''):
+        record['rating'] = str(rating['ratingValue'])
+
+    colors = []
+    for variant in variants:
+        color = _text(variant.get('color'))
+        if color and color.lower() not in [c.lower() for c in colors]:
+            colors.append(color)
+    if colors:
+        record['color_options'] = colors
+
+    image = _image(product.get('image'))
+    if image:
+        record['image_url'] = image
+
+    return record
+
+
+class FieldSources:
+    """Counts, per field, whether the app state, JSON-LD, the DOM fallbacks or nothing supplied the value"""
+
+    TIERS = ['app-state', 'json-ld', 'dom', 'missing']
+
+    def __init__(self, fields=STRUCTURED_FIELDS):
+        self.fields = list(fields)
+        self.lock = threading.Lock()
+        self.counts = {field: dict.fromkeys(self.TIERS, 0) for field in self.fields}
+        # retailer_url -> tier its SKU came from, until a CatalogStore takes it with sku_tier()
+        self.sku_tiers = {}
+
+    def record_row(self, product_data, sources):
+        """Tally one finished row given the structured tier of each field it started from"""
+        empty = set(missing_fields(product_data, self.fields))
+        with self.lock:
+            if 'sku' in sources and product_data.get('retailer_url'):
+                self.sku_tiers[product_data['retailer_url']] = sources['sku']
+            for field in self.fields:
+                if field not in product_data:
+                    continue
+                if field in sources:
+                    tier = sources[field]
+                elif field in empty:
+                    tier = 'missing'
+                else:
+                    tier = 'dom'
+                self.counts[field][tier] += 1
+
+    def merge(self, counts, sku_tiers=None):
+        """Add another FieldSources' counts (e.g. from a worker process) and SKU tiers into this one"""
+        with self.lock:
+            self.sku_tiers.update(sku_tiers or {})
+            for field, tiers in counts.items():
+                if field not in self.counts:
+                    continue
+                for tier, count in tiers.items():
+                    self.counts[field][tier] = self.counts[field].get(tier, 0) + count
+
+    def report(self):
+        rows = sum(self.counts[self.fields[0]].values()) if self.fields else 0
+        if not rows:
+            return
+        print(f"\nField sources over {rows} pages:")
+        for field in self.fields:
+            counts = self.counts[field]
+            if not any(counts.values()):
+                continue
+            print(f"  {field:<14} " + "  ".join(f"{tier} {counts[tier]:>4}" for tier in self.TIERS))
+
+    def sku_tier(self, url):
+        """Structured tier the SKU of url's row came from (and forget it), or None for a DOM or unknown SKU"""
+        with self.lock:
+            return self.sku_tiers.pop(url, None)
@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+# The scrapers are flat top-level modules, not a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import FixtureStore  # noqa: E402
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+@pytest.fixture(scope="session")
+def fixture_store():
+    """Recorded pages: a JSON-LD Product, a JSON-LD ProductGroup, a Next.js app state and a gzipped sitemap"""
+    return FixtureStore(FIXTURE_DIR)
+
+
+@pytest.fixture(scope="session")
+def page(fixture_store):
+    def load(key):
+        body, _ = fixture_store.load(key)
+        return body.decode("utf-8")
+    return load
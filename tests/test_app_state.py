@@ -0,0 +1,54 @@
+from app_state import _price, app_state_record, extract_embedded_state
+
+
+def test_app_state_record_from_next_data(page):
+    record = app_state_record(extract_embedded_state(page('/gp/doona-infant-car-seat/2')))
+    # genericProduct wins over the related product listed before it
+    assert record['name'] == 'Doona Infant Car Seat & Stroller'
+    assert record['brand'] == 'Doona'
+    assert record['price'] == '$550.00'
+    assert record['rating'] == '4.6'
+    assert record['image_url'] == 'https://images.example/doona.jpg'
+    assert record['color_options'] == ['Nitro Black', 'Dusty Rose', 'Royal Blue']
+    assert record['variants'][2] == {'color': 'Royal Blue', 'price': '$575.00', 'sku': 'SP150-20-033'}
+    # No product-level SKU, so the first variant's is used
+    assert record['sku'] == 'SP150-20-001'
+
+
+def test_app_state_record_without_state(page):
+    assert app_state_record(extract_embedded_state(page('/gp/nuna-pipa-rx/0'))) == {}
+
+
+def test_extract_embedded_state_window_assignment():
+    html = '<script>window.__INITIAL_STATE__ = {"product": {"name": "Pipa"}};</script>'
+    assert extract_embedded_state(html) == [{'product': {'name': 'Pipa'}}]
+
+
+def test_price_in_dollars():
+    assert _price({'price': 499.99}) == '$499.99'
+    assert _price({'price': '$1,049.99'}) == '$1,049.99'
+    assert _price({'price': 350}) == '$350'
+    assert _price({'price': {'amount': 89.99, 'currency': 'USD'}}) == '$89.99'
+
+
+def test_price_in_cents():
+    assert _price({'priceInCents': 49999}) == '$499.99'
+    assert _price({'price': {'current': {'priceInCents': 12900}}}) == '$129.00'
+    # A node that keeps any money in cents keeps its bare integers in cents too
+    assert _price({'price': 45000, 'listPriceCents': 50000}) == '$450.00'
+    assert _price({'price': 350}, cents=True) == '$3.50'
+
+
+def test_price_cents_heuristic_for_large_integers():
+    # Nothing we sell costs $5,000 or more, so such an integer is cents
+    assert _price({'price': 4999}) == '$4,999'
+    assert _price({'price': 5000}) == '$50.00'
+    assert _price({'price': 129900}) == '$1,299.00'
+    # Decimal amounts are always dollars
+    assert _price({'price': 5000.0}) == '$5,000.00'
+
+
+def test_price_rejects_non_prices():
+    assert _price({'price': 0}) is None
+    assert _price({'price': True}) is None
+    assert _price({}) is None
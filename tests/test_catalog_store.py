@@ -0,0 +1,79 @@
+import pytest
+
+from catalog_store import CatalogStore
+from structured_data import FieldSources
+
+B = 'https://www.babylist.com'
+
+
+def row(url, sku, **fields):
+    product = {'retailer_url': url, 'sku': sku, 'name': 'UPPAbaby Vista V2', 'brand': 'UPPAbaby',
+               'price': '$999.99', 'category': 'Single Stroller', 'simplified_colors': ['Black']}
+    product.update(fields)
+    return product
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    store = CatalogStore(str(tmp_path / "catalog.db"), field_sources=FieldSources())
+    yield store
+    store.close()
+
+
+def write(catalog, product, sku_tier=None):
+    """Write a row the way a scraper does: its SKU tier is recorded first"""
+    if sku_tier:
+        catalog.field_sources.record_row(product, {'sku': sku_tier})
+    catalog.write(product)
+
+
+def test_same_url_updates_one_row(catalog):
+    write(catalog, row(B + '/gp/vista/1', 'V2-JKE', price='$999.99'))
+    write(catalog, row(B + '/gp/vista/1/?utm_source=mail', 'V2-JKE', price='$949.99', brand='N/A',
+                       category='Travel System'))
+    catalog.flush()
+    assert (catalog.inserted, catalog.updated, catalog.total) == (1, 1, 1)
+
+    product = catalog.get(B + '/gp/vista/1')
+    assert product['price'] == 949.99
+    # A field this run could not find keeps the stored value
+    assert product['brand'] == 'UPPAbaby'
+    assert product['categories'] == ['Single Stroller', 'Travel System']
+
+
+def test_trusted_sku_makes_new_url_an_alias(catalog):
+    write(catalog, row(B + '/gp/vista/1', 'V2-JKE'), sku_tier='json-ld')
+    write(catalog, row(B + '/gp/vista-jake/2', 'V2-JKE', price='$979.99'), sku_tier='app-state')
+    catalog.flush()
+    assert (catalog.inserted, catalog.updated, catalog.total) == (1, 1, 1)
+
+    product = catalog.get(B + '/gp/vista-jake/2')
+    # The row keeps the URL it was first seen under
+    assert product['url'] == B + '/gp/vista/1'
+    assert product['retailer_url'] == B + '/gp/vista/1'
+    assert product['aliases'] == [B + '/gp/vista-jake/2']
+    assert product['price'] == 979.99
+    assert product['sku_source'] == 'app-state'
+
+    # Seeing the first URL again doesn't move the row back and forth
+    write(catalog, row(B + '/gp/vista/1', 'V2-JKE'), sku_tier='json-ld')
+    catalog.flush()
+    assert catalog.get(B + '/gp/vista/1')['url'] == B + '/gp/vista/1'
+    assert catalog.total == 1
+
+
+def test_dom_sku_never_merges_products(catalog):
+    write(catalog, row(B + '/gp/vista/1', 'details'), sku_tier='json-ld')
+    write(catalog, row(B + '/gp/mixx/3', 'details'))
+    catalog.flush()
+    assert (catalog.inserted, catalog.total) == (2, 2)
+    assert catalog.get(B + '/gp/mixx/3')['sku_source'] is None
+
+
+def test_search(catalog):
+    write(catalog, row(B + '/gp/vista/1', 'V2-JKE', simplified_colors=['Black', 'Gray']))
+    write(catalog, row(B + '/gp/pipa/2', 'PIPA', name='Nuna Pipa', brand='Nuna', price='$399.95',
+                       category='Infant Car Seat', simplified_colors=['Black']))
+    assert [p['name'] for p in catalog.search(color='Gray')] == ['UPPAbaby Vista V2']
+    assert [p['name'] for p in catalog.search(color='Black', max_price=500)] == ['Nuna Pipa']
+    assert [p['name'] for p in catalog.search(category='Infant Car Seat')] == ['Nuna Pipa']
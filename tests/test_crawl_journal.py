@@ -0,0 +1,57 @@
+import json
+
+from crawl_journal import CrawlJournal, journal_path
+
+
+def test_journal_path():
+    assert journal_path('out/products.csv') == 'out/products.journal.jsonl'
+
+
+def test_replay_skips_line_cut_off_by_a_crash(tmp_path):
+    path = str(tmp_path / "products.journal.jsonl")
+    with CrawlJournal(path) as journal:
+        journal.record_listing('https://www.babylist.com/store/single-strollers', ['u1', 'u2', 'u3'])
+        journal.record_done('u1', {'retailer_url': 'u1', 'name': 'One'})
+        journal.record_failed('u2', 'timeout')
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'event': 'done', 'url': 'u3', 'row': {'retailer_url': 'u3'}})[:25])
+
+    journal = CrawlJournal(path, resume=True)
+    assert journal.listing('https://www.babylist.com/store/single-strollers') == ['u1', 'u2', 'u3']
+    assert journal.done == {'u1': {'retailer_url': 'u1', 'name': 'One'}}
+    assert journal.failed == {'u2': 'timeout'}
+
+    # The next entry starts on a line of its own and survives another replay
+    journal.record_done('u3', {'retailer_url': 'u3', 'name': 'Three'})
+    journal.close()
+    replayed = CrawlJournal(path, resume=True)
+    replayed.close()
+    assert set(replayed.done) == {'u1', 'u3'}
+
+
+def test_resumed_crawl_only_runs_pending_urls(tmp_path):
+    path = str(tmp_path / "products.journal.jsonl")
+    with CrawlJournal(path) as journal:
+        journal.record_done('u1', {'retailer_url': 'u1'})
+
+    ran = []
+
+    def run(urls, handle):
+        ran.extend(urls)
+        handle({'retailer_url': 'u2'})
+
+    seen = []
+    with CrawlJournal(path, resume=True) as journal:
+        rows = journal.crawl(['u1', 'u2', 'u3'], run, on_product=seen.append)
+    assert ran == ['u2', 'u3']
+    assert [row['retailer_url'] for row in rows] == ['u1', 'u2']
+    assert [row['retailer_url'] for row in seen] == ['u1', 'u2']
+    assert journal.failed == {'u3': 'no product data'}
+
+
+def test_without_resume_the_journal_starts_empty(tmp_path):
+    path = str(tmp_path / "products.journal.jsonl")
+    with CrawlJournal(path) as journal:
+        journal.record_done('u1', {'retailer_url': 'u1'})
+    with CrawlJournal(path) as journal:
+        assert journal.done == {}
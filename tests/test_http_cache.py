@@ -0,0 +1,116 @@
+import os
+
+import pytest
+import requests
+
+from fixtures import FixtureServer, FixtureStore
+from http_cache import ResponseCache, cached_get
+from http_client import canonical_url, make_session
+
+
+def test_canonical_url():
+    assert canonical_url('HTTPS://WWW.Babylist.com:443/gp/a/1/?utm_source=x&b=2&a=1') == \
+        'https://www.babylist.com/gp/a/1?a=1&b=2'
+    assert canonical_url('http://127.0.0.1:80/') == 'http://127.0.0.1/'
+    assert canonical_url('https://www.babylist.com/gp/a/1?ref=nav#reviews') == 'https://www.babylist.com/gp/a/1'
+    assert canonical_url('https://www.babylist.com/store?page=') == 'https://www.babylist.com/store?page='
+
+
+def response(url, body, status=200, headers=None):
+    """A requests.Response as the network would have returned it"""
+    result = requests.Response()
+    result._content = body
+    result.status_code = status
+    result.headers = requests.structures.CaseInsensitiveDict(headers or {})
+    result.url = url
+    return result
+
+
+@pytest.fixture
+def server(tmp_path):
+    store = FixtureStore(str(tmp_path / "site"))
+    store.record("/gp/a/1", "<html>first</html>")
+    with FixtureServer(store, port=0) as server:
+        yield server
+
+
+def test_fresh_hit_skips_network(tmp_path, server):
+    cache = ResponseCache(str(tmp_path / "cache"))
+    session = make_session()
+    url = server.base_url + "/gp/a/1"
+    assert cached_get(session, url, cache).text == "<html>first</html>"
+    cached = cached_get(session, url + "?utm_source=mail", cache)
+    assert cached.text == "<html>first</html>"
+    assert cached.from_cache
+    assert server.stats["served"] == 1
+    assert cache.stats["hits"] == 1
+
+
+def test_stale_entry_revalidates_with_304(tmp_path, server):
+    cache = ResponseCache(str(tmp_path / "cache"), ttl=0)
+    session = make_session()
+    url = server.base_url + "/gp/a/1"
+    cached_get(session, url, cache)
+    cached = cached_get(session, url, cache)
+    assert cached.text == "<html>first</html>"
+    assert cached.from_cache
+    assert server.stats["not_modified"] == 1
+    assert cache.stats["revalidated"] == 1
+
+    # A changed page fails the ETag check and is downloaded and stored again
+    server.store.record("/gp/a/1", "<html>second</html>")
+    assert cached_get(session, url, cache).text == "<html>second</html>"
+    assert cache.stats["downloads"] == 2
+
+
+def test_304_for_an_evicted_body_is_a_miss(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    url = "https://www.babylist.com/gp/a/1"
+    cache.store(url, response(url, b"<html>a</html>", headers={"ETag": '"a"'}))
+    entry = cache.lookup(url)
+    os.remove(cache._body_path(entry["key"]))
+
+    assert cache.revalidated(entry, response(url, b"", status=304, headers={"ETag": '"a"'})) is None
+    assert cache.lookup(url) is None
+    assert cache.total_bytes == 0
+    assert cache.stats["revalidated"] == 0
+
+
+def test_hit_for_an_evicted_body_is_a_miss(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    url = "https://www.babylist.com/gp/a/1"
+    cache.store(url, response(url, b"<html>a</html>"))
+    entry = cache.lookup(url)
+    os.remove(cache._body_path(entry["key"]))
+    assert cache.hit(entry) is None
+    assert cache.stats["hits"] == 0
+
+
+def test_lru_eviction(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=300, evict_to=0.7)
+    urls = [f"https://www.babylist.com/gp/p/{i}" for i in range(3)]
+    for i, url in enumerate(urls):
+        cache.store(url, response(url, b"x" * 100))
+        cache.index[cache._key(url)]["last_access"] = i
+    # Reading the oldest entry makes it the most recently used
+    assert cache.hit(cache.lookup(urls[0])) is not None
+
+    cache.store("https://www.babylist.com/gp/p/3", response("https://www.babylist.com/gp/p/3", b"x" * 100))
+    # Over 300 bytes, so the least recently used go until at most 210 bytes remain
+    assert cache.stats["evicted"] == 2
+    assert cache.lookup(urls[1]) is None and cache.lookup(urls[2]) is None
+    assert cache.lookup(urls[0]) is not None
+    assert cache.total_bytes == sum(entry["size"] for entry in cache.index.values()) == 200
+    assert not os.path.exists(cache._body_path(cache._key(urls[1])))
+
+
+def test_index_survives_a_restart(tmp_path):
+    url = "https://www.babylist.com/gp/a/1"
+    cache = ResponseCache(str(tmp_path))
+    cache.store(url, response(url, b"<html>a</html>", headers={"ETag": '"a"'}))
+    cache.save()
+
+    reopened = ResponseCache(str(tmp_path))
+    entry = reopened.lookup(url)
+    assert reopened.conditional_headers(entry) == {"If-None-Match": '"a"'}
+    assert reopened.total_bytes == len(b"<html>a</html>")
@@ -0,0 +1,77 @@
+import json
+import time
+
+import pytest
+
+from incremental import IncrementalState, parse_lastmod, row_hash, tile_hash
+
+TILE = {'name': 'Nuna Pipa RX', 'image_url': 'https://images.example/pipa.jpg?w=300', 'price': '$399.95'}
+
+
+@pytest.fixture
+def state_file(tmp_path):
+    now = time.time()
+    previous = {
+        'fresh-tile': {'row': {'retailer_url': 'fresh-tile'}, 'fetched_at': now, 'tile': tile_hash(TILE),
+                       'lastmod': None},
+        'fresh-lastmod': {'row': {'retailer_url': 'fresh-lastmod'}, 'fetched_at': now, 'tile': None,
+                          'lastmod': '2024-05-01T10:00:00+00:00'},
+        'old': {'row': {'retailer_url': 'old'}, 'fetched_at': now - 8 * 86400, 'tile': tile_hash(TILE),
+                'lastmod': None},
+        'unsignalled': {'row': {'retailer_url': 'unsignalled'}, 'fetched_at': now, 'tile': None, 'lastmod': None},
+    }
+    path = tmp_path / "products.state.json"
+    path.write_text(json.dumps(previous))
+    return str(path)
+
+
+def test_reason(state_file):
+    state = IncrementalState(state_file, max_age_days=7)
+    state.observe_tiles({'fresh-tile': dict(TILE, image_url='https://images.example/pipa.jpg?w=600'),
+                         'old': TILE})
+    state.observe_lastmods({'fresh-lastmod': '2024-05-01T10:00:00Z'})
+
+    assert state.reason('never-seen') == 'new'
+    assert state.reason('old') == 'stale'
+    assert state.reason('unsignalled') == 'no signal'
+    # Only the CDN size parameter changed, and the lastmod is the same instant
+    assert state.reason('fresh-tile') is None
+    assert state.reason('fresh-lastmod') is None
+
+    state.observe_tiles({'fresh-tile': dict(TILE, price='$349.95')})
+    state.observe_lastmods({'fresh-lastmod': '2024-05-02'})
+    assert state.reason('fresh-tile') == 'listing'
+    assert state.reason('fresh-lastmod') == 'lastmod'
+
+
+def test_without_max_age_nothing_goes_stale(state_file):
+    state = IncrementalState(state_file, max_age_days=0)
+    state.observe_tiles({'old': TILE})
+    assert state.reason('old') is None
+
+
+def test_crawl_carries_unchanged_rows_forward(state_file):
+    state = IncrementalState(state_file, max_age_days=7)
+    state.observe_tiles({'fresh-tile': TILE})
+    fetched = []
+
+    def run(urls, handle):
+        fetched.extend(urls)
+        for url in urls:
+            handle({'retailer_url': url, 'name': 'refetched'})
+
+    rows = state.crawl(['fresh-tile', 'never-seen'], run)
+    assert fetched == ['never-seen']
+    assert rows == [{'retailer_url': 'fresh-tile'}, {'retailer_url': 'never-seen', 'name': 'refetched'}]
+    with open(state_file) as f:
+        assert set(json.load(f)) >= {'fresh-tile', 'never-seen', 'old'}
+
+
+def test_parse_lastmod():
+    assert parse_lastmod('2024-05-01') == parse_lastmod('2024-05-01T00:00:00+00:00')
+    assert parse_lastmod('yesterday') is None
+    assert parse_lastmod(None) is None
+
+
+def test_row_hash_ignores_color_order():
+    assert row_hash({'colors': ['Black', 'Navy']}) == row_hash({'colors': ['Navy', 'Black']})
@@ -0,0 +1,59 @@
+import pytest
+
+from keyword_matcher import BACKENDS, HAVE_PYAHOCORASICK, KeywordMatcher
+
+COLORS = {'black': 'Black', 'onyx': 'Black', 'grey': 'Gray', 'gray': 'Gray', 'red': 'Red',
+          'navy': 'Blue', 'blue': 'Blue', 'rose': 'Pink', 'white': 'White'}
+
+TEXTS = [
+    "Jake Black",
+    "Greyish onyx frame",
+    "A tired parent's navy blue stroller",
+    "Prose about nothing",
+    "RED/WHITE",
+    "black_red trim",
+    "",
+]
+
+
+def backends():
+    return [backend for backend in BACKENDS if backend != 'pyahocorasick' or HAVE_PYAHOCORASICK]
+
+
+@pytest.mark.parametrize('word_boundary', [False, True])
+@pytest.mark.parametrize('backend', backends())
+def test_backends_agree(backend, word_boundary):
+    reference = KeywordMatcher(COLORS, word_boundary=word_boundary, backend='scan')
+    matcher = KeywordMatcher(COLORS, word_boundary=word_boundary, backend=backend)
+    for text in TEXTS:
+        assert matcher.contains_any(text) == reference.contains_any(text), text
+        assert matcher.first(text) == reference.first(text), text
+        assert matcher.find_all(text) == reference.find_all(text), text
+
+
+def test_substring_matching_by_default():
+    matcher = KeywordMatcher(COLORS)
+    assert matcher.find_all("A tired parent's navy blue stroller") == ['Red', 'Blue']
+    assert matcher.first("Greyish onyx frame") == 'Black'
+    assert matcher.first("Prose about nothing") == 'Pink'
+
+
+def test_word_boundary():
+    matcher = KeywordMatcher(COLORS, word_boundary=True)
+    assert matcher.find_all("A tired parent's navy blue stroller") == ['Blue']
+    assert matcher.find_all("RED/WHITE") == ['Red', 'White']
+    assert matcher.first("Greyish onyx frame") == 'Black'
+    assert not matcher.contains_any("Prose about nothing")
+    # Underscore is a word character, as in \b
+    assert not matcher.contains_any("black_red trim")
+
+
+def test_word_boundary_finds_later_whole_word():
+    # The first "red" is inside "tired", the second stands alone
+    matcher = KeywordMatcher(['red'], word_boundary=True)
+    assert matcher.contains_any("tired of red")
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        KeywordMatcher(COLORS, backend='regex')
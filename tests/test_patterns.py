@@ -0,0 +1,48 @@
+import re
+
+from patterns import PatternSet, required_literal
+
+
+def test_required_literal():
+    assert required_literal(r'Weight:\s*(\d+(?:\.\d+)?)\s*lbs') == 'Weight:'
+    assert required_literal(r'(\d+)\s*(?:x|X)\s*(\d+)') is None
+    assert required_literal(r'(\d\.\d) out of 5 stars', re.IGNORECASE) == ' out of 5 stars'
+
+
+def test_search_keeps_priority_order():
+    patterns = PatternSet('test.weight', [r'weight:\s*(\d+) lbs', r'(\d+) lbs'], re.IGNORECASE)
+    # The second pattern matches earlier in the text, but the first has priority
+    match = patterns.search("Folds to 12 lbs of stroller. Weight: 20 lbs")
+    assert match.group(1) == '20'
+    assert patterns.search("only 12 lbs").group(1) == '12'
+    assert patterns.search("no mass given") is None
+
+
+def test_search_accept_falls_through_to_next_pattern():
+    patterns = PatternSet('test.rating', [r'(\d+(?:\.\d+)?) stars', r'rated (\d+(?:\.\d+)?)'])
+    match = patterns.search("12 stars, rated 4.5", accept=lambda m: float(m.group(1)) <= 5)
+    assert match.group(1) == '4.5'
+
+
+def test_literal_prefilter_skips_regex():
+    patterns = PatternSet('test.sku', [r'SKU:\s*(\w+)', r'Item #(\d+)'])
+    assert patterns.literals == ['SKU:', 'Item #']
+    calls = []
+
+    class Spy:
+        def __init__(self, pattern):
+            self.pattern = pattern
+
+        def search(self, text):
+            calls.append(self.pattern.pattern)
+            return self.pattern.search(text)
+
+    patterns.patterns = [Spy(pattern) for pattern in patterns.patterns]
+    assert patterns.search("Item #123").group(1) == '123'
+    # 'SKU:' is not in the text, so its regex never ran
+    assert calls == [r'Item #(\d+)']
+
+
+def test_ignorecase_prefilter_is_case_insensitive():
+    patterns = PatternSet('test.dims', [r'dimensions:\s*(.+)'], re.IGNORECASE)
+    assert patterns.search("DIMENSIONS: 30 x 20").group(1) == '30 x 20'
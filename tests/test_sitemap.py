@@ -0,0 +1,62 @@
+import gzip
+
+from sitemap import GZIP_MAGIC, SitemapIndex, category_slug, iter_sitemap, sitemap_names, sitemap_product_urls
+
+B = 'https://www.babylist.com'
+
+
+def chunked(data, size):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+def test_iter_sitemap_gzip(fixture_store):
+    body, _ = fixture_store.load('/sitemap-single-strollers.xml.gz')
+    assert body[:2] == GZIP_MAGIC
+    # Tiny chunks split the gzip header and entries across reads
+    entries = list(iter_sitemap(chunked(body, 7)))
+    assert entries == [
+        ('url', B + '/gp/uppababy-vista-v2/1', '2024-05-01T10:00:00+00:00'),
+        ('url', B + '/gp/nuna-pipa-rx/0', '2024-04-12'),
+        ('url', B + '/gp/doona-infant-car-seat/2', None),
+        ('url', B + '/store/single-strollers', '2024-05-02'),
+    ]
+    assert list(iter_sitemap(chunked(gzip.decompress(body), 64))) == entries
+
+
+def test_iter_sitemap_index():
+    xml = (b'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+           b'<sitemap><loc> /sitemap-products.xml.gz </loc></sitemap><sitemap><loc></loc></sitemap></sitemapindex>')
+    assert list(iter_sitemap([xml])) == [('sitemap', '/sitemap-products.xml.gz', None)]
+
+
+def test_category_slug():
+    assert category_slug(B + '/store/single-strollers/') == 'single-strollers'
+
+
+def test_sitemap_names():
+    assert sitemap_names(B + '/sitemap-single-strollers-2.xml.gz') == {'single-strollers'}
+    assert 'double-strollers' in sitemap_names(B + '/double_strollers/sitemap.xml')
+    assert 'strollers' not in sitemap_names(B + '/sitemap-double-strollers.xml')
+
+
+def index_with(sitemap_products):
+    index = SitemapIndex(B)
+    index.sitemap_products = sitemap_products
+    index.lastmods = {url: '2024-05-01' for urls in sitemap_products.values() for url in urls}
+    return index
+
+
+def test_category_sitemaps_match_whole_names():
+    index = index_with({
+        B + '/sitemap-double-strollers.xml': [B + '/gp/a/1'],
+        B + '/sitemap-single-strollers.xml': [B + '/gp/b/2'],
+    })
+    assert index.category_sitemaps(None, B + '/store/single-strollers') == [B + '/sitemap-single-strollers.xml']
+    assert index.category_sitemaps(None, B + '/store/strollers') == []
+
+
+def test_unmatched_category_warns_and_falls_back(capsys):
+    index = index_with({B + '/sitemap-products.xml.gz': [B + '/gp/a/1']})
+    assert sitemap_product_urls(index, None, B + '/store/single-strollers') is None
+    out = capsys.readouterr().out
+    assert "Warning" in out and B + '/sitemap-products.xml.gz' in out
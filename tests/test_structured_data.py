@@ -0,0 +1,52 @@
+from page_context import PageContext
+from structured_data import FieldSources, format_price, missing_fields, product_record
+
+
+def test_product_record_from_product(page):
+    record = product_record(PageContext(page('/gp/nuna-pipa-rx/0')).json_ld)
+    assert record == {
+        'name': 'Nuna Pipa 0',
+        'description': 'A long product description that is certainly more than fifty characters long for sure.',
+        'sku': 'SKU-0000',
+        'price': '$100.99',
+    }
+    # A lone Product.color names one variant, so colors are left to the DOM
+    assert 'color_options' not in record
+
+
+def test_product_record_from_product_group(page):
+    record = product_record(PageContext(page('/gp/uppababy-vista-v2/1')).json_ld)
+    assert record['name'] == 'UPPAbaby Vista V2'
+    assert record['brand'] == 'UPPAbaby'
+    assert record['sku'] == '0920-JKE'
+    assert record['price'] == '$999.99'
+    assert record['rating'] == '4.7'
+    assert record['color_options'] == ['Jake', 'Gregory']
+    assert record['image_url'] == 'https://images.example/vista.jpg'
+
+
+def test_product_record_without_product():
+    assert product_record([]) == {}
+    assert product_record([{'@type': 'BreadcrumbList', 'name': 'Strollers'}]) == {}
+
+
+def test_format_price():
+    assert format_price('1299') == '$1,299'
+    assert format_price('$1,299.9') == '$1,299.90'
+    assert format_price(49.5) == '$49.50'
+    assert format_price('0') is None
+    assert format_price('call') is None
+
+
+def test_missing_fields():
+    row = {'price': 'N/A', 'color_options': [], 'sku': 'A1'}
+    assert missing_fields(row, ['price', 'color_options', 'sku', 'rating']) == ['price', 'color_options', 'rating']
+
+
+def test_field_sources_sku_tier_is_taken_once():
+    sources = FieldSources()
+    sources.record_row({'retailer_url': 'https://www.babylist.com/gp/a/1', 'sku': 'A1', 'name': 'A'},
+                       {'sku': 'json-ld', 'name': 'json-ld'})
+    assert sources.counts['name']['json-ld'] == 1
+    assert sources.sku_tier('https://www.babylist.com/gp/a/1') == 'json-ld'
+    assert sources.sku_tier('https://www.babylist.com/gp/a/1') is None
@@ -0,0 +1,36 @@
+from keyword_matcher import KeywordMatcher
+
+# Vocabularies the car seat, double stroller and travel system scrapers share,
+# each built into one matcher at import time
+
+# Links and URLs for things that are never a product in our categories
+NON_PRODUCT_TERMS = ['bottle', 'cleaning', 'nursing', 'swaddle', 'bassinet', 'changing', 'bedding', 'blanket']
+# Add-ons sold next to the products, excluded from listing links
+ACCESSORY_TERMS = ['insert', 'liner', 'accessory']
+
+NON_COLOR_WORDS = KeywordMatcher(['select', 'choose', 'add', 'cart', 'buy', 'quantity', 'shipping', 'size'])
+COLOR_WORDS = KeywordMatcher([
+    'black', 'white', 'gray', 'grey', 'blue', 'red', 'green', 'brown', 'pink', 'purple', 'yellow',
+    'navy', 'teal', 'sage', 'olive', 'burgundy', 'plum', 'coral', 'cream', 'ivory', 'charcoal',
+    'slate', 'midnight', 'forest', 'ocean', 'rose', 'gold', 'silver', 'bronze', 'copper', 'beige',
+    'taupe', 'almond', 'frame', 'seat', 'canopy'
+], word_boundary=True)
+# Basic colors that mark a variant link's "Name - Color" text
+VARIANT_LINK_COLORS = KeywordMatcher(['black', 'white', 'gray', 'blue', 'red', 'green', 'brown'], word_boundary=True)
+
+# Simplified color for each name fragment; earlier categories win
+COLOR_CATEGORIES = {
+    'Black': ['black', 'midnight', 'onyx', 'charcoal'],
+    'White': ['white', 'ivory', 'cream', 'pearl'],
+    'Gray': ['gray', 'grey', 'silver', 'slate', 'stone'],
+    'Blue': ['blue', 'navy', 'teal', 'aqua', 'ocean'],
+    'Red': ['red', 'burgundy', 'wine', 'crimson'],
+    'Green': ['green', 'olive', 'forest', 'sage'],
+    'Brown': ['brown', 'tan', 'beige', 'khaki', 'taupe', 'bronze'],
+    'Pink': ['pink', 'rose', 'blush', 'coral'],
+    'Purple': ['purple', 'lavender', 'plum'],
+    'Yellow': ['yellow', 'gold']
+}
+SIMPLE_COLORS = KeywordMatcher({
+    variation: category for category, variations in COLOR_CATEGORIES.items() for variation in variations
+}, word_boundary=True)